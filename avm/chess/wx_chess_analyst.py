@@ -10,7 +10,9 @@
 import io
 import os
 import re
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Tuple, List
 
 import pytz
@@ -18,8 +20,9 @@ import yaml
 import chess.pgn
 import chess.engine
 
-from ibm_watsonx_ai import Credentials
-from ibm_watsonx_ai.foundation_models import ModelInference
+# SYNAPSE BACKEND: watsonx / record / replay / stub (see avm/core/llm_backends.py)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "core"))
+from llm_backends import get_backend  # noqa: E402
 
 LOCAL_TZ = pytz.timezone("America/Los_Angeles")
 USER_HANDLE = "digitalscorpyun"
@@ -172,21 +175,16 @@ OUTPUT STRUCTURE:
 
 
 def granite_analyze(prompt: str) -> str:
-    creds = Credentials(
-        api_key=os.getenv("WATSONX_APIKEY"), url=os.getenv("WATSONX_URL")
-    )
-    model = ModelInference(
-        model_id=os.getenv("WX_GRANITE_MODEL_ID", DEFAULT_MODEL),
-        credentials=creds,
-        project_id=os.getenv("WATSONX_PROJECT_ID"),
-        params={
+    generation = get_backend().generate(
+        os.getenv("WX_GRANITE_MODEL_ID", DEFAULT_MODEL),
+        prompt,
+        {
             "max_new_tokens": 1200,
             "decoding_method": "greedy",
             "temperature": 0.0,
         },
     )
-    response = model.generate(prompt)
-    return response.get("results", [{}])[0].get("generated_text", "").strip()
+    return generation.text.strip()
 
 
 def main() -> None:
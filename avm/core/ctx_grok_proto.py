@@ -1,6 +1,130 @@
 import json
+import os
 import re
-from watsonx_client import WatsonXClient
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Guarantees for each task come from the VS-ENC invocation law.
+INVOCATION_LAW_PATH = os.getenv(
+    "CTX_GROK_LAW_PATH",
+    "C:/Users/digitalscorpyun/projects_2026/avm/config/vs_enc_invocation_law.yaml",
+)
+# Raw generations are kept as receipts for replay_harness.py.
+DEBUG_DIR = Path(
+    os.getenv(
+        "CTX_GROK_DEBUG_DIR", "C:/Users/digitalscorpyun/projects_2026/avm/_debug/ctx_grok_proto"
+    )
+)
+DEBUG_STAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+TITLE_KEYS = ("title",)
+KEYPOINT_KEYS = ("keypoints", "key_points", "keypoint", "points")
+
+
+# ------------------------------------------------------
+# INCREMENTAL DECODER: first complete top-level object
+# ------------------------------------------------------
+class JsonObjectDecoder:
+    """
+    Fed model output chunk by chunk, tracks brace depth (outside string
+    literals) and decodes the first top-level {...} the moment it closes.
+    Doubles as a WatsonXClient stop detector: feed() returns a stop reason
+    once an object is decoded, text() is the output cut at its closing brace.
+    """
+
+    STOP_REASON = "json_object_closed"
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.obj: Optional[Dict[str, Any]] = None
+        self.cut_index: Optional[int] = None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        if self.obj is not None:
+            return self.STOP_REASON
+        self._buf += chunk
+        buf = self._buf
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._start < 0:
+                if ch == "{":
+                    self._start, self._depth = i, 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = _decode_object(buf[self._start : i + 1])
+                    if obj is not None:
+                        self._pos = i + 1
+                        self.obj, self.cut_index = obj, i + 1
+                        return self.STOP_REASON
+                    # Balanced but not JSON (prose braces): look further on.
+                    self._start = -1
+        self._pos = len(buf)
+        return None
+
+    def text(self) -> str:
+        return self._buf if self.cut_index is None else self._buf[: self.cut_index]
+
+
+def _decode_object(candidate: str) -> Optional[Dict[str, Any]]:
+    decoder = json.JSONDecoder()
+    for attempt in (candidate, re.sub(r",\s*([}\]])", r"\1", candidate)):
+        try:
+            obj, _ = decoder.raw_decode(attempt)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(obj, dict):
+            return obj
+    return None
+
+
+# ------------------------------------------------------
+# LAW GUARANTEES
+# ------------------------------------------------------
+def _field(obj: Dict[str, Any], names: Iterable[str]) -> Any:
+    wanted = {n.replace("_", "") for n in names}
+    for key, value in obj.items():
+        if str(key).lower().replace("_", "") in wanted and value:
+            return value
+    return None
+
+
+def validate_guarantees(obj: Any, guarantees: Iterable[str]) -> None:
+    """Raises ValueError listing every guarantee the object breaks."""
+    missing = []
+    for guarantee in guarantees:
+        if guarantee == "must_return_json" and not isinstance(obj, dict):
+            missing.append("a JSON object")
+        elif guarantee == "must_include_title" and not (
+            isinstance(obj, dict) and _field(obj, TITLE_KEYS)
+        ):
+            missing.append("title")
+        elif guarantee == "must_include_keypoints" and not (
+            isinstance(obj, dict) and _field(obj, KEYPOINT_KEYS)
+        ):
+            missing.append("keypoints")
+    if missing:
+        raise ValueError(
+            f"CTX-GROK-PROTO: model output violates invocation law, missing: {', '.join(missing)}"
+        )
 
 
 class CTXGrokProto:
@@ -10,31 +134,57 @@ class CTXGrokProto:
     no multiple blocks, no stray text.
     """
 
-    def __init__(self):
-        self.client = WatsonXClient()
+    def __init__(self, law_path: Optional[str] = INVOCATION_LAW_PATH):
+        # Deferred so deterministic importers (ctx_grok) never load the
+        # LLM client stack; the client itself defers SDK + credentials.
+        from watsonx_client import WatsonXClient
+        from vs_enc import compile_law
+
+        self.client = WatsonXClient(caller="ctx_grok_proto")
+        self.law = compile_law(law_path)
+        if not self.law.source:
+            print(
+                f"⚠️ CTX-GROK-PROTO: invocation law not found ({law_path}); "
+                "only JSON parsing is enforced. Set CTX_GROK_LAW_PATH."
+            )
+        self._unlawful_tasks: Set[str] = set()
+
+    def guarantees(self, task: str) -> List[str]:
+        """The law's guarantees for task; warns once for tasks it lacks."""
+        if task not in self.law.invocation_types:
+            if self.law.source and task not in self._unlawful_tasks:
+                self._unlawful_tasks.add(task)
+                print(
+                    f"⚠️ CTX-GROK-PROTO: task '{task}' is not in {self.law.source}; "
+                    "no guarantees beyond JSON are checked."
+                )
+            return []
+        return self.law.rules(task).get("guarantees", [])
 
     # ------------------------------------------------------
-    # CLEANER: strip markdown, extract single JSON object
+    # CLEANER: extract the first complete JSON object
     # ------------------------------------------------------
-    def _extract_json(self, text: str) -> dict:
-        # 1. Remove markdown fences
-        text = re.sub(r"```json|```", "", text, flags=re.IGNORECASE).strip()
-
-        # 2. Extract JSON block (first {...} encountered)
-        match = re.search(r"\{[\s\S]*\}", text)
-        if not match:
+    @staticmethod
+    def _extract_json(text: str) -> dict:
+        # Fences and trailing prose sit outside the braces, so the
+        # decoder skips them; later objects are never looked at.
+        decoder = JsonObjectDecoder()
+        decoder.feed(text)
+        if decoder.obj is None:
             raise ValueError(f"CTX-GROK-PROTO: No JSON found in model output:\n{text}")
+        return decoder.obj
 
-        json_str = match.group(0)
+    @staticmethod
+    def _save_raw(task: str, raw: str) -> None:
+        from debug_bundle import write_debug
 
-        # 3. Attempt strict parse
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            # 4. Attempt recovery by removing trailing commas, bad escapes, etc.
-            cleaned = re.sub(r",\s*}", "}", json_str)  # trailing commas
-            cleaned = re.sub(r",\s*\]", "]", cleaned)
-            return json.loads(cleaned)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        write_debug(
+            DEBUG_DIR / f"{DEBUG_STAMP}__ctx_grok_proto.zip",
+            f"{stamp}__{task}__raw.txt",
+            raw,
+            DEBUG_DIR,
+        )
 
     # ------------------------------------------------------
     # AGENT RUN
@@ -47,12 +197,14 @@ class CTXGrokProto:
             f"TEXT:\n{text}\n"
         )
 
-        raw = self.client.ask(prompt)
+        # Streams and closes the generation as soon as the object is complete.
+        raw = self.client.ask(prompt, label=task, stop_detector=JsonObjectDecoder)
+        self._save_raw(task, raw)
         parsed = self._extract_json(raw)
+        validate_guarantees(parsed, self.guarantees(task))
 
         return {
             "task": task,
             "agent": "ctx_grok_proto",
             "output": parsed,
         }
-
@@ -0,0 +1,304 @@
+# ==============================================================================
+# ✶⌁✶ debug_bundle.py — THE DEBUG RECEIPT ARCHIVIST v1.0.0
+# ==============================================================================
+# ROLE: Moves debug receipts off the generation path. Callers enqueue
+#       (bundle, name, content); one background thread batches the writes
+#       into a zip bundle per topic/session.
+# LAYOUT (inside <bundle>.zip):
+#   blobs/<sha256>             deflated payload, stored once per bundle
+#   manifest/<batch>.jsonl     {"seq", "name", "sha256", "size", "ts", "store"}
+# DEDUPE: payloads >= AVM_DEBUG_SHARED_MIN chars (protocols, prompts carrying
+#         the source) go to <bundle dir>/_blobs/<sha[:2]>/<sha>.gz once for
+#         every bundle in that directory; store == "shared" in the manifest.
+# ENV: AVM_DEBUG_BUNDLES=0 restores one loose .txt file per receipt.
+# CLI:
+#   python debug_bundle.py list <dir|bundle.zip>
+#   python debug_bundle.py extract <bundle.zip> [--out DIR] [--match GLOB]
+#   python debug_bundle.py cat <bundle.zip> <name>
+# ==============================================================================
+
+import argparse
+import atexit
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+BUNDLES_ENABLED = os.getenv("AVM_DEBUG_BUNDLES", "1") != "0"
+SHARED_BLOB_MIN_CHARS = int(os.getenv("AVM_DEBUG_SHARED_MIN", "2048"))
+FLUSH_INTERVAL_S = 0.5
+MAX_BATCH = 64
+
+SHARED_DIR_NAME = "_blobs"
+
+
+def shared_blob_path(bundle: Path, sha: str) -> Path:
+    return bundle.parent / SHARED_DIR_NAME / sha[:2] / f"{sha}.gz"
+
+
+# ------------------------------------------------------------------------------
+# WRITER
+# ------------------------------------------------------------------------------
+class DebugBundleWriter:
+    """Single background thread; write() only enqueues."""
+
+    def __init__(
+        self,
+        flush_interval_s: float = FLUSH_INTERVAL_S,
+        max_batch: int = MAX_BATCH,
+        shared_min_chars: int = SHARED_BLOB_MIN_CHARS,
+    ) -> None:
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max_batch
+        self.shared_min_chars = shared_min_chars
+        self._queue: "queue.Queue[Optional[Tuple[Path, str, str, str]]]" = queue.Queue()
+        self._seq: Dict[Path, int] = {}
+        self._bundle_blobs: Dict[Path, Set[str]] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="debug-bundle-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, bundle: Path, name: str, content: str) -> None:
+        if self._closed:
+            raise RuntimeError("DebugBundleWriter is closed")
+        ts = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self._queue.put((Path(bundle), name, content, ts))
+
+    def flush(self) -> None:
+        """Blocks until every receipt enqueued so far is on disk."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    # --------------------------------------------------------------------------
+    # BACKGROUND THREAD
+    # --------------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            try:
+                grouped: Dict[Path, List[Tuple[str, str, str]]] = {}
+                for bundle, name, content, ts in batch:
+                    grouped.setdefault(bundle, []).append((name, content, ts))
+                for bundle, entries in grouped.items():
+                    try:
+                        self._write_batch(bundle, entries)
+                    except Exception as e:
+                        # Receipts must never take down a generation (or the
+                        # writer): an unwritable bundle's batch is logged.
+                        print(f"⚠️ Debug bundle write failed ({bundle}): {e!r}")
+            finally:
+                # Always settled, so flush() and the atexit close() return.
+                for _ in batch:
+                    self._queue.task_done()
+                if stop:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, bundle: Path, entries: List[Tuple[str, str, str]]) -> None:
+        bundle.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(bundle, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+            names = zf.namelist()
+            manifests = [n for n in names if n.startswith("manifest/")]
+            if bundle not in self._bundle_blobs:
+                # Reopened bundle (e.g. a resumed batch topic): continue its numbering.
+                self._bundle_blobs[bundle] = {
+                    n.split("/", 1)[1] for n in names if n.startswith("blobs/")
+                }
+                self._seq[bundle] = max(
+                    (e["seq"] for e in _manifest_entries(zf, manifests)), default=0
+                )
+            present = self._bundle_blobs[bundle]
+            batch_no = len(manifests)
+
+            manifest_lines: List[str] = []
+            for name, content, ts in entries:
+                try:
+                    name.encode("utf-8")  # the manifest must stay writable too
+                    sha, store = self._store(zf, bundle, content, present)
+                except Exception as e:
+                    # One bad receipt is dropped on its own; the rest of the
+                    # batch still lands.
+                    print(f"⚠️ Debug receipt dropped ({bundle.name}: {name}): {e!r}")
+                    continue
+
+                self._seq[bundle] += 1
+                manifest_lines.append(
+                    json.dumps(
+                        {
+                            "seq": self._seq[bundle],
+                            "name": name,
+                            "sha256": sha,
+                            "size": len(content),
+                            "ts": ts,
+                            "store": store,
+                        },
+                        ensure_ascii=False,
+                    )
+                )
+            if manifest_lines:
+                zf.writestr(f"manifest/{batch_no:06d}.jsonl", "\n".join(manifest_lines) + "\n")
+
+    def _store(
+        self, zf: zipfile.ZipFile, bundle: Path, content: str, present: Set[str]
+    ) -> Tuple[str, str]:
+        """Writes one payload's blob (unless already stored); returns (sha, store)."""
+        data = content.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        if len(content) >= self.shared_min_chars:
+            target = shared_blob_path(bundle, sha)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+                with gzip.open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, target)
+            return sha, "shared"
+        if sha not in present:
+            zf.writestr(f"blobs/{sha}", data)
+            present.add(sha)
+        return sha, "bundle"
+
+
+_WRITER: Optional[DebugBundleWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_writer() -> DebugBundleWriter:
+    """Process-wide writer; drained at interpreter exit."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = DebugBundleWriter()
+            atexit.register(_WRITER.close)
+        return _WRITER
+
+
+def write_debug(bundle: Path, name: str, content: str, loose_dir: Path) -> None:
+    """Queues a receipt into bundle, or writes loose_dir/name when bundles are off."""
+    if BUNDLES_ENABLED:
+        get_writer().write(bundle, name, content)
+        return
+    path = Path(loose_dir) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def flush_debug() -> None:
+    if _WRITER is not None:
+        _WRITER.flush()
+
+
+# ------------------------------------------------------------------------------
+# READER
+# ------------------------------------------------------------------------------
+def _manifest_entries(zf: zipfile.ZipFile, members: List[str]) -> Iterator[Dict[str, Any]]:
+    for member in sorted(members):
+        for line in zf.read(member).decode("utf-8").splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_manifest(bundle: Path) -> List[Dict[str, Any]]:
+    with zipfile.ZipFile(bundle) as zf:
+        members = [n for n in zf.namelist() if n.startswith("manifest/")]
+        return sorted(_manifest_entries(zf, members), key=lambda e: e["seq"])
+
+
+def read_entry(bundle: Path, entry: Dict[str, Any]) -> str:
+    if entry.get("store") == "shared":
+        with gzip.open(shared_blob_path(bundle, entry["sha256"]), "rt", encoding="utf-8") as f:
+            return f.read()
+    with zipfile.ZipFile(bundle) as zf:
+        return zf.read(f"blobs/{entry['sha256']}").decode("utf-8")
+
+
+def iter_entries(bundle: Path, match: str = "*") -> Iterator[Tuple[Dict[str, Any], str]]:
+    for entry in read_manifest(bundle):
+        if fnmatch.fnmatch(entry["name"], match):
+            yield entry, read_entry(bundle, entry)
+
+
+def find_bundles(root: Path) -> List[Path]:
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(root.glob("*.zip")) if root.exists() else []
+
+
+# ------------------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect debug receipt bundles")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_cmd = sub.add_parser("list")
+    list_cmd.add_argument("path", type=Path)
+    extract_cmd = sub.add_parser("extract")
+    extract_cmd.add_argument("bundle", type=Path)
+    extract_cmd.add_argument("--out", type=Path)
+    extract_cmd.add_argument("--match", default="*")
+    cat_cmd = sub.add_parser("cat")
+    cat_cmd.add_argument("bundle", type=Path)
+    cat_cmd.add_argument("name")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for bundle in find_bundles(args.path):
+            entries = read_manifest(bundle)
+            shared = sum(1 for e in entries if e["store"] == "shared")
+            print(f"✶ {bundle.name}  entries={len(entries)} shared={shared}")
+            for e in entries:
+                print(f"   {e['seq']:>6}  {e['size']:>8}  {e['store']:<6}  {e['sha256'][:10]}  {e['name']}")
+        return
+
+    if args.command == "extract":
+        out = args.out or args.bundle.with_suffix("")
+        count = 0
+        for entry, content in iter_entries(args.bundle, args.match):
+            path = out / entry["name"]
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+            count += 1
+        print(f"✓ Extracted {count} receipts to {out}")
+        return
+
+    matches = [content for entry, content in iter_entries(args.bundle, args.name)]
+    if not matches:
+        print(f"❌ No receipt named {args.name} in {args.bundle}")
+        raise SystemExit(1)
+    print(matches[-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,81 @@
 # ==============================================================================
-# ✶⌁✶ kimi_deux.py — THE SYNDICATE STUDY STUDIO v4.4.1 [HARDENED]
+# ✶⌁✶ kimi_deux.py — THE SYNDICATE STUDY STUDIO v4.5.1 [HARDENED]
 # ==============================================================================
 # ROLE: Lean training client via VS-ENC Orchestrator.
+# PREFETCH: the skill/domain pairs most frequent in the studio log are
+#           pre-generated into an on-disk drill pool (KIMI_DRILL_CACHE_DIR)
+#           while the operator is idle at the prompts, or ahead of time via
+#           `python kimi_deux.py --prefetch`. FORGE DRILL serves a fresh
+#           pooled drill instantly; a fresh generation stays one answer away
+#           (pool or not) and takes the next unused prompt variant.
+# RECEIPTS: every raw generation is kept in a debug bundle (DEBUG_DIR) so
+#           replay_harness.py can re-run format_math/enforce_ceiling offline.
 # ENGINE: QWEN-ECHO via VS-ENC v1.2.1
 # COMPLIANCE: ANACOSTIA-22-FIELD-LAW / VS-ENC-V1.2.1-INHERITANCE
 # LINT-STATUS: RUFF-CLEAN
 # ==============================================================================
 
+import argparse
+import json
+import os
 import re
+import threading
+import time
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from watsonx_client import WatsonXClient
+from typing import Dict, List, Optional, Tuple
+from debug_bundle import write_debug
+from watsonx_client import GenerationCancelled, WatsonXClient
 from vs_enc import VSEncOrchestrator
 
 # PATH CONFIGURATION (RATIFIED PATH LAW)
 VAULT_ROOT = Path("C:/Users/digitalscorpyun/sankofa_temple/Anacostia")
 EMISSION_DIR = "war_council/_artifacts/kimi_deux"
 LOG_PATH = VAULT_ROOT / EMISSION_DIR / "kimi_deux_training_log.md"
+DEBUG_DIR = Path(
+    os.getenv("KIMI_DEBUG_DIR", "C:/Users/digitalscorpyun/projects_2026/avm/_debug/kimi_deux")
+)
 PST = timezone(timedelta(hours=-8))
+# Sections I-XI of a forge drill; sizes max_new_tokens (~2.5k).
+EXPECTED_DRILL_WORDS = 1750
+
+# DRILL PREFETCH POOL
+PREFETCH_ENABLED = os.getenv("KIMI_PREFETCH", "1") != "0"
+DRILL_CACHE_DIR = Path(
+    os.getenv(
+        "KIMI_DRILL_CACHE_DIR",
+        "C:/Users/digitalscorpyun/projects_2026/avm/_cache/kimi_drills",
+    )
+)
+DRILL_TTL_HOURS = float(os.getenv("KIMI_DRILL_TTL_HOURS", "72"))
+PREFETCH_TOP_PAIRS = int(os.getenv("KIMI_PREFETCH_TOP", "3"))
+PREFETCH_DEPTH = int(os.getenv("KIMI_PREFETCH_DEPTH", "1"))
+
+
+# One receipt bundle per studio/prefetch process.
+DEBUG_STAMP = datetime.now(PST).strftime("%Y%m%d_%H%M%S")
+
+
+def save_raw_receipt(label: str, raw: str) -> None:
+    stamp = datetime.now(PST).strftime("%Y%m%d_%H%M%S")
+    write_debug(
+        DEBUG_DIR / f"{DEBUG_STAMP}__kimi_deux.zip",
+        f"{stamp}__{label}__raw.txt",
+        raw,
+        DEBUG_DIR,
+    )
 
 
 class KimiSynapse:
     """Cognitive wrapper for KIMI-DEUX maintaining narrative/math logic."""
 
     def __init__(self):
-        self.client = WatsonXClient()
+        self.client = WatsonXClient(caller="kimi_deux")
         self.client.set_agent("KIMI-DEUX")
 
-    def format_math(self, content: str) -> str:
+    @staticmethod
+    def format_math(content: str) -> str:
         """Enforces block MathJax for Obsidian rendering."""
         content = re.sub(r"\\\((.*?)\\\)", r"\n\n$$\n\1\n$$\n\n", content)
         content = re.sub(
@@ -35,13 +83,27 @@ class KimiSynapse:
         )
         return re.sub(r"\n{3,}", "\n\n", content)
 
-    def enforce_ceiling(self, content: str) -> str:
+    @staticmethod
+    def enforce_ceiling(content: str) -> str:
         """Hard truncation at Section XI (inclusive)."""
         match = re.search(r"\n#+\s*(XII|12)\.", content, re.IGNORECASE)
         return content[: match.start()].strip() if match else content
 
-    def ask(self, prompt: str) -> str:
-        raw = self.client.ask(prompt, max_new_tokens=2500)
+    def ask(
+        self,
+        prompt: str,
+        fresh: bool = False,
+        label: str = "forge_drill",
+        cancel: Optional[threading.Event] = None,
+    ) -> str:
+        raw = self.client.ask(
+            prompt,
+            fresh=fresh,
+            label=label,
+            expected_words=EXPECTED_DRILL_WORDS,
+            cancel=cancel,
+        )
+        save_raw_receipt(label, raw)
         processed = self.format_math(raw)
         return self.enforce_ceiling(processed)
 
@@ -71,8 +133,179 @@ def update_studio_log(topic, domain, filename, result="UNTESTED"):
         f.write(entry)
 
 
+def drill_prompt(skill: str, domain: str, variant: int = 0) -> str:
+    prompt = f"Generate a Repetition Drill for: '{skill}' in '{domain}'. Headers: I-XI."
+    if variant:
+        # Greedy decoding repeats itself; later pool slots ask for new scenarios.
+        prompt += f" Variant {variant}: use different scenarios and numbers."
+    return prompt
+
+
+# ------------------------------------------------------------------------------
+# DRILL PREFETCH POOL
+# ------------------------------------------------------------------------------
+def pair_slug(skill: str, domain: str) -> str:
+    clean = re.sub(r"[^a-z0-9]+", "_", f"{skill}__{domain}".lower())
+    return clean.strip("_")[:120]
+
+
+def frequent_pairs(
+    log_path: Optional[Path] = None, top: int = PREFETCH_TOP_PAIRS
+) -> List[Tuple[str, str]]:
+    """Most frequent (topic, domain) rows in the studio log, most common first."""
+    log_path = log_path or LOG_PATH
+    if not log_path.exists():
+        return []
+    counts: Counter = Counter()
+    spelling: Dict[str, Tuple[str, str]] = {}
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            cells = [c.strip() for c in line.strip().strip("|").split("|")]
+            if len(cells) < 5 or cells[0] in ("TS", "") or cells[0].startswith(":"):
+                continue
+            topic, domain = cells[1], cells[2]
+            if not topic or not domain:
+                continue
+            slug = pair_slug(topic, domain)
+            counts[slug] += 1
+            spelling.setdefault(slug, (topic, domain))
+    return [spelling[slug] for slug, _ in counts.most_common(top)]
+
+
+class DrillPool:
+    """
+    Finished drills on disk: <root>/<pair slug>/<created_ns>_<variant>.json.
+    take() claims the oldest fresh drill with an atomic rename, so a studio
+    and a --prefetch run can share one pool.
+    """
+
+    def __init__(self, root: Path = DRILL_CACHE_DIR, ttl_hours: float = DRILL_TTL_HOURS):
+        self.root = Path(root)
+        self.ttl_s = ttl_hours * 3600 if ttl_hours > 0 else None
+
+    def _fresh(self, skill: str, domain: str) -> List[Path]:
+        pair_dir = self.root / pair_slug(skill, domain)
+        if not pair_dir.exists():
+            return []
+        fresh = []
+        for path in sorted(pair_dir.glob("*.json")):
+            created_s = int(path.stem.split("_")[0]) / 1e9
+            if self.ttl_s and time.time() - created_s > self.ttl_s:
+                path.unlink(missing_ok=True)
+            else:
+                fresh.append(path)
+        return fresh
+
+    def stock(self, skill: str, domain: str) -> int:
+        return len(self._fresh(skill, domain))
+
+    def next_variant(self, skill: str, domain: str) -> int:
+        """Variants already handed out or pooled are never regenerated."""
+        counter = self.root / pair_slug(skill, domain) / "variant"
+        try:
+            return int(counter.read_text(encoding="utf-8")) + 1
+        except (OSError, ValueError):
+            return 1
+
+    def reserve_variant(self, skill: str, domain: str) -> int:
+        """next_variant(), recorded so prefetch never regenerates the same drill."""
+        variant = self.next_variant(skill, domain)
+        self._record_variant(skill, domain, variant)
+        return variant
+
+    def _record_variant(self, skill: str, domain: str, variant: int) -> Path:
+        pair_dir = self.root / pair_slug(skill, domain)
+        pair_dir.mkdir(parents=True, exist_ok=True)
+        (pair_dir / "variant").write_text(str(variant), encoding="utf-8")
+        return pair_dir
+
+    def put(self, skill: str, domain: str, variant: int, content: str) -> Path:
+        pair_dir = self._record_variant(skill, domain, variant)
+        path = pair_dir / f"{time.time_ns()}_{variant}.json"
+        tmp = path.with_suffix(".tmp")
+        record = {"skill": skill, "domain": domain, "variant": variant, "content": content}
+        tmp.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def take(self, skill: str, domain: str) -> Optional[Tuple[str, float]]:
+        """(content, age in hours) of the oldest fresh drill, removed from the pool."""
+        for path in self._fresh(skill, domain):
+            claimed = path.with_suffix(".claimed")
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue  # another process took it first
+            try:
+                record = json.loads(claimed.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            finally:
+                claimed.unlink(missing_ok=True)
+            age_h = (time.time() - int(path.stem.split("_")[0]) / 1e9) / 3600
+            return record["content"], age_h
+        return None
+
+
+def prefetch_drills(
+    pool: DrillPool,
+    pairs: List[Tuple[str, str]],
+    depth: int = PREFETCH_DEPTH,
+    stop: Optional[threading.Event] = None,
+    synapse: Optional["KimiSynapse"] = None,
+) -> int:
+    """Tops every pair up to `depth` fresh drills; returns drills generated."""
+    generated = 0
+    for skill, domain in pairs:
+        while pool.stock(skill, domain) < depth:
+            if stop is not None and stop.is_set():
+                return generated
+            synapse = synapse or KimiSynapse()
+            variant = pool.next_variant(skill, domain)
+            try:
+                content = synapse.ask(
+                    drill_prompt(skill, domain, variant), label="forge_drill_prefetch", cancel=stop
+                )
+            except GenerationCancelled:
+                return generated
+            pool.put(skill, domain, variant, content)
+            generated += 1
+    return generated
+
+
+class DrillPrefetcher:
+    """Daemon thread filling the pool while the studio waits on input()."""
+
+    def __init__(self, pool: DrillPool, pairs: List[Tuple[str, str]]):
+        self.pool = pool
+        self.pairs = pairs
+        self.stop_event = threading.Event()
+        self.generated = 0
+        self._thread = threading.Thread(target=self._run, name="kimi-prefetch", daemon=True)
+
+    def start(self) -> "DrillPrefetcher":
+        if self.pairs:
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self.generated = prefetch_drills(self.pool, self.pairs, stop=self.stop_event)
+        except Exception as e:
+            # Prefetch is opportunistic; the foreground path still generates.
+            print(f"\n⚠️ Drill prefetch stopped: {e}")
+
+    def stop(self) -> None:
+        """Cancels an in-flight generation so exiting never waits on it."""
+        self.stop_event.set()
+
+
 def run_studio():
-    print("✶⌁✶ KIMI-DEUX STUDIO v4.4.1 [HARDENED] ONLINE")
+    print("✶⌁✶ KIMI-DEUX STUDIO v4.5.1 [HARDENED] ONLINE")
+    pool = DrillPool()
+    prefetcher = None
+    if PREFETCH_ENABLED:
+        prefetcher = DrillPrefetcher(pool, frequent_pairs()).start()
     mode = input("1. FORGE DRILL\n2. LOG ASSESSMENT\nSelect: ").strip()
 
     # Initialize Middleware
@@ -83,11 +316,32 @@ def run_studio():
     try:
         if mode == "1":
             skill, domain = input("Core Skill: ").strip(), input("Domain: ").strip()
-            print("✶ Generating pre-processed drill content...")
 
-            # Execute logic through local synapse first
-            drill_prompt = f"Generate a Repetition Drill for: '{skill}' in '{domain}'. Headers: I-XI."
-            processed_content = synapse.ask(drill_prompt)
+            stocked = PREFETCH_ENABLED and pool.stock(skill, domain)
+            question = (
+                "✶ Prefetched drill ready. Fresh generation instead? [y/N]: "
+                if stocked
+                else "✶ Fresh generation (new scenarios, skips cached drills)? [y/N]: "
+            )
+            fresh = input(question).strip().lower() in ("y", "yes")
+            cached = pool.take(skill, domain) if stocked and not fresh else None
+
+            if cached:
+                print(f"✶ Serving prefetched drill content ({cached[1]:.1f}h old)...")
+                processed_content = cached[0]
+            else:
+                if prefetcher is not None:
+                    # The operator is now waiting on this generation; don't
+                    # let background prefetch compete with it for the backend.
+                    prefetcher.stop()
+                print("✶ Generating pre-processed drill content...")
+                # Execute logic through local synapse first
+                # Greedy decoding repeats variant 0 verbatim; a fresh drill
+                # takes the next unused variant, as the prefetcher does.
+                variant = pool.reserve_variant(skill, domain) if fresh else 0
+                processed_content = synapse.ask(
+                    drill_prompt(skill, domain, variant), fresh=fresh
+                )
 
             # Emit via v1.2.1 Orchestrator
             payload = orchestrator.run(
@@ -137,8 +391,32 @@ def run_studio():
 
     except Exception as e:
         print(f"❌ MIGRATION ERROR: {e}")
+    finally:
+        if prefetcher is not None:
+            prefetcher.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KIMI-DEUX study studio")
+    parser.add_argument(
+        "--prefetch", action="store_true", help="fill the drill pool for the top log pairs and exit"
+    )
+    parser.add_argument("--top", type=int, default=PREFETCH_TOP_PAIRS)
+    parser.add_argument("--depth", type=int, default=PREFETCH_DEPTH)
+    args = parser.parse_args()
+
+    if not args.prefetch:
+        run_studio()
+        return
+    pairs = frequent_pairs(top=args.top)
+    if not pairs:
+        print(f"⚠️ No skill/domain history in {LOG_PATH}; nothing to prefetch.")
+        return
+    print(f"✶ Prefetching {args.depth} drill(s) each for: " + "; ".join(f"{s} / {d}" for s, d in pairs))
+    generated = prefetch_drills(DrillPool(), pairs, depth=args.depth)
+    print(f"✓ Drill pool topped up: {generated} generated ({DRILL_CACHE_DIR})")
 
 
 if __name__ == "__main__":
-    run_studio()
+    main()
 
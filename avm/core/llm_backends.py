@@ -0,0 +1,314 @@
+# ==============================================================================
+# ✶⌁✶ llm_backends.py — THE SYNAPSE BACKEND LAYER v1.0.0
+# ==============================================================================
+# ROLE: Pluggable generation backends behind WatsonXClient.
+# BACKENDS (select with WATSONX_BACKEND):
+#   - watsonx : live IBM watsonx.ai (default, requires credentials)
+#   - record  : live watsonx, every generation appended to a cassette
+#   - replay  : serve generations from a cassette, no network, no credentials
+#   - stub    : local HTTP stub server (llm_stub_server.py) with configurable
+#               latency and token rate, for offline throughput benchmarks
+# CONTRACT: generate() -> Generation; generate_stream() -> Iterator[str];
+#           tokenize() -> exact prompt token count, or None if unsupported
+# STARTUP: the ibm_watsonx_ai SDK is imported and credentials are checked on
+#          the first live generation, never at import or construction time.
+# ==============================================================================
+
+import abc
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+BACKEND_NAME = os.getenv("WATSONX_BACKEND", "watsonx").strip().lower()
+CASSETTE_PATH = Path(
+    os.getenv(
+        "WATSONX_CASSETTE",
+        "C:/Users/digitalscorpyun/projects_2026/avm/_cache/cassettes/watsonx_cassette.jsonl",
+    )
+)
+REPLAY_LATENCY = os.getenv("WATSONX_REPLAY_LATENCY", "0") == "1"
+STUB_URL = os.getenv("WATSONX_STUB_URL", "http://127.0.0.1:8765")
+STUB_TIMEOUT_S = float(os.getenv("WATSONX_STUB_TIMEOUT_S", "300"))
+
+CREDENTIAL_VARS = [
+    "WATSONX_APIKEY",
+    "WATSONX_PROJECT_ID",
+    "WATSONX_URL",
+    "WATSONX_REGION",
+]
+
+
+@dataclass
+class Generation:
+    text: str
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+class MissingCredentialsError(RuntimeError):
+    """Live backend invoked without the watsonx env vars."""
+
+
+def ensure_credentials() -> None:
+    """FAIL-FAST GUARD: Authority of the Execution Layer (deferred to first call)."""
+    missing = [v for v in CREDENTIAL_VARS if not os.getenv(v)]
+    if missing:
+        raise MissingCredentialsError(
+            f"❌ CRITICAL INFRASTRUCTURE FAILURE: Missing env vars {missing}"
+        )
+
+
+class CassetteMissError(KeyError):
+    """Replay requested a generation that was never recorded."""
+
+
+class LLMBackend(abc.ABC):
+    name = "base"
+    requires_credentials = False
+
+    @abc.abstractmethod
+    def generate(self, model_id: str, prompt: str, params: Dict[str, Any]) -> Generation:
+        """One complete generation; the only method a backend must supply."""
+
+    def generate_stream(
+        self, model_id: str, prompt: str, params: Dict[str, Any]
+    ) -> Iterator[str]:
+        yield self.generate(model_id, prompt, params).text
+
+    def tokenize(self, model_id: str, text: str) -> Optional[int]:
+        return None
+
+
+# ------------------------------------------------------------------------------
+# LIVE WATSONX
+# ------------------------------------------------------------------------------
+class WatsonXBackend(LLMBackend):
+    name = "watsonx"
+    requires_credentials = True
+
+    def __init__(self) -> None:
+        self.project_id: Optional[str] = None
+        self.creds: Any = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        with self._lock:
+            if self.creds is not None:
+                return
+            ensure_credentials()
+            from ibm_watsonx_ai import Credentials
+
+            self.project_id = os.getenv("WATSONX_PROJECT_ID")
+            self.creds = Credentials(
+                api_key=os.getenv("WATSONX_APIKEY"), url=os.getenv("WATSONX_URL")
+            )
+
+    def _model(self, model_id: str, params: Dict[str, Any]) -> Any:
+        self._connect()
+        from ibm_watsonx_ai.foundation_models import ModelInference
+
+        return ModelInference(
+            model_id=model_id,
+            credentials=self.creds,
+            project_id=self.project_id,
+            params=params,
+        )
+
+    def generate(self, model_id: str, prompt: str, params: Dict[str, Any]) -> Generation:
+        result = self._model(model_id, params).generate(prompt).get("results", [{}])[0]
+        return Generation(
+            text=result.get("generated_text", "").strip(),
+            input_tokens=result.get("input_token_count"),
+            output_tokens=result.get("generated_token_count"),
+        )
+
+    def generate_stream(
+        self, model_id: str, prompt: str, params: Dict[str, Any]
+    ) -> Iterator[str]:
+        return self._model(model_id, params).generate_text_stream(prompt=prompt)
+
+    def tokenize(self, model_id: str, text: str) -> Optional[int]:
+        result = self._model(model_id, {}).tokenize(prompt=text)
+        return result.get("result", {}).get("token_count")
+
+
+# ------------------------------------------------------------------------------
+# RECORD / REPLAY CASSETTE
+# ------------------------------------------------------------------------------
+def cassette_key(model_id: str, prompt: str, params: Dict[str, Any]) -> str:
+    canonical = json.dumps(
+        {"model_id": model_id, "prompt": prompt, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CassetteBackend(LLMBackend):
+    """
+    JSONL cassette keyed by sha256(model_id, full_prompt, params).
+    record mode delegates to `inner` and appends; replay mode never touches
+    the network and raises CassetteMissError on unknown calls.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        path: Path = CASSETTE_PATH,
+        inner: Optional[LLMBackend] = None,
+        replay_latency: bool = REPLAY_LATENCY,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.name = mode
+        self.mode = mode
+        self.path = Path(path)
+        self.inner = inner
+        self.requires_credentials = bool(inner and inner.requires_credentials)
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            if self.mode == "replay":
+                raise FileNotFoundError(f"Cassette not found: {self.path}")
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry
+
+    def _lookup(self, model_id: str, prompt: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        key = cassette_key(model_id, prompt, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            raise CassetteMissError(
+                f"No recorded generation for {model_id} (key {key[:12]}) in {self.path}"
+            )
+        return entry
+
+    def generate(self, model_id: str, prompt: str, params: Dict[str, Any]) -> Generation:
+        if self.mode == "replay":
+            entry = self._lookup(model_id, prompt, params)
+            if self.replay_latency:
+                time.sleep(entry.get("latency_ms", 0) / 1000)
+            return Generation(
+                entry["text"], entry.get("input_tokens"), entry.get("output_tokens")
+            )
+
+        started = time.perf_counter()
+        generation = self.inner.generate(model_id, prompt, params)
+        self._append(
+            {
+                "key": cassette_key(model_id, prompt, params),
+                "model_id": model_id,
+                "params": params,
+                "prompt_chars": len(prompt),
+                "text": generation.text,
+                "input_tokens": generation.input_tokens,
+                "output_tokens": generation.output_tokens,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        )
+        return generation
+
+    def generate_stream(
+        self, model_id: str, prompt: str, params: Dict[str, Any]
+    ) -> Iterator[str]:
+        # Recording stores the complete generation so replays can serve
+        # either mode; replayed streams are re-chunked at ~4 chars/token.
+        text = self.generate(model_id, prompt, params).text
+        for i in range(0, len(text), 4):
+            yield text[i : i + 4]
+
+    def tokenize(self, model_id: str, text: str) -> Optional[int]:
+        # Replay stays offline; budgeting falls back to the estimate.
+        return self.inner.tokenize(model_id, text) if self.inner else None
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# ------------------------------------------------------------------------------
+# LOCAL HTTP STUB
+# ------------------------------------------------------------------------------
+class StubHTTPBackend(LLMBackend):
+    """Client for llm_stub_server.py (POST /v1/generate, _stream, /v1/tokenize)."""
+
+    name = "stub"
+
+    def __init__(self, url: str = STUB_URL, timeout_s: float = STUB_TIMEOUT_S) -> None:
+        self.url = url.rstrip("/")
+        self.timeout_s = timeout_s
+
+    def _post(self, route: str, model_id: str, prompt: str, params: Dict[str, Any]):
+        import urllib.request
+
+        body = json.dumps(
+            {"model_id": model_id, "prompt": prompt, "params": params}
+        ).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.url}{route}",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        return urllib.request.urlopen(request, timeout=self.timeout_s)
+
+    def generate(self, model_id: str, prompt: str, params: Dict[str, Any]) -> Generation:
+        with self._post("/v1/generate", model_id, prompt, params) as response:
+            data = json.loads(response.read().decode("utf-8"))
+        return Generation(
+            data.get("text", "").strip(),
+            data.get("input_tokens"),
+            data.get("output_tokens"),
+        )
+
+    def generate_stream(
+        self, model_id: str, prompt: str, params: Dict[str, Any]
+    ) -> Iterator[str]:
+        response = self._post("/v1/generate_stream", model_id, prompt, params)
+        try:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line.decode("utf-8")).get("text", "")
+        finally:
+            response.close()
+
+    def tokenize(self, model_id: str, text: str) -> Optional[int]:
+        with self._post("/v1/tokenize", model_id, text, {}) as response:
+            return json.loads(response.read().decode("utf-8")).get("token_count")
+
+
+# ------------------------------------------------------------------------------
+# RESOLUTION
+# ------------------------------------------------------------------------------
+def backend_requires_credentials(name: str = BACKEND_NAME) -> bool:
+    return name in ("watsonx", "record")
+
+
+def get_backend(name: str = BACKEND_NAME) -> LLMBackend:
+    if name == "watsonx":
+        return WatsonXBackend()
+    if name == "record":
+        return CassetteBackend("record", inner=WatsonXBackend())
+    if name == "replay":
+        return CassetteBackend("replay")
+    if name == "stub":
+        return StubHTTPBackend()
+    raise ValueError(
+        f"Unknown WATSONX_BACKEND '{name}' (expected watsonx, record, replay or stub)"
+    )
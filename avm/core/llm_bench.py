@@ -0,0 +1,166 @@
+# ==============================================================================
+# ✶⌁✶ llm_bench.py — THE OFFLINE THROUGHPUT BENCH v1.0.0
+# ==============================================================================
+# ROLE: End-to-end latency/throughput runs of the LLM pipelines without live
+#       watsonx credentials (WATSONX_BACKEND=stub or replay).
+# PIPELINES: client, scholarly, qwen_echo, kimi, annotator, chess
+# USAGE:
+#   python llm_stub_server.py --latency-ms 300 --tokens-per-s 80 &
+#   python llm_bench.py --backend stub --pipeline scholarly --runs 4 \
+#       --concurrency 2 --vault /path/to/vault_fixture
+# NOTE: Synapse constructors still resolve protocol manifests, so --vault must
+#       point at a tree containing war_council/avm_syndicate/agents/protocols.
+# ==============================================================================
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.append(str(Path(__file__).parent))
+
+PIPELINES = ["client", "scholarly", "qwen_echo", "kimi", "annotator", "chess"]
+
+SAMPLE_TOPIC = "The Compromise of 1877 (1877)"
+SAMPLE_SOURCE = (
+    "I. Origins\n\nThe Federal Housing Administration codified redlining in 1934, "
+    "and the Home Owners' Loan Corporation graded Chicago neighborhoods by race. "
+) * 40
+SAMPLE_PROTOCOL = "Return a concise analytical artifact with named mechanisms."
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def build_runner(pipeline: str, work_dir: Path) -> Callable[[int], None]:
+    """Returns a callable executing one end-to-end run of the pipeline."""
+    if pipeline == "client":
+        from watsonx_client import WatsonXClient
+
+        client = WatsonXClient()
+        return lambda i: client.ask(f"Benchmark prompt #{i}: summarize {SAMPLE_TOPIC}.")
+
+    if pipeline == "scholarly":
+        import scholarly_dive
+
+        scholarly_dive.DEBUG_DIR = work_dir / "scholarly_dive"
+        scholarly_dive.ensure_debug_dir()
+        syn = scholarly_dive.Synapse()
+        return lambda i: scholarly_dive.generate(syn, f"{SAMPLE_TOPIC} #{i}")
+
+    if pipeline == "qwen_echo":
+        import qwen_echo
+
+        def run_echo(i: int) -> None:
+            session = work_dir / "qwen_echo" / f"run_{i}"
+            session.mkdir(parents=True, exist_ok=True)
+            synapse = qwen_echo.EchoSynapse("UBW", SAMPLE_PROTOCOL, session)
+            source = f"{SAMPLE_SOURCE}\n(run {i})"
+            output = synapse.ask(source)
+            failed, _ = qwen_echo.validate_output(
+                output, "UBW", source, "Bench", session, "pass1"
+            )
+            if failed:
+                output = synapse.repair_invalid_output(source, output)
+                qwen_echo.validate_output(output, "UBW", source, "Bench", session, "pass2")
+
+        return run_echo
+
+    if pipeline == "kimi":
+        from kimi_deux import KimiSynapse
+
+        synapse = KimiSynapse()
+        return lambda i: synapse.ask(
+            f"Generate a Repetition Drill for: 'subnetting #{i}' in 'networking'. Headers: I-XI."
+        )
+
+    if pipeline == "annotator":
+        from scorpyun_annotator import AnnotationSynapse
+
+        synapse = AnnotationSynapse(
+            SAMPLE_PROTOCOL, {"title": "Bench", "author": "Bench", "location": "Ch. 1"}
+        )
+        return lambda i: synapse.ask(f"Excerpt #{i}: {SAMPLE_SOURCE[:600]}")
+
+    if pipeline == "chess":
+        sys.path.append(str(Path(__file__).resolve().parent.parent / "chess"))
+        from wx_chess_analyst import granite_analyze
+
+        return lambda i: granite_analyze(
+            f"[INST] Analyze benchmark game #{i}: 1. d4 d5 2. c4 e6 [/INST]"
+        )
+
+    raise ValueError(f"Unknown pipeline: {pipeline}")
+
+
+def run_bench(pipeline: str, runs: int, concurrency: int, work_dir: Path) -> Dict[str, float]:
+    runner = build_runner(pipeline, work_dir)
+    latencies: List[float] = []
+    errors = 0
+
+    def timed(i: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            runner(i)
+        except Exception as e:
+            errors += 1
+            print(f"⚠️ run {i} failed: {e}")
+        latencies.append(time.perf_counter() - started)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        list(pool.map(timed, range(runs)))
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "runs": runs,
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "runs_per_min": round(runs / wall * 60, 2) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "max_s": round(max(latencies), 3) if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline LLM pipeline benchmark")
+    parser.add_argument("--pipeline", choices=PIPELINES, default="client")
+    parser.add_argument("--backend", choices=["stub", "replay", "watsonx", "record"], default="stub")
+    parser.add_argument("--runs", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--vault", type=Path, help="Vault root holding protocol manifests")
+    parser.add_argument("--use-cache", action="store_true", help="Keep the response cache on")
+    args = parser.parse_args()
+
+    # Backend/cache selection must happen before the clients are imported.
+    os.environ["WATSONX_BACKEND"] = args.backend
+    if not args.use_cache:
+        os.environ["WATSONX_CACHE"] = "0"
+
+    import watsonx_client
+
+    if args.vault:
+        watsonx_client.VAULT_BASE_PATH = args.vault
+
+    with tempfile.TemporaryDirectory(prefix="llm_bench_") as tmp:
+        print(f"✶ Bench: {args.pipeline} x{args.runs} @ concurrency {args.concurrency} ({args.backend})")
+        report = run_bench(args.pipeline, args.runs, args.concurrency, Path(tmp))
+
+    for key, value in report.items():
+        print(f"  {key:<12} {value}")
+
+
+if __name__ == "__main__":
+    main()
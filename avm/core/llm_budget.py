@@ -0,0 +1,155 @@
+# ==============================================================================
+# ✶⌁✶ llm_budget.py — THE SYNAPSE TOKEN LEDGER OF ACCOUNT v1.0.0
+# ==============================================================================
+# ROLE: Token-aware budgeting for WatsonXClient prompts.
+# MECHANISMS:
+#   - Prompt tokens estimated from characters; the backend tokenizer is only
+#     consulted (and memoized) when the estimate comes near the context window
+#   - max_new_tokens sized from the expected artifact length in words
+#   - Overflowing prompts are trimmed inside a caller-marked span (e.g. the
+#     source text) or refused with PromptBudgetError before any generation
+# ENV: WATSONX_BUDGET=0 disables; WATSONX_CONTEXT_WINDOW sets the window for
+#      models missing from MODEL_CONTEXT_WINDOWS.
+# ==============================================================================
+
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+BUDGET_ENABLED = os.getenv("WATSONX_BUDGET", "1") != "0"
+DEFAULT_CONTEXT_WINDOW = int(os.getenv("WATSONX_CONTEXT_WINDOW", "8192"))
+
+MODEL_CONTEXT_WINDOWS = {
+    "ibm/granite-4-h-small": 131072,
+    "ibm/granite-3-3-8b-instruct": 131072,
+    "ibm/granite-3-8b-instruct": 131072,
+    "ibm/granite-13b-instruct-v2": 8192,
+    "meta-llama/llama-3-3-70b-instruct": 131072,
+    "mistralai/mistral-large": 32768,
+}
+
+# Deliberately pessimistic: English prose runs ~4 chars/token on Granite, so
+# the estimate overcounts and a pass here will not overflow on the server.
+CHARS_PER_TOKEN = 3.5
+TOKENS_PER_WORD = 1.3
+OUTPUT_HEADROOM = 1.1
+EXACT_COUNT_THRESHOLD = 0.8
+TRIM_MARKER = "\n[... SOURCE TRIMMED TO FIT CONTEXT BUDGET ...]\n"
+
+
+class PromptBudgetError(ValueError):
+    """The prompt plus its output budget cannot fit the model context window."""
+
+
+def context_window(model_id: str) -> int:
+    return MODEL_CONTEXT_WINDOWS.get(model_id, DEFAULT_CONTEXT_WINDOW)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def tokens_for_words(words: int) -> int:
+    """max_new_tokens for an artifact of ~words words, with headroom."""
+    return math.ceil(words * TOKENS_PER_WORD * OUTPUT_HEADROOM)
+
+
+class TokenCounter:
+    """Estimates by default; exact counts come from backend.tokenize()."""
+
+    def __init__(self, backend: Any, max_entries: int = 256) -> None:
+        self.backend = backend
+        self.max_entries = max_entries
+        self._exact: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, model_id: str, text: str, exact: bool = False) -> Tuple[int, bool]:
+        """Returns (tokens, is_exact). Falls back to the estimate on failure."""
+        if not exact:
+            return estimate_tokens(text), False
+
+        key = hashlib.sha1(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                return self._exact[key], True
+
+        tokenize = getattr(self.backend, "tokenize", None)
+        try:
+            tokens = tokenize(model_id, text) if tokenize else None
+        except Exception as e:
+            print(f"⚠️ Tokenizer unavailable ({type(e).__name__}); using estimate.")
+            tokens = None
+        if tokens is None:
+            return estimate_tokens(text), False
+
+        with self._lock:
+            self._exact[key] = tokens
+            while len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+        return tokens, True
+
+
+@dataclass
+class BudgetPlan:
+    prompt: str
+    prompt_tokens: int
+    max_new_tokens: int
+    trimmed_tokens: int = 0
+    exact: bool = False
+
+
+def plan_budget(
+    counter: TokenCounter,
+    model_id: str,
+    prompt: str,
+    frame: Callable[[str], str],
+    max_new_tokens: int,
+    trimmable: Optional[str] = None,
+) -> BudgetPlan:
+    """
+    Fits frame(prompt) + max_new_tokens into the model's context window.
+    frame wraps the user prompt exactly as it will be sent (system silo).
+    Only text inside `trimmable` (a substring of prompt) may be cut; its
+    tail is dropped first so the opening of a source survives.
+    """
+    window = context_window(model_id)
+    if max_new_tokens >= window:
+        raise PromptBudgetError(
+            f"max_new_tokens={max_new_tokens} exceeds the {window}-token window of {model_id}"
+        )
+
+    trimmed_tokens = 0
+    span = trimmable if trimmable and trimmable in prompt else None
+    for _ in range(4):
+        framed = frame(prompt)
+        tokens, exact = counter.count(model_id, framed)
+        if tokens + max_new_tokens > window * EXACT_COUNT_THRESHOLD:
+            tokens, exact = counter.count(model_id, framed, exact=True)
+
+        overflow = tokens + max_new_tokens - window
+        if overflow <= 0:
+            return BudgetPlan(prompt, tokens, max_new_tokens, trimmed_tokens, exact)
+        if span is None:
+            raise PromptBudgetError(
+                f"Prompt needs {tokens} tokens + {max_new_tokens} output tokens; "
+                f"{model_id} allows {window}. Shorten the input."
+            )
+
+        # Convert with the observed density so exact counts converge quickly.
+        chars_per_token = len(framed) / max(1, tokens)
+        keep_chars = len(span) - math.ceil(overflow * chars_per_token * 1.05) - len(TRIM_MARKER)
+        if keep_chars <= 0:
+            raise PromptBudgetError(
+                f"Prompt overflows {model_id}'s {window}-token window even with the source removed."
+            )
+        shorter = span[:keep_chars].rstrip() + TRIM_MARKER
+        trimmed_tokens += estimate_tokens(span) - estimate_tokens(shorter)
+        prompt = prompt.replace(span, shorter, 1)
+        span = shorter
+
+    raise PromptBudgetError(f"Could not fit prompt into {model_id}'s {window}-token window.")
@@ -0,0 +1,232 @@
+# ==============================================================================
+# ✶⌁✶ llm_ledger.py — THE SYNAPSE TELEMETRY LEDGER v1.0.0
+# ==============================================================================
+# ROLE: Append-only per-call record of every WatsonXClient.ask invocation.
+# STORAGE: JSONL (default) or SQLite when WATSONX_LEDGER ends in .db/.sqlite.
+#          WATSONX_LEDGER=0 disables recording.
+# FIELDS: ts, caller, stage, agent, model_id, backend, latency_ms, ttft_ms,
+#         prompt_tokens, completion_tokens, retries, cache_hit, streamed,
+#         stop_reason, tokens_saved, hedged, max_new_tokens,
+#         trimmed_tokens, error
+# CLI:
+#   python llm_ledger.py summary [--caller qwen_echo] [--since 2026-10-01]
+#   -> per (caller, stage): calls, share, errors, cache hits,
+#      p50/p95 latency, mean prompt/completion tokens
+#   share = stage calls / calls of the caller's busiest stage, so
+#   qwen_echo pass2_repair share == fraction of runs needing a repair pass.
+# ==============================================================================
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+LEDGER_SETTING = os.getenv(
+    "WATSONX_LEDGER",
+    "C:/Users/digitalscorpyun/projects_2026/avm/_ledger/watsonx_calls.jsonl",
+)
+
+LEDGER_FIELDS = [
+    "ts",
+    "caller",
+    "stage",
+    "agent",
+    "model_id",
+    "backend",
+    "latency_ms",
+    "ttft_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "retries",
+    "cache_hit",
+    "streamed",
+    "stop_reason",
+    "tokens_saved",
+    "hedged",
+    "max_new_tokens",
+    "trimmed_tokens",
+    "error",
+]
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+class CallLedger:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.is_sqlite = self.path.suffix.lower() in (".db", ".sqlite")
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # --------------------------------------------------------------------------
+    # WRITE
+    # --------------------------------------------------------------------------
+    def record(self, entry: Dict[str, Any]) -> None:
+        row = {field: entry.get(field) for field in LEDGER_FIELDS}
+        row["ts"] = row["ts"] or utc_now_iso()
+        try:
+            with self._lock:
+                if self.is_sqlite:
+                    self._write_sqlite(row)
+                else:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        except (OSError, sqlite3.Error) as e:
+            # Telemetry must never take down a generation.
+            print(f"⚠️ Ledger write failed ({self.path}): {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            columns = ", ".join(f"{field}" for field in LEDGER_FIELDS)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS calls ({columns})")
+            # Ledgers written before a field existed gain it as a NULL column.
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(calls)")}
+            for field in LEDGER_FIELDS:
+                if field not in existing:
+                    self._conn.execute(f"ALTER TABLE calls ADD COLUMN {field}")
+        return self._conn
+
+    def _write_sqlite(self, row: Dict[str, Any]) -> None:
+        conn = self._connect()
+        placeholders = ", ".join("?" for _ in LEDGER_FIELDS)
+        conn.execute(
+            f"INSERT INTO calls ({', '.join(LEDGER_FIELDS)}) VALUES ({placeholders})",
+            [row[field] for field in LEDGER_FIELDS],
+        )
+        conn.commit()
+
+    # --------------------------------------------------------------------------
+    # READ
+    # --------------------------------------------------------------------------
+    def rows(self) -> Iterable[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        if self.is_sqlite:
+            conn = self._connect()
+            cursor = conn.execute(f"SELECT {', '.join(LEDGER_FIELDS)} FROM calls")
+            return [dict(zip(LEDGER_FIELDS, values)) for values in cursor]
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+_SHARED_LEDGER: Optional[CallLedger] = None
+
+
+def get_ledger() -> Optional[CallLedger]:
+    """Process-wide ledger; None when WATSONX_LEDGER=0."""
+    global _SHARED_LEDGER
+    if LEDGER_SETTING.strip().lower() in ("", "0", "off"):
+        return None
+    if _SHARED_LEDGER is None:
+        _SHARED_LEDGER = CallLedger(Path(LEDGER_SETTING))
+    return _SHARED_LEDGER
+
+
+# ------------------------------------------------------------------------------
+# SUMMARY
+# ------------------------------------------------------------------------------
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def summarize(
+    rows: Iterable[Dict[str, Any]],
+    caller: Optional[str] = None,
+    since: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for row in rows:
+        if caller and row.get("caller") != caller:
+            continue
+        if since and str(row.get("ts", "")) < since:
+            continue
+        key = (row.get("caller") or "unlabeled", row.get("stage") or "ask")
+        groups.setdefault(key, []).append(row)
+
+    busiest: Dict[str, int] = {}
+    for (group_caller, _), items in groups.items():
+        busiest[group_caller] = max(busiest.get(group_caller, 0), len(items))
+
+    summary: List[Dict[str, Any]] = []
+    for (group_caller, stage), items in sorted(groups.items()):
+        latencies = [r["latency_ms"] for r in items if r.get("latency_ms") is not None]
+        prompt_tokens = [r["prompt_tokens"] for r in items if r.get("prompt_tokens")]
+        completion_tokens = [
+            r["completion_tokens"] for r in items if r.get("completion_tokens")
+        ]
+        summary.append(
+            {
+                "caller": group_caller,
+                "stage": stage,
+                "calls": len(items),
+                "share": round(len(items) / busiest[group_caller], 3),
+                "errors": sum(1 for r in items if r.get("error")),
+                "cache_hits": sum(1 for r in items if r.get("cache_hit")),
+                "retries": sum(r.get("retries") or 0 for r in items),
+                "hedged": sum(1 for r in items if r.get("hedged")),
+                "p50_ms": round(percentile(latencies, 50), 1),
+                "p95_ms": round(percentile(latencies, 95), 1),
+                "prompt_tok": round(mean(prompt_tokens)),
+                "compl_tok": round(mean(completion_tokens)),
+                "total_tok": sum(prompt_tokens) + sum(completion_tokens),
+            }
+        )
+    return summary
+
+
+def print_summary(summary: List[Dict[str, Any]]) -> None:
+    if not summary:
+        print("✶ Ledger empty for the selected filter.")
+        return
+    columns = list(summary[0].keys())
+    widths = {
+        c: max(len(c), *(len(str(row[c])) for row in summary)) for c in columns
+    }
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in summary:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WatsonX call ledger")
+    parser.add_argument("command", choices=["summary", "tail"])
+    parser.add_argument("--ledger", type=Path, default=Path(LEDGER_SETTING))
+    parser.add_argument("--caller")
+    parser.add_argument("--since", help="ISO timestamp prefix, e.g. 2026-10-01")
+    parser.add_argument("-n", type=int, default=20, help="rows for tail")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = list(CallLedger(args.ledger).rows())
+    if args.command == "tail":
+        for row in rows[-args.n :]:
+            print(json.dumps(row, ensure_ascii=False))
+        return
+
+    summary = summarize(rows, caller=args.caller, since=args.since)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+# ==============================================================================
+# ✶⌁✶ llm_resilience.py — THE SYNAPSE SHOCK ABSORBER v1.1.0
+# ==============================================================================
+# ROLE: Keeps one slow or failed generation from stalling a whole run.
+# MECHANISMS:
+#   - Per-attempt deadline (WATSONX_DEADLINE_S)
+#   - Jittered exponential backoff on transient errors (timeouts, connection
+#     resets, HTTP 408/425/429/5xx) up to WATSONX_MAX_RETRIES
+#   - Circuit breaker per model: opens after WATSONX_BREAKER_THRESHOLD
+#     consecutive failures, half-opens after WATSONX_BREAKER_COOLDOWN_S and
+#     then admits exactly one probe call until it succeeds or fails
+#   - Optional hedging (WATSONX_HEDGE=1): a duplicate request fires once the
+#     primary outlives the model's rolling p95 latency; first success wins
+# NOTE: Python threads cannot be killed. Abortable callers
+#       (call_with_resilience(..., abortable=True)) receive a per-attempt
+#       Event that is set when the attempt loses a hedge or outlives its
+#       deadline, so a stream can close at its next chunk. Blocking attempts
+#       still finish in the shared pool; their result is discarded.
+# ==============================================================================
+
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+STATUS_IN_TEXT_RE = re.compile(r"\b(408|425|429|500|502|503|504)\b")
+
+_ATTEMPT_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("WATSONX_ATTEMPT_WORKERS", "32")),
+    thread_name_prefix="watsonx-attempt",
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """A generation attempt outlived its deadline."""
+
+
+class CircuitOpenError(RuntimeError):
+    """The model's circuit breaker is open; the call was not attempted."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Errors worth retrying: timeouts, dropped connections, 408/425/429/5xx."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    response = getattr(exc, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status in TRANSIENT_STATUS
+    reason = getattr(exc, "reason", None)
+    if isinstance(reason, (TimeoutError, ConnectionError)):
+        return True
+    # ibm_watsonx_ai surfaces HTTP failures as ApiRequestFailure text.
+    if type(exc).__name__ == "ApiRequestFailure":
+        return bool(STATUS_IN_TEXT_RE.search(str(exc)))
+    return False
+
+
+# ------------------------------------------------------------------------------
+# POLICY
+# ------------------------------------------------------------------------------
+@dataclass
+class ResiliencePolicy:
+    deadline_s: Optional[float] = 180.0
+    max_retries: int = 2
+    backoff_base_s: float = 1.0
+    backoff_max_s: float = 20.0
+    hedge: bool = False
+    hedge_min_samples: int = 8
+    hedge_floor_s: float = 0.05
+
+    @classmethod
+    def from_env(cls) -> "ResiliencePolicy":
+        deadline = float(os.getenv("WATSONX_DEADLINE_S", "180"))
+        return cls(
+            deadline_s=deadline if deadline > 0 else None,
+            max_retries=int(os.getenv("WATSONX_MAX_RETRIES", "2")),
+            backoff_base_s=float(os.getenv("WATSONX_BACKOFF_S", "1.0")),
+            backoff_max_s=float(os.getenv("WATSONX_BACKOFF_MAX_S", "20")),
+            hedge=os.getenv("WATSONX_HEDGE", "0") == "1",
+        )
+
+    def backoff(self, retry_number: int) -> float:
+        """Full jitter: uniform(0, min(cap, base * 2^n))."""
+        ceiling = min(self.backoff_max_s, self.backoff_base_s * (2 ** retry_number))
+        return random.uniform(0, ceiling)
+
+
+# ------------------------------------------------------------------------------
+# CIRCUIT BREAKER / LATENCY WINDOW
+# ------------------------------------------------------------------------------
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = int(os.getenv("WATSONX_BREAKER_THRESHOLD", "5")),
+        cooldown_s: float = float(os.getenv("WATSONX_BREAKER_COOLDOWN_S", "60")),
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.cooldown_s:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Closed: always. Open: never. Half-open: one probe at a time."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown_s:
+                return False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def release(self) -> None:
+        """Ends a probe that proved nothing about the backend (e.g. a 400)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                # Half-open probe failures re-open for a full cooldown.
+                self._opened_at = time.monotonic()
+
+
+class LatencyWindow:
+    def __init__(self, size: int = 50) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def p95(self) -> float:
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return 0.0
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_WINDOWS: Dict[str, LatencyWindow] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_breaker(key: str) -> CircuitBreaker:
+    with _REGISTRY_LOCK:
+        return _BREAKERS.setdefault(key, CircuitBreaker())
+
+
+def get_latency_window(key: str) -> LatencyWindow:
+    with _REGISTRY_LOCK:
+        return _WINDOWS.setdefault(key, LatencyWindow())
+
+
+# ------------------------------------------------------------------------------
+# EXECUTION
+# ------------------------------------------------------------------------------
+def _run_attempt(
+    fn: Callable[..., Any],
+    policy: ResiliencePolicy,
+    window: LatencyWindow,
+    on_event: Callable[[str], None],
+    abortable: bool = False,
+) -> Any:
+    started = time.monotonic()
+    deadline_at = started + policy.deadline_s if policy.deadline_s else None
+    aborts: Dict[Future, threading.Event] = {}
+
+    def remaining() -> Optional[float]:
+        return None if deadline_at is None else max(0.0, deadline_at - time.monotonic())
+
+    def submit() -> Future:
+        if not abortable:
+            return _ATTEMPT_POOL.submit(fn)
+        abort = threading.Event()
+        future = _ATTEMPT_POOL.submit(fn, abort)
+        aborts[future] = abort
+        return future
+
+    def abandon(future: Future) -> None:
+        future.cancel()
+        if future in aborts:
+            aborts[future].set()
+
+    futures = [submit()]
+    hedge_delay: Optional[float] = None
+    if policy.hedge and window.count() >= policy.hedge_min_samples:
+        hedge_delay = max(policy.hedge_floor_s, window.p95())
+
+    if hedge_delay is not None:
+        budget = remaining()
+        first_wait = hedge_delay if budget is None else min(hedge_delay, budget)
+        done, _ = wait(futures, timeout=first_wait)
+        if not done and (budget is None or budget > hedge_delay):
+            on_event("hedge")
+            futures.append(submit())
+
+    last_error: Optional[BaseException] = None
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            error = future.exception()
+            if error is None:
+                window.add(time.monotonic() - started)
+                for loser in pending:
+                    abandon(loser)
+                return future.result()
+            last_error = error
+
+    if pending:
+        for orphan in pending:
+            abandon(orphan)
+        raise DeadlineExceeded(
+            f"Generation exceeded {policy.deadline_s:.1f}s deadline"
+        )
+    raise last_error  # type: ignore[misc]
+
+
+def call_with_resilience(
+    fn: Callable[..., Any],
+    policy: ResiliencePolicy,
+    breaker: CircuitBreaker,
+    window: LatencyWindow,
+    on_event: Callable[[str], None] = lambda kind: None,
+    abortable: bool = False,
+) -> Any:
+    """
+    Runs fn under the policy. on_event receives "retry" and "hedge" so the
+    caller can account for them (e.g. in the telemetry ledger). With
+    abortable=True, fn(abort) gets an Event set once its attempt is
+    abandoned (lost hedge, deadline) and should stop generating.
+    """
+    retry_number = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit open after repeated failures; retry in <= {breaker.cooldown_s:.0f}s"
+            )
+        try:
+            result = _run_attempt(fn, policy, window, on_event, abortable)
+        except Exception as e:
+            transient = is_transient(e)
+            if transient:
+                breaker.record_failure()
+            else:
+                breaker.release()
+            if not transient or retry_number >= policy.max_retries:
+                raise
+            delay = policy.backoff(retry_number)
+            retry_number += 1
+            on_event("retry")
+            print(f"⚠️ Transient generation failure ({type(e).__name__}); retry {retry_number} in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
@@ -0,0 +1,225 @@
+# ==============================================================================
+# ✶⌁✶ llm_stub_server.py — THE LOCAL SYNAPSE STUB v1.1.0
+# ==============================================================================
+# ROLE: Offline stand-in for watsonx generation (WATSONX_BACKEND=stub).
+# ENGINE: http.server (stdlib), one thread per request.
+# ROUTES:
+#   POST /v1/generate         -> {"text", "input_tokens", "output_tokens"}
+#   POST /v1/generate_stream  -> NDJSON lines {"text": "<token> "}
+#   POST /v1/tokenize         -> {"token_count"} (whitespace tokens)
+#   GET  /v1/stats            -> request counters
+# TIMING: --latency-ms before the first token, then --tokens-per-s.
+# RESPONSES: --response-file (fixed text) or synthetic tokens capped by
+#            min(--output-tokens, params.max_new_tokens).
+# FAULTS (v1.1.0): --fault-rate / --fail-first answer with --fault-status;
+#            --slow-rate / --slow-first add --slow-ms before the first token.
+# ==============================================================================
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StubConfig:
+    def __init__(
+        self,
+        latency_ms: float = 250.0,
+        tokens_per_s: float = 60.0,
+        output_tokens: int = 400,
+        response_text: Optional[str] = None,
+        fault_rate: float = 0.0,
+        fault_status: int = 503,
+        fail_next: int = 0,
+        slow_rate: float = 0.0,
+        slow_ms: float = 5000.0,
+        slow_next: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.tokens_per_s = tokens_per_s
+        self.output_tokens = output_tokens
+        self.response_text = response_text
+        self.fault_rate = fault_rate
+        self.fault_status = fault_status
+        self.fail_next = fail_next
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.slow_next = slow_next
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "streams": 0,
+            "tokens_out": 0,
+            "faults": 0,
+            "slow": 0,
+        }
+
+    def draw_faults(self) -> Tuple[bool, bool]:
+        """Decides (fail, slow) for one request; counters win over rates."""
+        with self.lock:
+            fail = self.fail_next > 0 or self.rng.random() < self.fault_rate
+            if self.fail_next > 0:
+                self.fail_next -= 1
+            slow = self.slow_next > 0 or self.rng.random() < self.slow_rate
+            if self.slow_next > 0:
+                self.slow_next -= 1
+            self.stats["faults"] += int(fail)
+            self.stats["slow"] += int(slow and not fail)
+            return fail, slow
+
+    def tokens_for(self, params: Dict[str, Any]) -> List[str]:
+        limit = int(params.get("max_new_tokens", self.output_tokens))
+        if self.response_text is not None:
+            words = self.response_text.split(" ")
+            return [w + " " for w in words[:limit]]
+        count = min(self.output_tokens, limit)
+        return [f"stub{i % 97} " for i in range(count)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    config: StubConfig = StubConfig()
+    protocol_version = "HTTP/1.0"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", "0"))
+        return json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+
+    def _send_json(self, status: int, data: Dict[str, Any]) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/v1/stats":
+            with self.config.lock:
+                self._send_json(200, dict(self.config.stats))
+            return
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.path == "/v1/tokenize":
+            prompt = self._read_json().get("prompt", "")
+            self._send_json(200, {"token_count": len(prompt.split())})
+            return
+        if self.path not in ("/v1/generate", "/v1/generate_stream"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        request = self._read_json()
+        params = request.get("params", {})
+        tokens = self.config.tokens_for(params)
+        input_tokens = len(request.get("prompt", "").split())
+        streaming = self.path.endswith("_stream")
+
+        with self.config.lock:
+            self.config.stats["requests"] += 1
+            self.config.stats["streams"] += int(streaming)
+
+        fail, slow = self.config.draw_faults()
+        if fail:
+            self._send_json(
+                self.config.fault_status, {"error": "injected fault"}
+            )
+            return
+        if slow:
+            time.sleep(self.config.slow_ms / 1000)
+
+        time.sleep(self.config.latency_ms / 1000)
+        per_token_s = 1.0 / self.config.tokens_per_s if self.config.tokens_per_s else 0
+
+        if not streaming:
+            time.sleep(per_token_s * len(tokens))
+            with self.config.lock:
+                self.config.stats["tokens_out"] += len(tokens)
+            self._send_json(
+                200,
+                {
+                    "text": "".join(tokens),
+                    "input_tokens": input_tokens,
+                    "output_tokens": len(tokens),
+                },
+            )
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        sent = 0
+        try:
+            for token in tokens:
+                self.wfile.write((json.dumps({"text": token}) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                sent += 1
+                time.sleep(per_token_s)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client aborted the stream early
+        with self.config.lock:
+            self.config.stats["tokens_out"] += sent
+
+
+def serve(host: str, port: int, config: StubConfig) -> ThreadingHTTPServer:
+    """Starts the stub in a daemon thread and returns the server handle."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local watsonx stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=250.0)
+    parser.add_argument("--tokens-per-s", type=float, default=60.0)
+    parser.add_argument("--output-tokens", type=int, default=400)
+    parser.add_argument("--response-file", type=Path)
+    parser.add_argument("--fault-rate", type=float, default=0.0)
+    parser.add_argument("--fault-status", type=int, default=503)
+    parser.add_argument("--fail-first", type=int, default=0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=5000.0)
+    parser.add_argument("--slow-first", type=int, default=0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    response_text = (
+        args.response_file.read_text(encoding="utf-8") if args.response_file else None
+    )
+    config = StubConfig(
+        args.latency_ms,
+        args.tokens_per_s,
+        args.output_tokens,
+        response_text,
+        fault_rate=args.fault_rate,
+        fault_status=args.fault_status,
+        fail_next=args.fail_first,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+        slow_next=args.slow_first,
+        seed=args.seed,
+    )
+    server = serve(args.host, args.port, config)
+    print(f"✶ LLM stub listening on http://{args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n✶ LLM stub stopped.")
+
+
+if __name__ == "__main__":
+    main()
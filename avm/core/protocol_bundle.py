@@ -0,0 +1,196 @@
+# ==============================================================================
+# ✶⌁✶ protocol_bundle.py — THE COMPILED PROTOCOL CODEX v1.0.0
+# ==============================================================================
+# ROLE: One parser and one on-disk bundle for every protocol source:
+#   - summary_styles_guide.md -> {style name: protocol block}
+#   - agent protocol manifests -> system prompt (text after the last ---)
+# BUNDLE: pickle at AVM_PROTOCOL_BUNDLE, {path: (kind, mtime_ns, parsed)}.
+#         Loaded in one read per process; an entry is reused while its
+#         source mtime matches, otherwise re-parsed and the bundle rewritten.
+# CLI:
+#   python protocol_bundle.py compile   # parse the guide + every manifest
+#   python protocol_bundle.py show
+# ==============================================================================
+
+import argparse
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BUNDLE_PATH = Path(
+    os.getenv(
+        "AVM_PROTOCOL_BUNDLE",
+        "C:/Users/digitalscorpyun/projects_2026/avm/_cache/protocol_bundle.pkl",
+    )
+)
+VAULT_ROOT = Path("C:/Users/digitalscorpyun/sankofa_temple/Anacostia")
+STYLE_GUIDE_PATH = (
+    VAULT_ROOT / "war_council/documentation/writing_protocols/summary_styles_guide.md"
+)
+MANIFEST_DIR = "war_council/avm_syndicate/agents/protocols"
+
+# Bumped whenever a parser changes, so stale bundles are discarded.
+BUNDLE_FORMAT = 1
+
+STYLE_HEADER_RE = re.compile(r"^\s*#.*?\d+\.\s*\*\*(.+?)\*\*\s*$")
+
+
+# ------------------------------------------------------------------------------
+# PARSERS
+# ------------------------------------------------------------------------------
+def parse_style_guide(content: str, path: Path = STYLE_GUIDE_PATH) -> Dict[str, str]:
+    """
+    Extract style blocks from summary_styles_guide.md.
+
+    Supports headings like:
+        # 🔷 1. **SankofaCut — Strategic Micro-Brief**
+        # 🧱 2. **Abolition Systems Cut (ASC)**
+        # 🔷 3. **UBW — Universal Black Wisdom**
+    """
+    lines = content.splitlines()
+
+    headers: List[Tuple[int, str]] = []
+    for idx, line in enumerate(lines):
+        match = STYLE_HEADER_RE.match(line)
+        if match:
+            clean_name = match.group(1).replace("*", "").split("—")[0].strip()
+            clean_name = clean_name.split("(")[0].strip()
+            headers.append((idx, clean_name))
+
+    styles: Dict[str, str] = {}
+    for i, (start_idx, style_name) in enumerate(headers):
+        end_idx = headers[i + 1][0] if i + 1 < len(headers) else len(lines)
+        styles[style_name] = "\n".join(lines[start_idx + 1:end_idx]).strip()
+    return styles
+
+
+def parse_manifest(content: str, path: Path) -> str:
+    parts = content.split("---")
+    if len(parts) < 3:
+        raise ValueError(f"✶ ERROR: Manifest at {path} is malformed.")
+    return parts[-1].strip()
+
+
+PARSERS: Dict[str, Callable[[str, Path], Any]] = {
+    "styles": parse_style_guide,
+    "manifest": parse_manifest,
+}
+
+
+# ------------------------------------------------------------------------------
+# BUNDLE
+# ------------------------------------------------------------------------------
+class ProtocolBundle:
+    def __init__(self, path: Path = BUNDLE_PATH) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, Tuple[str, int, Any]] = {}
+        self.stats = {"hits": 0, "loads": 0, "reloads": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path = BUNDLE_PATH) -> "ProtocolBundle":
+        bundle = cls(path)
+        try:
+            with open(bundle.path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("format") == BUNDLE_FORMAT:
+                bundle.entries = data["entries"]
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError) as e:
+            print(f"⚠️ Protocol bundle unreadable ({bundle.path}): {e}; recompiling on demand.")
+        return bundle
+
+    def get(self, source: Path, kind: str) -> Any:
+        """Parsed `kind` view of source; raises FileNotFoundError if it is missing."""
+        key = str(source)
+        mtime_ns = Path(source).stat().st_mtime_ns
+        with self._lock:
+            cached = self.entries.get(key)
+            if cached and cached[0] == kind and cached[1] == mtime_ns:
+                self.stats["hits"] += 1
+                return cached[2]
+
+        with open(source, "r", encoding="utf-8") as f:
+            parsed = PARSERS[kind](f.read(), Path(source))
+
+        with self._lock:
+            self.stats["reloads" if key in self.entries else "loads"] += 1
+            self.entries[key] = (kind, mtime_ns, parsed)
+        self.save()
+        return parsed
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"format": BUNDLE_FORMAT, "entries": dict(self.entries)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            # The in-memory bundle still serves this process.
+            print(f"⚠️ Protocol bundle write failed ({self.path}): {e}")
+
+
+_BUNDLE: Optional[ProtocolBundle] = None
+_BUNDLE_LOCK = threading.Lock()
+
+
+def get_bundle() -> ProtocolBundle:
+    """Process-wide bundle, read from disk on first use."""
+    global _BUNDLE
+    with _BUNDLE_LOCK:
+        if _BUNDLE is None:
+            _BUNDLE = ProtocolBundle.load()
+        return _BUNDLE
+
+
+def read_styles(path: Path = STYLE_GUIDE_PATH) -> Dict[str, str]:
+    return dict(get_bundle().get(path, "styles"))
+
+
+def read_manifest(path: Path) -> str:
+    return get_bundle().get(path, "manifest")
+
+
+def compile_bundle(vault_root: Path = VAULT_ROOT) -> ProtocolBundle:
+    """Parses the style guide and every manifest under MANIFEST_DIR up front."""
+    bundle = get_bundle()
+    guide = vault_root / STYLE_GUIDE_PATH.relative_to(VAULT_ROOT)
+    if guide.exists():
+        bundle.get(guide, "styles")
+    else:
+        print(f"⚠️ Style guide missing: {guide}")
+    for manifest in sorted((vault_root / MANIFEST_DIR).glob("*.md")):
+        try:
+            bundle.get(manifest, "manifest")
+        except ValueError as e:
+            print(f"⚠️ {e}")
+    return bundle
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compiled protocol bundle")
+    parser.add_argument("command", choices=["compile", "show"])
+    parser.add_argument("--vault", type=Path, default=VAULT_ROOT)
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        bundle = compile_bundle(args.vault)
+        print(f"✓ Compiled {len(bundle.entries)} protocol source(s) into {bundle.path}")
+        return
+
+    bundle = get_bundle()
+    print(f"✶ {bundle.path} ({len(bundle.entries)} sources)")
+    for source, (kind, _, parsed) in sorted(bundle.entries.items()):
+        detail = ", ".join(parsed) if kind == "styles" else f"{len(parsed)} chars"
+        print(f"  {kind:<8} {source} — {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,28 +6,40 @@
 # PURPOSE:
 #   - Apply a selected Anacostia summary/refinery protocol to source text
 #   - Emit structured artifacts through VS-ENC
-#   - Preserve debug receipts for auditability
+#   - Preserve debug receipts for auditability (one zip bundle per session,
+#     written off-thread by debug_bundle)
 #   - Prevent invalid emissions (raw-source replay / missing structure)
 #   - Enforce source-density so UBW cannot pass as generic thematic summary
+#   - Map-reduce longform sources: section-aligned chunks -> notes
+#     (concurrent, amap_chunks; cached by the client) -> one style-template
+#     emission
+#   - Batch mode: python qwen_echo.py --batch jobs.csv --workers 3
+#     (CSV/YAML of source_path, title, style; existing artifacts are skipped;
+#     pass1/pass2 outcomes appended to <manifest>.ledger.jsonl once the
+#     artifact is actually on disk; duplicate manifest jobs are skipped)
+#   - Style guide parsed once into protocol_bundle's compiled pickle
 # ==============================================================================
 
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
 import os
-import sys
 import re
-from difflib import SequenceMatcher
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple, Optional, List
+from typing import Dict, Tuple, Optional, List, Set
 
+from debug_bundle import BUNDLES_ENABLED, write_debug
+from protocol_bundle import parse_style_guide, read_styles
 from watsonx_client import WatsonXClient
-from vs_enc import VSEncOrchestrator
-
-# ------------------------------------------------------------------------------
-# FAIL-FAST ENVIRONMENT GUARD
-# ------------------------------------------------------------------------------
-if not os.getenv("WATSONX_PROJECT_ID"):
-    print("❌ ERROR: WATSONX_PROJECT_ID not found in environment.")
-    sys.exit(1)
+from vs_enc import OnWritten, VSEncOrchestrator
 
 # ------------------------------------------------------------------------------
 # STATIC PATHS / GLOBALS
@@ -41,6 +53,23 @@ DEBUG_ROOT = VAULT_ROOT / ARTIFACT_ROOT / "_debug"
 
 PST = timezone(timedelta(hours=-8))
 
+# Artifact lengths that size max_new_tokens (~3k pass 1, ~2.5k repair).
+# Oversized sources are trimmed to the model context, never the protocol.
+EXPECTED_ARTIFACT_WORDS = 2100
+EXPECTED_REPAIR_WORDS = 1750
+
+# CHUNKED MODE: longform sources (> CHUNK_MIN_WORDS) are split on section
+# boundaries, each chunk is reduced to source notes concurrently (map), and
+# the notes are refined into the style template (reduce). Map calls are
+# greedy, so the client's response cache keeps each chunk's notes (keyed on
+# the real decoding params, off with WATSONX_CACHE=0) and a failed or
+# repaired reduce never redoes the map.
+# QWEN_CHUNKED=0 disables, =1 forces chunking for any source size.
+CHUNKED_MODE = os.getenv("QWEN_CHUNKED", "auto")
+CHUNK_MIN_WORDS = 6000
+CHUNK_TARGET_WORDS = 2500
+EXPECTED_MAP_WORDS = 450
+
 GENERIC_MARKERS = [
     "systemic racism",
     "despite progress",
@@ -93,10 +122,13 @@ def truncate_for_preview(text: str, limit: int = 2000) -> str:
     return text[:limit] + "\n...[TRUNCATED FOR PREVIEW]..."
 
 
-def save_text(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+def debug_bundle_path(debug_session_dir: Path) -> Path:
+    return debug_session_dir.with_name(f"{debug_session_dir.name}.zip")
+
+
+def save_debug(debug_session_dir: Path, name: str, content: str) -> None:
+    """Queues a receipt into the session bundle (a loose file when bundles are off)."""
+    write_debug(debug_bundle_path(debug_session_dir), name, content, debug_session_dir)
 
 
 def slugify(value: str) -> str:
@@ -109,10 +141,6 @@ def normalize_ws(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def similarity(a: str, b: str) -> float:
-    return SequenceMatcher(None, normalize_ws(a), normalize_ws(b)).ratio()
-
-
 def resolve_style_name(style_name: str, available: Dict[str, str]) -> Optional[str]:
     """
     Resolve style name robustly against extracted style guide names.
@@ -163,6 +191,68 @@ def detect_source_profile(text: str) -> str:
     return ", ".join(signals)
 
 
+SECTION_BOUNDARY_RE = re.compile(
+    r"^\s*(?:#{1,6}\s+\S.*"                      # markdown heading
+    r"|(?:[IVXLC]+|\d{1,2})\.\s+[A-Z].{0,80}"      # I. Origins / 3. Findings
+    r"|(?i:chapter|part|section)\s+[\w.]+.{0,80}"
+    r"|[A-Z][A-Z0-9 ,:'’&-]{3,80})\s*$"          # ALL-CAPS heading line
+)
+
+
+def split_source_sections(text: str) -> List[str]:
+    """Splits a source before each heading-like line; text before the first stays whole."""
+    sections: List[str] = []
+    current: List[str] = []
+    for line in text.splitlines():
+        if SECTION_BOUNDARY_RE.match(line) and any(l.strip() for l in current):
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if any(l.strip() for l in current):
+        sections.append("\n".join(current).strip())
+    return sections
+
+
+def split_oversized(section: str, target_words: int) -> List[str]:
+    """Paragraph-packs a section larger than target_words; giant paragraphs split on words."""
+    pieces: List[str] = []
+    for para in re.split(r"\n\s*\n", section):
+        words = para.split()
+        if len(words) <= target_words:
+            pieces.append(para.strip())
+            continue
+        for start in range(0, len(words), target_words):
+            pieces.append(" ".join(words[start:start + target_words]))
+    return pack_pieces([p for p in pieces if p], target_words, "\n\n")
+
+
+def pack_pieces(pieces: List[str], target_words: int, joiner: str) -> List[str]:
+    chunks: List[str] = []
+    current: List[str] = []
+    current_words = 0
+    for piece in pieces:
+        words = len(piece.split())
+        if current and current_words + words > target_words:
+            chunks.append(joiner.join(current))
+            current, current_words = [], 0
+        current.append(piece)
+        current_words += words
+    if current:
+        chunks.append(joiner.join(current))
+    return chunks
+
+
+def chunk_source(text: str, target_words: int = CHUNK_TARGET_WORDS) -> List[str]:
+    """Section-aligned chunks of about target_words, in source order."""
+    pieces: List[str] = []
+    for section in split_source_sections(text):
+        if len(section.split()) > target_words:
+            pieces.extend(split_oversized(section, target_words))
+        else:
+            pieces.append(section)
+    return pack_pieces(pieces, target_words, "\n\n")
+
+
 def count_named_signals(text: str) -> int:
     """
     Rough heuristic for specific named content.
@@ -183,23 +273,99 @@ def generic_score(text: str) -> int:
     return sum(1 for marker in GENERIC_MARKERS if marker in lowered)
 
 
-def contains_large_source_span(output_text: str, source_text: str, span: int = 700) -> bool:
-    """
-    Detects obvious raw-source replay by checking whether a large normalized span
-    of the source appears inside the output.
-    """
-    source_norm = normalize_ws(source_text)
-    output_norm = normalize_ws(output_text)
+# ------------------------------------------------------------------------------
+# REPLAY INDEX
+# ------------------------------------------------------------------------------
+# Every K-word shingle of the source is hashed once per run (polynomial rolling
+# hash over per-word hashes); an output is scanned in one pass, so copied spans
+# are found at any position in O(source + output) words.
+WORD_RE = re.compile(r"\w+")
+REPLAY_SHINGLE_WORDS = 8
+REPLAY_SPAN_CHARS = 700
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+
+def rolling_shingle_hashes(words: List[str], k: int) -> List[int]:
+    """Hash of every k-word window, in order (len(words) - k + 1 values)."""
+    if k <= 0 or len(words) < k:
+        return []
+    values = [hash(w) % _HASH_MOD for w in words]
+    drop = pow(_HASH_BASE, k - 1, _HASH_MOD)
+    h = 0
+    for v in values[:k]:
+        h = (h * _HASH_BASE + v) % _HASH_MOD
+    hashes = [h]
+    for i in range(k, len(values)):
+        h = ((h - values[i - k] * drop) * _HASH_BASE + values[i]) % _HASH_MOD
+        hashes.append(h)
+    return hashes
+
+
+@dataclass
+class ReplayReport:
+    replayed_fraction: float  # share of output words inside a shingle found in the source
+    longest_span_chars: int
+    longest_span_words: int
+    output_words: int
+
+
+class SourceShingleIndex:
+    def __init__(self, source_text: str, k: int = REPLAY_SHINGLE_WORDS) -> None:
+        self.k = k
+        words = [w.lower() for w in WORD_RE.findall(source_text)]
+        self.source_words = len(words)
+        self.shingles = set(rolling_shingle_hashes(words, k))
+
+    def scan(self, output_text: str) -> ReplayReport:
+        matches = list(WORD_RE.finditer(output_text))
+        hashes = rolling_shingle_hashes([m.group().lower() for m in matches], self.k)
+
+        covered_until = 0  # output words [0, covered_until) already counted
+        covered = 0
+        run_start: Optional[int] = None
+        longest_chars = longest_words = 0
+        for i, h in enumerate(hashes + [None]):  # sentinel closes the last run
+            if h is not None and h in self.shingles:
+                if run_start is None:
+                    run_start = i
+                end = i + self.k
+                covered += end - max(i, covered_until)
+                covered_until = end
+                continue
+            if run_start is not None:
+                last_word = i - 1 + self.k - 1
+                chars = matches[last_word].end() - matches[run_start].start()
+                if chars > longest_chars:
+                    longest_chars, longest_words = chars, last_word - run_start + 1
+                run_start = None
+
+        return ReplayReport(
+            replayed_fraction=covered / len(matches) if matches else 0.0,
+            longest_span_chars=longest_chars,
+            longest_span_words=longest_words,
+            output_words=len(matches),
+        )
+
+
+@lru_cache(maxsize=4)
+def source_shingle_index(source_text: str) -> SourceShingleIndex:
+    """Built once per source; pass 1 and the repair pass reuse it."""
+    return SourceShingleIndex(source_text)
 
-    if len(source_norm) < span or len(output_norm) < span:
-        return False
 
-    head = source_norm[:span]
-    mid_start = max(0, len(source_norm) // 2 - span // 2)
-    middle = source_norm[mid_start:mid_start + span]
-    tail = source_norm[-span:]
+def replay_report(output_text: str, source_text: str) -> ReplayReport:
+    return source_shingle_index(source_text).scan(output_text)
 
-    return head in output_norm or middle in output_norm or tail in output_norm
+
+def contains_large_source_span(
+    output_text: str, source_text: str, span: int = REPLAY_SPAN_CHARS
+) -> bool:
+    """
+    Detects raw-source replay: a run of source shingles anywhere in the output
+    covering at least `span` characters.
+    """
+    return replay_report(output_text, source_text).longest_span_chars >= span
 
 
 def looks_like_article_replay(output_text: str, title: str) -> bool:
@@ -278,15 +444,21 @@ def fails_structure_gate(
     style_name: str,
     source_text: str,
     title: str,
+    replay: Optional[ReplayReport] = None,
 ) -> Tuple[bool, str]:
     """
     Hard validity gate.
-    Rejects raw-source replay and style-invalid emissions.
+    Rejects raw-source replay and style-invalid emissions. Pass `replay` when
+    the caller already scanned this text against this source.
     """
     lowered = text.lower()
 
-    if contains_large_source_span(text, source_text):
-        return True, "Output appears to contain a large raw-source span."
+    replay = replay or replay_report(text, source_text)
+    if replay.longest_span_chars >= REPLAY_SPAN_CHARS:
+        return True, (
+            "Output appears to contain a large raw-source span "
+            f"({replay.longest_span_chars} chars; {replay.replayed_fraction:.0%} of output replayed)."
+        )
 
     if looks_like_article_replay(text, title):
         return True, "Output appears to replay article title/byline/body formatting."
@@ -310,47 +482,16 @@ def fails_structure_gate(
 # ------------------------------------------------------------------------------
 # STYLE EXTRACTION
 # ------------------------------------------------------------------------------
-def extract_styles_from_guide(content: str) -> Dict[str, str]:
-    """
-    Extract style blocks from summary_styles_guide.md.
-
-    Supports headings like:
-        # 🔷 1. **SankofaCut — Strategic Micro-Brief**
-        # 🧱 2. **Abolition Systems Cut (ASC)**
-        # 🔷 3. **UBW — Universal Black Wisdom**
-    """
-    lines = content.splitlines()
-    header_re = re.compile(r"^\s*#.*?\d+\.\s+\*\*(.+?)\*\*\s*$")
-
-    headers: List[Tuple[int, str]] = []
-    for idx, line in enumerate(lines):
-        match = header_re.match(line)
-        if match:
-            raw_name = match.group(1).strip()
-            clean_name = raw_name.split("—")[0].strip()
-            clean_name = clean_name.split("(")[0].strip()
-            headers.append((idx, clean_name))
-
-    styles: Dict[str, str] = {}
-    if not headers:
-        return styles
-
-    for i, (start_idx, style_name) in enumerate(headers):
-        end_idx = headers[i + 1][0] if i + 1 < len(headers) else len(lines)
-        block = "\n".join(lines[start_idx + 1:end_idx]).strip()
-        styles[style_name] = block
-
-    return styles
+# One parser for every client (scorpyun_annotator included), served from the
+# compiled protocol bundle.
+extract_styles_from_guide = parse_style_guide
 
 
 def get_available_styles() -> Dict[str, str]:
     if not STYLE_GUIDE_PATH.exists():
         raise FileNotFoundError(f"Style Guide missing: {STYLE_GUIDE_PATH}")
 
-    with open(STYLE_GUIDE_PATH, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    styles = extract_styles_from_guide(content)
+    styles = read_styles(STYLE_GUIDE_PATH)
     if not styles:
         raise ValueError(
             "No styles could be extracted from summary_styles_guide.md. "
@@ -365,14 +506,17 @@ def get_available_styles() -> Dict[str, str]:
 # ------------------------------------------------------------------------------
 class EchoSynapse:
     def __init__(self, style_name: str, protocol_text: str, debug_session_dir: Path):
-        self.client = WatsonXClient()
+        self.client = WatsonXClient(caller="qwen_echo")
         self.client.set_agent("QWEN-ECHO")
         self.style_name = style_name
         self.protocol_text = protocol_text
         self.debug_session_dir = debug_session_dir
+        self._notes: Dict[str, str] = {}
 
-    def build_prompt(self, data: str) -> str:
-        profile = detect_source_profile(data)
+    def build_prompt(
+        self, data: str, profile: Optional[str] = None, source_label: str = "SOURCE_TEXT"
+    ) -> str:
+        profile = profile or detect_source_profile(data)
 
         if self.style_name == "UBW":
             prompt = (
@@ -408,7 +552,7 @@ class EchoSynapse:
                 "**Conclusion:**\n"
                 "[tight synthetic close]\n\n"
                 f"SOURCE_PROFILE: {profile}\n\n"
-                f"SOURCE_TEXT:\n{data}"
+                f"{source_label}:\n{data}"
             )
             return prompt
 
@@ -426,19 +570,114 @@ class EchoSynapse:
             "- Do NOT echo the input data.\n"
             f"- Return only the analysis defined by the {self.style_name} standard.\n\n"
             f"SOURCE_PROFILE: {profile}\n\n"
-            f"SOURCE_TEXT:\n{data}"
+            f"{source_label}:\n{data}"
         )
         return prompt
 
-    def ask(self, data: str, max_new_tokens: int = 3000) -> str:
+    def ask(self, data: str, expected_words: int = EXPECTED_ARTIFACT_WORDS) -> str:
+        if self.should_chunk(data):
+            return self.ask_chunked(data, expected_words)
         compiled_prompt = self.build_prompt(data)
-        save_text(self.debug_session_dir / "compiled_prompt.txt", compiled_prompt)
-        return self.client.ask(compiled_prompt, max_new_tokens=max_new_tokens)
+        save_debug(self.debug_session_dir, "compiled_prompt.txt", compiled_prompt)
+        return self.client.ask(
+            compiled_prompt,
+            label="pass1",
+            expected_words=expected_words,
+            trimmable=data,
+        )
+
+    # --------------------------------------------------------------------------
+    # CHUNKED MAP-REDUCE
+    # --------------------------------------------------------------------------
+    def should_chunk(self, data: str) -> bool:
+        if CHUNKED_MODE == "0":
+            return False
+        return CHUNKED_MODE == "1" or len(data.split()) > CHUNK_MIN_WORDS
+
+    def build_map_prompt(self, chunk: str, index: int, total: int) -> str:
+        return (
+            f"INSTRUCTION: This is part {index} of {total} of a longform source that will be "
+            f"refined with the '{self.style_name}' protocol. Extract source notes for this part only.\n\n"
+            "NOTES MUST CAPTURE:\n"
+            "- Named actors, organizations, places, and dates, exactly as the source gives them.\n"
+            "- Policies, mechanisms, institutional practices, and figures the source cites.\n"
+            "- The part's argument and causal claims, in source order.\n"
+            "- Turning points and contradictions the source itself raises.\n\n"
+            "RULES:\n"
+            "- Terse bullet notes in your own words; NEVER copy source sentences.\n"
+            "- Do not add facts that are not in this part.\n"
+            "- Return only the notes.\n\n"
+            f"SOURCE_PART {index}/{total}:\n{chunk}"
+        )
+
+    def map_chunks(self, data: str, fresh: bool = False) -> str:
+        """Blocking wrapper around amap_chunks(); safe inside a running loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.amap_chunks(data, fresh))
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.amap_chunks(data, fresh)).result()
+
+    async def amap_chunks(self, data: str, fresh: bool = False) -> str:
+        """
+        Per-chunk source notes, joined in source order. Chunks map
+        concurrently through client.ask_many; fresh=True bypasses the
+        response cache (and this synapse's memo) for every chunk.
+        """
+        if data in self._notes and not fresh:
+            return self._notes[data]
+
+        chunks = chunk_source(data)
+        prompts = [self.build_map_prompt(c, i, len(chunks)) for i, c in enumerate(chunks, 1)]
+        print(f"✶ Chunked refinery: mapping {len(chunks)} chunks")
+
+        results = await self.client.ask_many(
+            prompts,
+            return_exceptions=True,
+            fresh=fresh,
+            label="map",
+            expected_words=EXPECTED_MAP_WORDS,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Successful chunks are in the response cache; a rerun maps only the failures.
+            raise RuntimeError(
+                f"{len(errors)}/{len(chunks)} map chunks failed: {errors[0]}"
+            ) from errors[0]
+
+        joined = "\n\n".join(
+            f"[PART {i}/{len(chunks)}]\n{n.strip()}" for i, n in enumerate(results, 1)
+        )
+        save_debug(self.debug_session_dir, "map_notes.txt", joined)
+        self._notes[data] = joined
+        return joined
+
+    def ask_chunked(self, data: str, expected_words: int = EXPECTED_ARTIFACT_WORDS) -> str:
+        notes = self.map_chunks(data)
+        compiled_prompt = self.build_prompt(
+            notes,
+            profile=detect_source_profile(data),
+            source_label=(
+                "SOURCE_NOTES (section-by-section notes on a longform source, "
+                "in source order; treat them as the source)"
+            ),
+        )
+        save_debug(self.debug_session_dir, "compiled_prompt.txt", compiled_prompt)
+        return self.client.ask(
+            compiled_prompt,
+            label="reduce",
+            expected_words=expected_words,
+            trimmable=notes,
+        )
 
     def repair_invalid_output(self, source_text: str, invalid_output: str) -> str:
         """
         Second-pass repair for invalid or replay-like emissions.
+        Longform sources are repaired from the cached map notes.
         """
+        if self.should_chunk(source_text):
+            source_text = self.map_chunks(source_text)
         if self.style_name == "UBW":
             prompt = (
                 "You produced an invalid UBW artifact.\n\n"
@@ -470,8 +709,13 @@ class EchoSynapse:
                 f"SOURCE_TEXT:\n{source_text}\n\n"
                 f"INVALID_OUTPUT:\n{invalid_output}"
             )
-            save_text(self.debug_session_dir / "repair_prompt.txt", prompt)
-            return self.client.ask(prompt, max_new_tokens=2500)
+            save_debug(self.debug_session_dir, "repair_prompt.txt", prompt)
+            return self.client.ask(
+                prompt,
+                label="pass2_repair",
+                expected_words=EXPECTED_REPAIR_WORDS,
+                trimmable=source_text,
+            )
 
         prompt = (
             "You produced an invalid refinery artifact.\n\n"
@@ -485,8 +729,13 @@ class EchoSynapse:
             f"SOURCE_TEXT:\n{source_text}\n\n"
             f"INVALID_OUTPUT:\n{invalid_output}"
         )
-        save_text(self.debug_session_dir / "repair_prompt.txt", prompt)
-        return self.client.ask(prompt, max_new_tokens=2500)
+        save_debug(self.debug_session_dir, "repair_prompt.txt", prompt)
+        return self.client.ask(
+            prompt,
+            label="pass2_repair",
+            expected_words=EXPECTED_REPAIR_WORDS,
+            trimmable=source_text,
+        )
 
 
 class StubAgent:
@@ -502,7 +751,8 @@ def build_debug_session_dir(style_name: str, title: str) -> Path:
     style_slug = slugify(style_name)
     title_slug = slugify(title)
     session_dir = DEBUG_ROOT / f"{stamp}__{style_slug}__{title_slug}"
-    session_dir.mkdir(parents=True, exist_ok=True)
+    if not BUNDLES_ENABLED:
+        session_dir.mkdir(parents=True, exist_ok=True)
     return session_dir
 
 
@@ -512,10 +762,12 @@ def write_debug_receipts(
     protocol_text: str,
     source_path: Path,
     raw_data: str,
+    title: str = "",
 ) -> None:
     metadata = (
         f"timestamp_pst: {now_pst().isoformat()}\n"
         f"style_name: {style_name}\n"
+        f"title: {title}\n"
         f"source_path: {source_path}\n"
         f"source_exists: {source_path.exists()}\n"
         f"source_chars: {len(raw_data)}\n"
@@ -524,10 +776,10 @@ def write_debug_receipts(
         f"protocol_lines: {len(protocol_text.splitlines())}\n"
         f"source_profile: {detect_source_profile(raw_data)}\n"
     )
-    save_text(debug_session_dir / "debug_metadata.txt", metadata)
-    save_text(debug_session_dir / "extracted_protocol.txt", protocol_text)
-    save_text(debug_session_dir / "source_head.txt", truncate_for_preview(raw_data[:4000], 4000))
-    save_text(debug_session_dir / "source_tail.txt", truncate_for_preview(raw_data[-4000:], 4000))
+    save_debug(debug_session_dir, "debug_metadata.txt", metadata)
+    save_debug(debug_session_dir, "extracted_protocol.txt", protocol_text)
+    save_debug(debug_session_dir, "source_head.txt", truncate_for_preview(raw_data[:4000], 4000))
+    save_debug(debug_session_dir, "source_tail.txt", truncate_for_preview(raw_data[-4000:], 4000))
 
 
 def prompt_for_protocol_choice(style_names: List[str]) -> str:
@@ -560,12 +812,22 @@ def validate_output(
     debug_session_dir: Path,
     pass_name: str,
 ) -> Tuple[bool, str]:
+    replay = replay_report(processed_content, raw_data)
+    save_debug(
+        debug_session_dir, f"{pass_name}_replay.txt",
+        f"replayed_fraction: {replay.replayed_fraction:.3f}\n"
+        f"longest_span_chars: {replay.longest_span_chars}\n"
+        f"longest_span_words: {replay.longest_span_words}\n"
+        f"output_words: {replay.output_words}\n",
+    )
+    print(f"✶ DEBUG {pass_name} replayed fraction: {replay.replayed_fraction:.1%}")
+
     failed_structure, structure_reason = fails_structure_gate(
-        processed_content, resolved_style, raw_data, title
+        processed_content, resolved_style, raw_data, title, replay
     )
     if failed_structure:
-        save_text(
-            debug_session_dir / f"{pass_name}_structure_gate_failure.txt",
+        save_debug(
+            debug_session_dir, f"{pass_name}_structure_gate_failure.txt",
             structure_reason,
         )
         return True, structure_reason
@@ -574,8 +836,8 @@ def validate_output(
         processed_content, resolved_style
     )
     if failed_specificity:
-        save_text(
-            debug_session_dir / f"{pass_name}_specificity_gate_failure.txt",
+        save_debug(
+            debug_session_dir, f"{pass_name}_specificity_gate_failure.txt",
             specificity_reason,
         )
         return True, specificity_reason
@@ -584,8 +846,8 @@ def validate_output(
         processed_content, resolved_style
     )
     if failed_density:
-        save_text(
-            debug_session_dir / f"{pass_name}_density_gate_failure.txt",
+        save_debug(
+            debug_session_dir, f"{pass_name}_density_gate_failure.txt",
             density_reason,
         )
         return True, density_reason
@@ -593,6 +855,120 @@ def validate_output(
     return False, ""
 
 
+def artifact_relative_dir(title: str) -> str:
+    return f"{ARTIFACT_ROOT}/{'research' if classify_research_title(title) else 'summaries'}"
+
+
+def read_source(source_path: Path) -> str:
+    if not source_path.exists():
+        raise FileNotFoundError(f"Source file not found: {source_path}")
+    if not source_path.is_file():
+        raise ValueError(f"Source path is not a file: {source_path}")
+
+    with open(source_path, "r", encoding="utf-8") as f:
+        raw_data = f.read()
+
+    if not raw_data.strip():
+        raise ValueError("Source file is empty.")
+    return raw_data
+
+
+def refine_source(
+    resolved_style: str,
+    protocol_text: str,
+    title: str,
+    source_path: Path,
+    raw_data: str,
+    orch: VSEncOrchestrator,
+    filename: Optional[str] = None,
+    outcome: Optional[Dict[str, str]] = None,
+    on_written: Optional[OnWritten] = None,
+) -> Dict:
+    """
+    One refinery job: pass 1, validation, repair pass if needed, emission.
+    `outcome` (if given) receives the pass1/pass2 verdicts as they happen;
+    `on_written` runs once the artifact is on disk (see emit_to_vault).
+    Raises ValueError when the repaired output is still invalid.
+    """
+    outcome = outcome if outcome is not None else {}
+    debug_session_dir = build_debug_session_dir(resolved_style, title)
+    write_debug_receipts(
+        debug_session_dir, resolved_style, protocol_text, source_path, raw_data, title
+    )
+
+    print(f"✶ DEBUG session: {debug_bundle_path(debug_session_dir) if BUNDLES_ENABLED else debug_session_dir}")
+    print(f"✶ DEBUG source chars: {len(raw_data)}")
+    print(f"✶ DEBUG source words: {len(raw_data.split())}")
+    print(f"✶ DEBUG protocol chars: {len(protocol_text)}")
+    print(f"✶ Processing {resolved_style}...")
+
+    synapse = EchoSynapse(resolved_style, protocol_text, debug_session_dir)
+
+    # PASS 1
+    processed_content = synapse.ask(raw_data)
+    save_debug(debug_session_dir, "raw_model_output_pass1.txt", processed_content)
+
+    failed_pass1, reason_pass1 = validate_output(
+        processed_content,
+        resolved_style,
+        raw_data,
+        title,
+        debug_session_dir,
+        "pass1",
+    )
+    outcome["pass1"] = reason_pass1 if failed_pass1 else "ok"
+
+    # PASS 2 (repair) if invalid
+    if failed_pass1:
+        print(f"⚠️ First pass invalid: {reason_pass1}")
+        print("✶ Running repair pass...")
+        processed_content = synapse.repair_invalid_output(raw_data, processed_content)
+        save_debug(debug_session_dir, "raw_model_output_pass2_repaired.txt", processed_content)
+
+        failed_pass2, reason_pass2 = validate_output(
+            processed_content,
+            resolved_style,
+            raw_data,
+            title,
+            debug_session_dir,
+            "pass2",
+        )
+        outcome["pass2"] = reason_pass2 if failed_pass2 else "ok"
+
+        if failed_pass2:
+            raise ValueError(
+                "Emission failed validation after repair pass. "
+                f"Reason: {reason_pass2}"
+            )
+
+    is_research = classify_research_title(title)
+    custom_params = {
+        "title": title,
+        "category": "research" if is_research else "summary",
+        "style": resolved_style,
+        "relative_dir": artifact_relative_dir(title),
+        "status": "active",
+        "priority": "medium",
+        "tags": ["echo", "distillation", resolved_style.lower()],
+        "summary": f"Distillation via {resolved_style} protocol.",
+        "external_refs": [str(source_path)],
+        "ctx_grok_reflection": f"Refinery output: {resolved_style} protocol applied.",
+    }
+    if filename:
+        custom_params["filename"] = filename
+
+    payload = orch.run(
+        agent_name="ECHO_STUB",
+        input_text=processed_content,
+        invocation_type="echo_refinery",
+        custom_params=custom_params,
+    )
+
+    save_debug(debug_session_dir, "payload_preview.txt", repr(payload))
+    orch.emit_to_vault(payload, on_written)
+    return payload
+
+
 def run_refinery() -> None:
     print("✶⌁✶ QWEN-ECHO REFINERY v4.3.2 [SOURCE-DENSITY ENFORCED] ONLINE")
 
@@ -611,16 +987,7 @@ def run_refinery() -> None:
             raise ValueError("Target Title cannot be empty.")
 
         source_path = sanitize_input_path(input("Source Data Path: "))
-        if not source_path.exists():
-            raise FileNotFoundError(f"Source file not found: {source_path}")
-        if not source_path.is_file():
-            raise ValueError(f"Source path is not a file: {source_path}")
-
-        with open(source_path, "r", encoding="utf-8") as f:
-            raw_data = f.read()
-
-        if not raw_data.strip():
-            raise ValueError("Source file is empty.")
+        raw_data = read_source(source_path)
 
         resolved_style = resolve_style_name(style_name, styles)
         if not resolved_style:
@@ -630,88 +997,232 @@ def run_refinery() -> None:
         if not protocol_text.strip():
             raise ValueError(f"Protocol extraction failed for style: {resolved_style}")
 
-        debug_session_dir = build_debug_session_dir(resolved_style, title)
-        write_debug_receipts(
-            debug_session_dir, resolved_style, protocol_text, source_path, raw_data
+        print("✶ Synapse: QWEN-ECHO identity manifested.")
+        orch = VSEncOrchestrator({"ECHO_STUB": StubAgent()})
+        payload = refine_source(
+            resolved_style, protocol_text, title, source_path, raw_data, orch
         )
 
-        print("✶ Synapse: QWEN-ECHO identity manifested.")
-        print(f"✶ DEBUG session dir: {debug_session_dir}")
-        print(f"✶ DEBUG source chars: {len(raw_data)}")
-        print(f"✶ DEBUG source words: {len(raw_data.split())}")
-        print(f"✶ DEBUG protocol chars: {len(protocol_text)}")
-        print(f"✶ Processing {resolved_style}...")
+        print(f"✓ Artifact Emitted under VS-ENC v1.0.0 Law: {payload['filename']}")
+        print(f"✓ Refinery Artifact Emitted: {payload['filename']}")
 
-        synapse = EchoSynapse(resolved_style, protocol_text, debug_session_dir)
-        orch = VSEncOrchestrator({"ECHO_STUB": StubAgent()})
+    except KeyboardInterrupt:
+        print("\n⚠️ REFINERY ABORTED: user interrupted execution.")
+    except Exception as e:
+        print(f"❌ REFINERY ERROR: {e}")
 
-        # PASS 1
-        processed_content = synapse.ask(raw_data, max_new_tokens=3000)
-        save_text(debug_session_dir / "raw_model_output_pass1.txt", processed_content)
 
-        failed_pass1, reason_pass1 = validate_output(
-            processed_content,
+# ------------------------------------------------------------------------------
+# BATCH REFINERY
+# ------------------------------------------------------------------------------
+@dataclass
+class BatchJob:
+    source_path: Path
+    title: str
+    style: str
+
+
+def read_batch_manifest(path: Path) -> List[BatchJob]:
+    """
+    CSV with a header row (source_path, title, style) or YAML: a list of
+    mappings with the same keys, optionally under a top-level "jobs" key.
+    """
+    if path.suffix.lower() in (".yml", ".yaml"):
+        import yaml
+
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or []
+        rows = data.get("jobs", []) if isinstance(data, dict) else data
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    jobs: List[BatchJob] = []
+    for n, row in enumerate(rows, 1):
+        row = {str(k).strip().lower(): str(v or "").strip() for k, v in row.items()}
+        source = row.get("source_path") or row.get("source", "")
+        if not (source and row.get("title") and row.get("style")):
+            raise ValueError(f"Manifest row {n} needs source_path, title and style: {row}")
+        jobs.append(BatchJob(sanitize_input_path(source), row["title"], row["style"]))
+    return jobs
+
+
+def batch_filename(job: BatchJob, resolved_style: str) -> str:
+    """Deterministic per (source, title, style), so a rerun finds its artifact."""
+    digest = hashlib.sha1(
+        f"{job.source_path}\0{job.title}\0{resolved_style}".encode("utf-8")
+    ).hexdigest()[:8]
+    return f"echo_{slugify(resolved_style)}_{slugify(job.title)[:60]}_{digest}.md"
+
+
+class BatchLedger:
+    """
+    One ledger line per job, appended only once the job is settled: emitted
+    jobs settle from on_written (the emitter thread in write-behind mode),
+    failed/skipped ones from the batch loop, hence the lock.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.counts = {"emitted": 0, "failed": 0, "skipped": 0}
+        self._lock = threading.Lock()
+        self._claimed: Set[str] = set()
+        self._settled: Set[str] = set()
+        self._queued: Dict[str, Dict[str, str]] = {}
+
+    def claim(self, artifact: str) -> bool:
+        """False when an earlier manifest job already owns this artifact."""
+        with self._lock:
+            if artifact in self._claimed:
+                return False
+            self._claimed.add(artifact)
+            return True
+
+    def queue(self, outcome: Dict[str, str]) -> None:
+        """Marks a job whose artifact write is still pending."""
+        with self._lock:
+            if outcome["artifact"] not in self._settled:
+                outcome["status"] = "queued"
+                self._queued[outcome["artifact"]] = outcome
+
+    def unsettled(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._queued.values())
+
+    def settle(self, outcome: Dict[str, str], status: str, error: str = "") -> None:
+        with self._lock:
+            outcome["status"] = status
+            if error:
+                outcome["error"] = error
+            # A skipped duplicate shares its artifact path with the job that
+            # claimed it; only the claimant's settlement may close the artifact.
+            if outcome["artifact"] and status != "skipped":
+                self._settled.add(outcome["artifact"])
+                self._queued.pop(outcome["artifact"], None)
+            self.counts[status] += 1
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(outcome, ensure_ascii=False) + "\n")
+        mark = {"emitted": "✓", "skipped": "✶", "failed": "❌"}[status]
+        detail = outcome["error"] or (
+            "artifact exists" if status == "skipped" else f"pass1: {outcome['pass1']}"
+        )
+        if outcome["pass2"]:
+            detail += f"; pass2: {outcome['pass2']}"
+        print(f"{mark} [{status}] {outcome['title']} ({outcome['style']}) — {detail}")
+
+
+def run_batch_job(
+    job: BatchJob,
+    styles: Dict[str, str],
+    orch: VSEncOrchestrator,
+    ledger: BatchLedger,
+) -> Dict[str, str]:
+    """
+    Returns the outcome. Failed and skipped jobs are left for the caller to
+    settle; emitted ones settle themselves once the artifact is on disk.
+    """
+    outcome = {
+        "ts": now_pst().isoformat(timespec="seconds"),
+        "title": job.title,
+        "style": job.style,
+        "source_path": str(job.source_path),
+        "status": "failed",
+        "pass1": "",
+        "pass2": "",
+        "artifact": "",
+        "error": "",
+    }
+    started = time.perf_counter()
+    try:
+        resolved_style = resolve_style_name(job.style, styles)
+        if not resolved_style:
+            raise ValueError(f"Style could not be resolved: {job.style}")
+        outcome["style"] = resolved_style
+        filename = batch_filename(job, resolved_style)
+        artifact = VAULT_ROOT / artifact_relative_dir(job.title) / filename
+        outcome["artifact"] = str(artifact)
+        if artifact.exists():
+            outcome["status"] = "skipped"
+            return outcome
+        if not ledger.claim(str(artifact)):
+            outcome["status"] = "skipped"
+            outcome["error"] = "duplicate of an earlier manifest job"
+            return outcome
+
+        refine_source(
             resolved_style,
-            raw_data,
-            title,
-            debug_session_dir,
-            "pass1",
+            styles[resolved_style],
+            job.title,
+            job.source_path,
+            read_source(job.source_path),
+            orch,
+            filename=filename,
+            outcome=outcome,
+            on_written=lambda _payload: ledger.settle(outcome, "emitted"),
         )
+        if orch.write_behind:
+            ledger.queue(outcome)
+    except Exception as e:
+        outcome["error"] = f"{type(e).__name__}: {e}"[:300]
+    finally:
+        outcome["elapsed_s"] = f"{time.perf_counter() - started:.1f}"
+    return outcome
 
-        # PASS 2 (repair) if invalid
-        if failed_pass1:
-            print(f"⚠️ First pass invalid: {reason_pass1}")
-            print("✶ Running repair pass...")
-            processed_content = synapse.repair_invalid_output(raw_data, processed_content)
-            save_text(debug_session_dir / "raw_model_output_pass2_repaired.txt", processed_content)
-
-            failed_pass2, reason_pass2 = validate_output(
-                processed_content,
-                resolved_style,
-                raw_data,
-                title,
-                debug_session_dir,
-                "pass2",
-            )
 
-            if failed_pass2:
-                raise ValueError(
-                    "Emission failed validation after repair pass. "
-                    f"Reason: {reason_pass2}"
-                )
-
-        is_research = classify_research_title(title)
-        rel_dir = f"{ARTIFACT_ROOT}/{'research' if is_research else 'summaries'}"
-
-        payload = orch.run(
-            agent_name="ECHO_STUB",
-            input_text=processed_content,
-            invocation_type="echo_refinery",
-            custom_params={
-                "title": title,
-                "category": "research" if is_research else "summary",
-                "style": resolved_style,
-                "relative_dir": rel_dir,
-                "status": "active",
-                "priority": "medium",
-                "tags": ["echo", "distillation", resolved_style.lower()],
-                "summary": f"Distillation via {resolved_style} protocol.",
-                "external_refs": [str(source_path)],
-                "ctx_grok_reflection": f"Refinery output: {resolved_style} protocol applied.",
-            },
+def run_batch(
+    manifest_path: Path,
+    workers: int = 2,
+    ledger_path: Optional[Path] = None,
+) -> Dict[str, int]:
+    """
+    Runs every manifest job through a pool of `workers` threads sharing one
+    parsed style guide and one VSEncOrchestrator. Jobs whose artifact already
+    exists (or is claimed by an earlier job) are skipped. One JSON line per
+    job is appended to the ledger; "emitted" only once the file is written.
+    """
+    print("✶⌁✶ QWEN-ECHO BATCH REFINERY v4.3.2 [SOURCE-DENSITY ENFORCED] ONLINE")
+    ensure_debug_root()
+    jobs = read_batch_manifest(manifest_path)
+    styles = get_available_styles()
+    # Batch reruns skip on artifact existence, so write-behind loses nothing.
+    orch = VSEncOrchestrator({"ECHO_STUB": StubAgent()}, write_behind=True)
+    ledger = BatchLedger(ledger_path or manifest_path.with_suffix(".ledger.jsonl"))
+    counts = ledger.counts
+    print(f"✶ Batch: {len(jobs)} job(s) @ {workers} worker(s)")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="echo-batch") as pool:
+        futures = [pool.submit(run_batch_job, job, styles, orch, ledger) for job in jobs]
+        for future in as_completed(futures):
+            outcome = future.result()
+            if outcome["status"] in ("failed", "skipped"):
+                ledger.settle(outcome, outcome["status"])
+
+    # Queued artifacts that never reached on_written failed to write.
+    write_errors = dict(orch.flush())
+    for outcome in ledger.unsettled():
+        ledger.settle(
+            outcome, "failed", write_errors.get(outcome["artifact"], "artifact write failed")
         )
+    ledger_path = ledger.path
+    print(
+        f"✶ Batch complete: {counts['emitted']} emitted, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped — ledger {ledger_path}"
+    )
+    return counts
 
-        save_text(debug_session_dir / "payload_preview.txt", repr(payload))
-        orch.emit_to_vault(payload)
 
-        print(f"✓ Artifact Emitted under VS-ENC v1.0.0 Law: {payload['filename']}")
-        print(f"✓ Refinery Artifact Emitted: {payload['filename']}")
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Qwen-Echo refinery")
+    parser.add_argument("--batch", type=Path, help="CSV/YAML manifest: source_path, title, style")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--ledger", type=Path, help="Defaults to <manifest>.ledger.jsonl")
+    args = parser.parse_args()
 
-    except KeyboardInterrupt:
-        print("\n⚠️ REFINERY ABORTED: user interrupted execution.")
-    except Exception as e:
-        print(f"❌ REFINERY ERROR: {e}")
+    if args.batch:
+        run_batch(args.batch, args.workers, args.ledger)
+    else:
+        run_refinery()
 
 
 if __name__ == "__main__":
-    run_refinery()
\ No newline at end of file
+    main()
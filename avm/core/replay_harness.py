@@ -0,0 +1,477 @@
+# ==============================================================================
+# ✶⌁✶ replay_harness.py — THE POST-PROCESSING REPLAY HARNESS v1.0.0
+# ==============================================================================
+# ROLE: Replays saved raw model outputs from the _debug receipt dirs through
+#       the deterministic halves of the LLM tools, times every stage and
+#       diffs each verdict against a golden file, so post-processing can be
+#       optimized without changing behaviour.
+# STAGES:
+#   scholarly  extract_metadata -> cleanup_pipeline -> validate
+#              (*_raw.txt receipts in scholarly_dive.DEBUG_DIR)
+#   qwen       validate_output gates on raw_model_output_pass*.txt per
+#              session in qwen_echo.DEBUG_ROOT; the source is rebuilt from the
+#              saved source_head/source_tail receipts
+#   kimi       KimiSynapse.format_math -> enforce_ceiling (kimi_deux.DEBUG_DIR)
+#   ctx        CTXGrokProto._extract_json + invocation-law guarantees
+#              (ctx_grok_proto.DEBUG_DIR)
+# Receipts are read loose or from debug bundles; --corpus STAGE=DIR overrides
+# a stage's directory. --synthetic N fills empty scholarly/kimi/ctx corpora
+# with seeded generated outputs.
+# GOLDEN: --update records {stage: {case sha: {verdict, output_sha256}}};
+#         later runs list every changed verdict or output and exit 1.
+# USAGE:
+#   python replay_harness.py --update        # record the baseline
+#   python replay_harness.py --rounds 5      # after an optimization
+# ==============================================================================
+
+import abc
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from debug_bundle import find_bundles, iter_entries, read_entry, read_manifest  # noqa: E402
+
+GOLDEN_PATH = Path(
+    os.getenv(
+        "AVM_REPLAY_GOLDEN",
+        "C:/Users/digitalscorpyun/projects_2026/avm/_debug/replay_golden.json",
+    )
+)
+STAGES = ["scholarly", "qwen", "kimi", "ctx"]
+QWEN_PASSES = {
+    "raw_model_output_pass1.txt": "pass1",
+    "raw_model_output_pass2_repaired.txt": "pass2",
+}
+# source_head/source_tail hold at most this many chars each.
+QWEN_PREVIEW_CHARS = 4000
+
+
+@dataclass
+class Case:
+    label: str
+    payload: Any
+    chars: int
+    sha: str = ""
+
+
+Verdict = Tuple[str, str]  # (verdict, full output that must not drift)
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_case(label: str, payload: Any, raw: str) -> Case:
+    return Case(label, payload, len(raw), sha256(json.dumps(payload, ensure_ascii=False))[:16])
+
+
+def iter_receipts(corpus_dir: Path, match: str) -> Iterator[Tuple[str, str]]:
+    """(name, content) of loose receipts, then of every bundle entry."""
+    if not corpus_dir.exists():
+        return
+    for path in sorted(corpus_dir.glob(match)):
+        yield path.name, path.read_text(encoding="utf-8", errors="replace")
+    for bundle in find_bundles(corpus_dir):
+        for entry, content in iter_entries(bundle, match):
+            yield entry["name"], content
+
+
+# ------------------------------------------------------------------------------
+# STAGES
+# ------------------------------------------------------------------------------
+class Stage(abc.ABC):
+    name = ""
+
+    @abc.abstractmethod
+    def default_dir(self) -> Path:
+        """Where this stage's recorded receipts live by default."""
+
+    @abc.abstractmethod
+    def load(self, corpus_dir: Path) -> List[Case]:
+        """Recorded cases found under corpus_dir."""
+
+    def synthetic(self, rng: random.Random, count: int) -> List[Case]:
+        return []
+
+    @abc.abstractmethod
+    def run(self, payload: Any) -> Verdict:
+        """Re-runs the stage's post-processing on one case payload."""
+
+    @contextlib.contextmanager
+    def session(self) -> Iterator[None]:
+        yield
+
+
+class ScholarlyStage(Stage):
+    name = "scholarly"
+
+    def __init__(self) -> None:
+        import scholarly_dive
+        import scholarly_doc_bench
+
+        self.module = scholarly_dive
+        self.bench = scholarly_doc_bench
+
+    def default_dir(self) -> Path:
+        return self.module.DEBUG_DIR
+
+    def load(self, corpus_dir: Path) -> List[Case]:
+        return [make_case(topic, [topic, raw], raw) for topic, raw in self.bench.load_corpus(corpus_dir)]
+
+    def synthetic(self, rng: random.Random, count: int) -> List[Case]:
+        cases = []
+        for _ in range(count):
+            topic = rng.choice(self.bench.SYNTHETIC_TOPICS)
+            raw = self.bench.synthetic_draft(rng, topic)
+            cases.append(make_case(topic, [topic, raw], raw))
+        return cases
+
+    def run(self, payload: Any) -> Verdict:
+        out = self.bench.process(self.module, payload[0], payload[1])
+        validation = json.loads(json.loads(out)[2])
+        if validation["ok"]:
+            return "ok", out
+        return f"fail[{validation['region'] or 'body'}]: {validation['error']}", out
+
+
+class QwenStage(Stage):
+    name = "qwen"
+
+    def __init__(self) -> None:
+        import qwen_echo
+
+        self.module = qwen_echo
+        self.receipts: Dict[str, str] = {}
+
+    def default_dir(self) -> Path:
+        return self.module.DEBUG_ROOT
+
+    def _sessions(self, corpus_dir: Path) -> Iterator[Tuple[str, Dict[str, str]]]:
+        if not corpus_dir.exists():
+            return
+        for session_dir in sorted(p for p in corpus_dir.iterdir() if p.is_dir()):
+            yield session_dir.name, {
+                p.name: p.read_text(encoding="utf-8", errors="replace")
+                for p in session_dir.glob("*.txt")
+            }
+        for bundle in find_bundles(corpus_dir):
+            receipts = {e["name"]: read_entry(bundle, e) for e in read_manifest(bundle)}
+            yield bundle.stem, receipts
+
+    def load(self, corpus_dir: Path) -> List[Case]:
+        cases = []
+        for session, receipts in self._sessions(corpus_dir):
+            meta: Dict[str, str] = {}
+            for line in receipts.get("debug_metadata.txt", "").splitlines():
+                key, _, value = line.partition(": ")
+                meta[key.strip()] = value.strip()
+            head = receipts.get("source_head.txt", "")
+            if not meta.get("style_name") or not head:
+                continue
+            source = head
+            if int(meta.get("source_chars") or 0) > QWEN_PREVIEW_CHARS:
+                source = head + "\n" + receipts.get("source_tail.txt", "")
+            # Sessions recorded before the title was logged: {stamp}__{style}__{title}
+            parts = session.split("__")
+            title = meta.get("title") or (parts[2].replace("_", " ") if len(parts) >= 3 else session)
+            for receipt, pass_name in QWEN_PASSES.items():
+                if receipt in receipts:
+                    output = receipts[receipt]
+                    payload = [output, meta["style_name"], source, title, session, pass_name]
+                    cases.append(make_case(f"{session}/{pass_name}", payload, output))
+        return cases
+
+    @contextlib.contextmanager
+    def session(self) -> Iterator[None]:
+        # validate_output's receipts are captured instead of written to the vault.
+        original = self.module.save_debug
+
+        def capture(debug_session_dir: Path, name: str, content: str) -> None:
+            self.receipts[name] = content
+
+        self.module.save_debug = capture
+        try:
+            yield
+        finally:
+            self.module.save_debug = original
+
+    def run(self, payload: Any) -> Verdict:
+        output, style, source, title, session, pass_name = payload
+        self.receipts = {}
+        failed, reason = self.module.validate_output(
+            output, style, source, title, Path(session), pass_name
+        )
+        replay = self.receipts.get(f"{pass_name}_replay.txt", "")
+        return (reason if failed else "ok"), reason + "\n" + replay
+
+
+SYNTHETIC_SECTIONS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", "XI", "XII"]
+
+
+class KimiStage(Stage):
+    name = "kimi"
+
+    def __init__(self) -> None:
+        import kimi_deux
+
+        self.module = kimi_deux
+
+    def default_dir(self) -> Path:
+        return self.module.DEBUG_DIR
+
+    def load(self, corpus_dir: Path) -> List[Case]:
+        return [make_case(name, raw, raw) for name, raw in iter_receipts(corpus_dir, "*__raw.txt")]
+
+    def synthetic(self, rng: random.Random, count: int) -> List[Case]:
+        cases = []
+        for n in range(count):
+            sections = SYNTHETIC_SECTIONS if rng.random() < 0.4 else SYNTHETIC_SECTIONS[:-1]
+            parts = []
+            for numeral in sections:
+                parts.append(f"## {numeral}. Drill block")
+                for _ in range(rng.randint(1, 3)):
+                    a, b = rng.randint(2, 40), rng.randint(2, 40)
+                    parts.append(
+                        rng.choice(
+                            [
+                                f"Compute $x = {a} \\cdot {b}$ before the next step.",
+                                f"Inline \\(y^{a} + {b}\\) appears in the prompt.",
+                                f"Priced at $ {a} and $ {b} per unit.",
+                                f"Plain recall line {a}/{b} with no math.",
+                            ]
+                        )
+                    )
+            raw = "\n\n\n".join(parts)
+            cases.append(make_case(f"synthetic_{n:03d}", raw, raw))
+        return cases
+
+    def run(self, payload: Any) -> Verdict:
+        formatted = self.module.KimiSynapse.format_math(payload)
+        out = self.module.KimiSynapse.enforce_ceiling(formatted)
+        return ("ceiling_cut" if out != formatted else "ok"), out
+
+
+class CtxStage(Stage):
+    name = "ctx"
+
+    def __init__(self, law_path: Optional[str] = None) -> None:
+        import ctx_grok_proto
+        from vs_enc import compile_law
+
+        self.module = ctx_grok_proto
+        self.law = compile_law(law_path or ctx_grok_proto.INVOCATION_LAW_PATH)
+
+    def default_dir(self) -> Path:
+        return self.module.DEBUG_DIR
+
+    def load(self, corpus_dir: Path) -> List[Case]:
+        cases = []
+        for name, raw in iter_receipts(corpus_dir, "*__raw.txt"):
+            # {stamp}__{task}__raw.txt
+            parts = Path(name).stem.split("__")
+            task = parts[1] if len(parts) >= 3 else "structured_summary"
+            cases.append(make_case(name, [task, raw], raw))
+        return cases
+
+    def synthetic(self, rng: random.Random, count: int) -> List[Case]:
+        cases = []
+        for n in range(count):
+            obj: Dict[str, Any] = {"title": f"Synthetic {n}", "summary": "A {braced} note."}
+            if rng.random() < 0.8:
+                obj["key_points"] = [f"point {i}" for i in range(rng.randint(1, 4))]
+            text = json.dumps(obj, indent=rng.choice([None, 2]))
+            if rng.random() < 0.3:
+                text = text.replace("]", ",]", 1)  # trailing comma
+            raw = rng.choice(["", "Sure:\n```json\n"]) + text
+            raw += rng.choice(["", "\n```", "\n\nNote: {extra} trailing prose."])
+            cases.append(make_case(f"synthetic_{n:03d}", ["structured_summary", raw], raw))
+        return cases
+
+    def run(self, payload: Any) -> Verdict:
+        task, raw = payload
+        try:
+            obj = self.module.CTXGrokProto._extract_json(raw)
+        except ValueError:
+            return "no_json", ""
+        out = json.dumps(obj, sort_keys=True, ensure_ascii=False)
+        try:
+            self.module.validate_guarantees(obj, self.law.rules(task).get("guarantees", []))
+        except ValueError as e:
+            return f"law: {e}", out
+        return "ok", out
+
+
+STAGE_TYPES: Dict[str, Callable[[], Stage]] = {
+    "scholarly": ScholarlyStage,
+    "qwen": QwenStage,
+    "kimi": KimiStage,
+    "ctx": CtxStage,
+}
+
+
+# ------------------------------------------------------------------------------
+# REPLAY
+# ------------------------------------------------------------------------------
+def dedupe(cases: List[Case]) -> List[Case]:
+    seen: Dict[str, Case] = {}
+    for case in cases:
+        seen.setdefault(case.sha, case)
+    return list(seen.values())
+
+
+def replay_stage(
+    stage: Stage, cases: List[Case], rounds: int
+) -> Tuple[List[float], Dict[str, Dict[str, str]]]:
+    """Median ms per case across rounds, plus each case's verdict record."""
+    per_case: List[List[float]] = [[] for _ in cases]
+    records: Dict[str, Dict[str, str]] = {}
+    with stage.session(), contextlib.redirect_stdout(io.StringIO()):
+        for round_number in range(rounds):
+            for i, case in enumerate(cases):
+                started = time.perf_counter()
+                verdict, output = stage.run(case.payload)
+                per_case[i].append((time.perf_counter() - started) * 1000)
+                if round_number == 0:
+                    records[case.sha] = {
+                        "label": case.label,
+                        "verdict": verdict,
+                        "output_sha256": sha256(output),
+                    }
+    return [statistics.median(samples) for samples in per_case], records
+
+
+def diff_golden(
+    golden: Dict[str, Dict[str, str]], current: Dict[str, Dict[str, str]]
+) -> Tuple[List[str], int, int]:
+    """(changes, new cases, cases missing from the corpus)."""
+    changes = []
+    for sha, record in current.items():
+        expected = golden.get(sha)
+        if expected is None:
+            continue
+        if expected["verdict"] != record["verdict"]:
+            changes.append(
+                f"{record['label']}: verdict {expected['verdict']!r} -> {record['verdict']!r}"
+            )
+        elif expected["output_sha256"] != record["output_sha256"]:
+            changes.append(f"{record['label']}: output changed (verdict {record['verdict']!r})")
+    new = sum(1 for sha in current if sha not in golden)
+    missing = sum(1 for sha in golden if sha not in current)
+    return changes, new, missing
+
+
+def load_golden(path: Path) -> Dict[str, Dict[str, Dict[str, str]]]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_golden(path: Path, golden: Dict[str, Dict[str, Dict[str, str]]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def parse_corpus_overrides(values: List[str]) -> Dict[str, Path]:
+    overrides = {}
+    for value in values:
+        stage, sep, directory = value.partition("=")
+        if not sep or stage not in STAGE_TYPES:
+            raise SystemExit(f"❌ --corpus expects STAGE=DIR with STAGE in {STAGES}: {value}")
+        overrides[stage] = Path(directory)
+    return overrides
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay saved LLM outputs through post-processing")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of " + ",".join(STAGES))
+    parser.add_argument("--corpus", action="append", default=[], metavar="STAGE=DIR")
+    parser.add_argument("--golden", type=Path, default=GOLDEN_PATH)
+    parser.add_argument("--update", action="store_true", help="record current verdicts as golden")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--synthetic", type=int, default=0, help="generated cases for empty corpora")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--law", help="invocation law for the ctx stage")
+    parser.add_argument("--show", type=int, default=20, help="changes listed per stage")
+    args = parser.parse_args()
+
+    names = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in names if s not in STAGE_TYPES]
+    if unknown:
+        raise SystemExit(f"❌ Unknown stage(s) {unknown}; choose from {STAGES}")
+    overrides = parse_corpus_overrides(args.corpus)
+    golden = load_golden(args.golden)
+    if not golden and not args.update:
+        print(f"⚠️ No golden at {args.golden}; timing only (record one with --update).")
+
+    failed = False
+    for name in names:
+        stage = CtxStage(args.law) if name == "ctx" else STAGE_TYPES[name]()
+        corpus_dir = overrides.get(name, stage.default_dir())
+        cases = dedupe(stage.load(corpus_dir))
+        source = str(corpus_dir)
+        if not cases and args.synthetic:
+            cases = dedupe(stage.synthetic(random.Random(args.seed), args.synthetic))
+            source = f"synthetic seed={args.seed}"
+        if not cases:
+            print(f"⚠️ {name:<9} no receipts in {corpus_dir}; skipped.")
+            continue
+
+        timings, records = replay_stage(stage, cases, args.rounds)
+        total = sum(timings)
+        chars = sum(c.chars for c in cases)
+        rate = chars / total / 1000 if total else 0.0
+        verdicts: Dict[str, int] = {}
+        for record in records.values():
+            key = "ok" if record["verdict"] == "ok" else "flagged"
+            verdicts[key] = verdicts.get(key, 0) + 1
+        print(
+            f"✶ {name:<9} cases={len(cases):4d} total={total:8.1f}ms  "
+            f"p50={statistics.median(timings):6.2f}ms  max={max(timings):6.2f}ms  "
+            f"{rate:6.2f}Mchar/s  ok={verdicts.get('ok', 0)} flagged={verdicts.get('flagged', 0)}  "
+            f"[{source}]"
+        )
+
+        if args.update:
+            golden[name] = records
+            continue
+        if name not in golden:
+            continue
+        changes, new, missing = diff_golden(golden[name], records)
+        if new or missing:
+            print(f"   {new} case(s) not in golden, {missing} golden case(s) not replayed")
+        if changes:
+            failed = True
+            print(f"❌ {name}: {len(changes)} verdict/output change(s) vs golden")
+            for line in changes[: args.show]:
+                print(f"   {line}")
+            if len(changes) > args.show:
+                print(f"   ... {len(changes) - args.show} more")
+
+    if args.update:
+        save_golden(args.golden, golden)
+        print(f"✓ Golden recorded: {args.golden}")
+        return
+    if failed:
+        sys.exit(1)
+    if golden:
+        print("✓ All replayed verdicts and outputs match golden.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# ==============================================================================
+# ✶⌁✶ response_cache.py — THE DETERMINISTIC RESPONSE VAULT v1.0.1
+# ==============================================================================
+# ROLE: Content-addressed on-disk cache for greedy (temperature 0.0) generations.
+# ENGINE: Deterministic Logic (Python 3.10+) / zlib
+# KEY: sha256(model_id, system_prompt, prompt, params)
+# POLICY:
+#   - Size-bounded LRU eviction (file mtime is touched on every hit)
+#   - Optional TTL (entries older than ttl are treated as misses and removed)
+#   - zlib-compressed JSON entries, sharded by key prefix
+#   - Process-wide hit/miss/eviction counters
+#   - Writes never raise: an OSError is counted (write_errors) and logged,
+#     and each writer stages through its own temp file
+# ==============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path(
+    os.getenv(
+        "WATSONX_CACHE_DIR", "C:/Users/digitalscorpyun/projects_2026/avm/_cache/watsonx"
+    )
+)
+DEFAULT_MAX_MB = float(os.getenv("WATSONX_CACHE_MAX_MB", "256"))
+DEFAULT_TTL_HOURS = float(os.getenv("WATSONX_CACHE_TTL_HOURS", "0"))
+CACHE_ENABLED = os.getenv("WATSONX_CACHE", "1") != "0"
+
+ENTRY_SUFFIX = ".z"
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = int(DEFAULT_MAX_MB * 1024 * 1024),
+        ttl_s: Optional[float] = (DEFAULT_TTL_HOURS * 3600) or None,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "write_errors": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+    # --------------------------------------------------------------------------
+    # KEYING
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def make_key(
+        model_id: str, system_prompt: str, prompt: str, params: Dict[str, Any]
+    ) -> str:
+        canonical = json.dumps(
+            {
+                "model_id": model_id,
+                "system_prompt": system_prompt,
+                "prompt": prompt,
+                "params": params,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    # --------------------------------------------------------------------------
+    # READ / WRITE
+    # --------------------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        path = self._entry_path(key)
+        with self._lock:
+            try:
+                blob = path.read_bytes()
+                entry = json.loads(zlib.decompress(blob).decode("utf-8"))
+            except (OSError, zlib.error, ValueError):
+                self.counters["misses"] += 1
+                return None
+
+            if self.ttl_s and time.time() - entry.get("created", 0) > self.ttl_s:
+                self._remove(path)
+                self.counters["expired"] += 1
+                self.counters["misses"] += 1
+                return None
+
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            self.counters["hits"] += 1
+            return entry.get("text")
+
+    def put(self, key: str, text: str) -> None:
+        path = self._entry_path(key)
+        blob = zlib.compress(
+            json.dumps({"created": time.time(), "text": text}).encode("utf-8"), 6
+        )
+        # Per-writer temp name: another process may be storing the same key.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            try:
+                self._ensure_size_index()
+                previous = path.stat().st_size if path.exists() else 0
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(blob)
+                os.replace(tmp_path, path)
+                self._total_bytes += len(blob) - previous
+                self.counters["writes"] += 1
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+            except OSError as e:
+                # The generation is already paid for; a failed write is only a miss later.
+                self.counters["write_errors"] += 1
+                print(f"⚠️ Response cache write failed ({path}): {e}")
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+
+    # --------------------------------------------------------------------------
+    # EVICTION
+    # --------------------------------------------------------------------------
+    def _entries(self):
+        if not self.root.exists():
+            return []
+        return list(self.root.glob(f"*/*{ENTRY_SUFFIX}"))
+
+    def _ensure_size_index(self) -> None:
+        if self._total_bytes is None:
+            self._total_bytes = sum(p.stat().st_size for p in self._entries())
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._total_bytes is not None:
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """Drops least-recently-used entries until 90% of the budget is free."""
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries(), key=lambda p: p.stat().st_mtime)
+        for path in entries:
+            if self._total_bytes <= target:
+                break
+            self._remove(path)
+            self.counters["evictions"] += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = 0
+            for path in self._entries():
+                self._remove(path)
+                removed += 1
+            self._total_bytes = 0
+            return removed
+
+    # --------------------------------------------------------------------------
+    # TELEMETRY
+    # --------------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._ensure_size_index()
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries()),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl_s,
+                "root": str(self.root),
+            }
+
+
+_SHARED_CACHE: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache instance so counters aggregate across clients."""
+    global _SHARED_CACHE
+    if not CACHE_ENABLED:
+        return None
+    if _SHARED_CACHE is None:
+        _SHARED_CACHE = ResponseCache()
+    return _SHARED_CACHE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WatsonX response cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--dir", type=Path, default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    cache = ResponseCache(root=args.dir)
+    if args.command == "clear":
+        print(f"✶ Cleared {cache.clear()} cached response(s) from {args.dir}")
+        return
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
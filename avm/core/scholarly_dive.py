@@ -1,20 +1,44 @@
 # ==============================================================================
-# ✶⌁✶ scholarly_dive.py — THE SCHOLARLY SYNTHESIS ENGINE v3.8.3 [ANCHOR-QUALITY]
+# ✶⌁✶ scholarly_dive.py — THE SCHOLARLY SYNTHESIS ENGINE v3.13.0 [ANCHOR-QUALITY]
 # ==============================================================================
 # ROLE: Lean synthesis client with fail-fast validation, citation integrity,
 #       metadata enforcement, topic-focus enforcement, unsupported-specificity
 #       suppression, and vault-safe emission discipline.
+# SPECULATIVE (v3.9.0, SCHOLARLY_SPECULATIVE=1): primary and rebuild prompts
+#       run concurrently; the first to pass validate wins and the other is
+#       cancelled. Repairs start once both fail. Latency saved is reported.
+# BATCH (v3.10.0): python scholarly_dive.py --batch topics.txt --workers 3
+#       Resumable: per-topic status/attempts checkpointed to JSON; completed
+#       topics with artifacts on disk are skipped on rerun.
+# SCOPED REPAIR (v3.11.0): validate reports the failing region; repairs
+#       regenerate only the metadata block, bibliography or one section and
+#       splice it back. Body-level failures still get a full rewrite.
+# DOCUMENT MODEL (v3.12.0): parse_document() is memoized per draft text and
+#       fills each field (refs, paragraphs, bibliography, word counts) on
+#       first use, so cleanup and validate share the parse. Paragraphs with
+#       nothing to soften skip the per-sentence scans.
+#       Benchmark: python scholarly_doc_bench.py --baseline old.py
+# DEBUG BUNDLES (v3.13.0): receipts go through debug_bundle's background
+#       writer into one zip per topic run in DEBUG_DIR
+#       (python debug_bundle.py list|extract|cat). AVM_DEBUG_BUNDLES=0 keeps
+#       loose files.
 # COMPLIANCE: WC-DIR-2026-01-11-ENV-HARDENING / SENTINEL-V2.0.0-ALIGN
 # ==============================================================================
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import os
 import re
-import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -23,23 +47,22 @@ try:
 except ImportError:  # pragma: no cover
     from backports.zoneinfo import ZoneInfo  # type: ignore
 
+from debug_bundle import write_debug
 from vs_enc import VSEncOrchestrator
-from watsonx_client import WatsonXClient
+from watsonx_client import GenerationCancelled, WatsonXClient
 
 
 # ------------------------------------------------------------------------------
 # ENV / IDENTITY
 # ------------------------------------------------------------------------------
-if not os.getenv("WATSONX_PROJECT_ID"):
-    print("❌ ERROR: WATSONX_PROJECT_ID missing.")
-    sys.exit(1)
-
+# Credentials are checked by the backend on the first live generation.
 AGENT = os.getenv("SCHOLARLY_DIVE_AGENT", "QWEN-ECHO")
 ARTIFACT_DIR = "war_council/_artifacts/scholarly_dive"
 DEBUG_DIR = Path("C:/Users/digitalscorpyun/projects_2026/avm/_debug/scholarly_dive")
 LA_TZ = ZoneInfo("America/Los_Angeles")
+SPECULATIVE = os.getenv("SCHOLARLY_SPECULATIVE", "0") == "1"
 
-VERSION = "v3.8.3"
+VERSION = "v3.13.0"
 BANNER = f"✶⌁✶ SCHOLARLY DIVE {VERSION} [ANCHOR-QUALITY] ONLINE"
 
 TARGET_CITATIONS = 3
@@ -47,6 +70,8 @@ MIN_REQUIRED_CITATIONS = 1
 MIN_TAGS = 3
 MIN_KEY_THEMES = 3
 MAX_PARAGRAPHS_PER_SINGLE_CITATION = 2
+# Sizes max_new_tokens (~2.6k) for a full synthesis with bibliography + metadata.
+EXPECTED_ARTIFACT_WORDS = 1800
 
 REQUIRED_HEADERS = [
     "# Abstract",
@@ -54,6 +79,7 @@ REQUIRED_HEADERS = [
     "# Semiotic Analysis",
     "# 📚 BIBLIOGRAPHY",
 ]
+BIB_HEADER = "# 📚 BIBLIOGRAPHY"
 
 CRITICAL_META_KEYS = [
     "title",
@@ -170,15 +196,20 @@ def is_meaningful_meta_token(token: str) -> bool:
     return True
 
 
+META_SEPARATOR_RE = re.compile(r"[\s\-]+")
+META_INVALID_RE = re.compile(r"[^a-z0-9_]")
+META_UNDERSCORES_RE = re.compile(r"_+")
+
+
 def normalize_meta_items(items: List[str], *, max_items: int = 6) -> List[str]:
     out: List[str] = []
     seen = set()
 
     for raw in items:
         item = str(raw).strip().lower()
-        item = re.sub(r"[\s\-]+", "_", item)
-        item = re.sub(r"[^a-z0-9_]", "", item)
-        item = re.sub(r"_+", "_", item).strip("_")
+        item = META_SEPARATOR_RE.sub("_", item)
+        item = META_INVALID_RE.sub("", item)
+        item = META_UNDERSCORES_RE.sub("_", item).strip("_")
         if not item:
             continue
         if YEAR_RE.match(item):
@@ -200,9 +231,15 @@ def normalize_meta_items(items: List[str], *, max_items: int = 6) -> List[str]:
 
 
 def slug_terms(topic: str) -> List[str]:
+    return list(_slug_terms(topic))
+
+
+@lru_cache(maxsize=256)
+def _slug_terms(topic: str) -> Tuple[str, ...]:
+    # Called several times per draft for the same topic by normalize_meta/validate.
     words = [w.lower() for w in re.findall(r"[A-Za-z0-9]+", topic)]
     filtered = [w for w in words if is_meaningful_meta_token(w)]
-    return normalize_meta_items(filtered[:8]) or ["research_topic"]
+    return tuple(normalize_meta_items(filtered[:8]) or ["research_topic"])
 
 
 def make_topic_profile(topic: str) -> TopicProfile:
@@ -391,6 +428,72 @@ DRAFT:
 {draft}
 """
 
+# SCOPED REPAIRS: regenerate only the failing region, then splice it back.
+METADATA_REPAIR_PROMPT = """\
+Repair ONLY the metadata block of the research synthesis on: {topic}
+
+VALIDATION ERROR: {error}
+
+ARTIFACT CONTEXT (read-only, do not rewrite):
+{context}
+
+CURRENT METADATA:
+{metadata}
+
+RULES:
+- Return ONLY "### METADATA" followed by one JSON object with keys:
+  title, tags, key_themes, bias_analysis, grok_ctx_reflection, quotes, adinkra
+- Keep valid existing values; fix or fill the failing fields
+- tags and key_themes: at least 3 analytical, topic-specific strings each
+- quotes must be a non-empty JSON list of REAL direct quotes with attribution in one string:
+  "\\"Quoted text\\" — Name"
+- Do not invent quotations
+"""
+
+BIBLIOGRAPHY_REPAIR_PROMPT = """\
+Repair ONLY the bibliography of the research synthesis on: {topic}
+
+VALIDATION ERROR: {error}
+
+IN-BODY FOOTNOTES (id -> the claim it supports):
+{claims}
+
+CURRENT BIBLIOGRAPHY:
+{bibliography}
+
+RULES:
+- Return ONLY bibliography lines, exactly one per footnote id listed above, in order
+- Format: [^1]: Author, *Title* (Publisher, Year).
+- Keep correct existing entries; do not add ids that are not listed
+- No invented citations; prefer the most defensible scholarly source for each claim
+- No quotations, commentary, or metadata in bibliography lines
+"""
+
+SECTION_REPAIR_PROMPT = """\
+Write ONLY the "{header}" section of the research synthesis on: {topic}
+
+TOPIC JURISDICTION:
+{topic_guidance}
+
+VALIDATION ERROR: {error}
+
+SECTION SCAFFOLD:
+{section_scaffold}
+
+ABSTRACT (context, do not repeat):
+{abstract}
+
+AVAILABLE SOURCES (cite only these ids):
+{bibliography}
+
+RULES:
+- Start with the exact header line: {header}
+- Place footnote markers directly after factual sentences: example.[^1]
+- Cite only the footnote ids listed above
+- No invented citations or quotations
+- Return only the section
+"""
+
 
 # ------------------------------------------------------------------------------
 # TIME / DEBUG
@@ -403,15 +506,30 @@ def ensure_debug_dir() -> None:
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def debug_topic_slug(topic: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9]+", "_", topic).strip("_")[:80] or "topic"
+
+
 def debug_path(topic: str, label: str) -> Path:
     stamp = now_la().strftime("%Y%m%d_%H%M%S")
-    safe_topic = re.sub(r"[^a-zA-Z0-9]+", "_", topic).strip("_")[:80] or "topic"
-    return DEBUG_DIR / f"{stamp}__{safe_topic}__{label}.txt"
+    return DEBUG_DIR / f"{stamp}__{debug_topic_slug(topic)}__{label}.txt"
+
+
+_DEBUG_SESSIONS: Dict[str, str] = {}
+_DEBUG_SESSIONS_LOCK = threading.Lock()
+
+
+def debug_bundle_path(topic: str) -> Path:
+    """One bundle per topic per run; the stamp is fixed at the first receipt."""
+    slug = debug_topic_slug(topic)
+    with _DEBUG_SESSIONS_LOCK:
+        stamp = _DEBUG_SESSIONS.setdefault(slug, now_la().strftime("%Y%m%d_%H%M%S"))
+    return DEBUG_DIR / f"{stamp}__{slug}.zip"
 
 
 def save_debug(topic: str, label: str, content: str) -> None:
-    path = debug_path(topic, label)
-    path.write_text(content, encoding="utf-8")
+    # Queued for the background bundle writer; entry names keep the loose-file form.
+    write_debug(debug_bundle_path(topic), debug_path(topic, label).name, content, DEBUG_DIR)
 
 
 # ------------------------------------------------------------------------------
@@ -425,12 +543,11 @@ def split_body_bib(body: str) -> Tuple[str, str]:
 
 
 def body_refs(body: str) -> List[str]:
-    main, _ = split_body_bib(body)
-    return FOOTNOTE_REF_RE.findall(main)
+    return list(parse_document(body).refs)
 
 
 def split_paragraphs(text: str) -> List[str]:
-    return [part.strip() for part in re.split(r"\n\s*\n", text.strip()) if part.strip()]
+    return [part.strip() for part in PARAGRAPH_BREAK_RE.split(text.strip()) if part.strip()]
 
 
 def has_required_headers(body: str) -> bool:
@@ -438,24 +555,16 @@ def has_required_headers(body: str) -> bool:
 
 
 def count_concrete_signals(text: str) -> int:
-    return (
-        len(re.findall(r"\b(1[5-9]\d{2}|20\d{2})\b", text))
-        + len(re.findall(r"\b[A-Z][a-z]+ [A-Z][a-z]+\b", text))
-        + len(re.findall(r"\b[A-Z][a-z]+ v\. [A-Z][A-Za-z]+\b", text))
-    )
+    return parse_document(text).concrete_signals
 
 
 def topic_token_hits(body: str, profile: TopicProfile) -> int:
-    text = body.lower()
-    hits = 0
-    for tok in profile.focus_tokens:
-        if re.search(rf"\b{re.escape(tok)}\b", text):
-            hits += 1
-    return hits
+    words = parse_document(body).words
+    return sum(1 for tok in profile.focus_tokens if tok in words)
 
 
 def count_year_mentions(body: str, year: str) -> int:
-    return len(re.findall(rf"\b{re.escape(year)}\b", body))
+    return parse_document(body).words[year.lower()]
 
 
 def generic_tag_set(tags: List[str], topic: str) -> bool:
@@ -502,7 +611,7 @@ def soften_specificity_sentence(sentence: str) -> Tuple[str, bool]:
 
 
 def split_sentences(paragraph: str) -> List[str]:
-    parts = re.split(r"(?<=[.!?])\s+", paragraph.strip())
+    parts = SENTENCE_BREAK_RE.split(paragraph.strip())
     return [p.strip() for p in parts if p.strip()]
 
 
@@ -519,6 +628,81 @@ def is_prose_line(line: str) -> bool:
     return len(re.sub(r"\[\^\d+\]", "", stripped).strip()) >= 20
 
 
+# ------------------------------------------------------------------------------
+# DOCUMENT MODEL
+# ------------------------------------------------------------------------------
+# Memoized per distinct draft text so the cleanup stages and validate share
+# one parse. Every field is computed on first use: most stages produce a new
+# text and read one or two fields of it, so an eager parse costs more than
+# the re-splitting it replaces.
+PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+")
+WORD_RE = re.compile(r"\w+")
+YEAR_TOKEN_RE = re.compile(r"1[5-9]\d{2}|20\d{2}")
+PROPER_NAME_RE = re.compile(r"\b[A-Z][a-z]+ [A-Z][a-z]+\b")
+CASE_NAME_RE = re.compile(r"\b[A-Z][a-z]+ v\. [A-Z][A-Za-z]+\b")
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    text: str
+    citation_ids: Tuple[str, ...]
+
+    @property
+    def is_header(self) -> bool:
+        return self.text.startswith("#")
+
+
+class DocumentModel:
+    """
+    Read-only parse of a draft: body/bibliography split, footnote refs,
+    paragraphs (split_paragraphs semantics) with their footnote ids,
+    bibliography entries and a lowercase word index.
+    Build through parse_document() so identical text is parsed once.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.main, self.bib = split_body_bib(text)
+
+    @cached_property
+    def refs(self) -> Tuple[str, ...]:
+        return tuple(FOOTNOTE_REF_RE.findall(self.main))
+
+    @cached_property
+    def paragraphs(self) -> Tuple[Paragraph, ...]:
+        return tuple(
+            Paragraph(part, tuple(FOOTNOTE_REF_RE.findall(part)) if "[^" in part else ())
+            for part in split_paragraphs(self.main)
+        )
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def words(self) -> Counter:
+        return Counter(WORD_RE.findall(self.lower))
+
+    @cached_property
+    def bib_entries(self) -> Tuple[Tuple[str, str], ...]:
+        return tuple(scan_bibliography_entries(self.bib))
+
+    @cached_property
+    def concrete_signals(self) -> int:
+        years = sum(n for word, n in self.words.items() if YEAR_TOKEN_RE.fullmatch(word))
+        return (
+            years
+            + len(PROPER_NAME_RE.findall(self.text))
+            + len(CASE_NAME_RE.findall(self.text))
+        )
+
+
+@lru_cache(maxsize=64)
+def parse_document(text: str) -> DocumentModel:
+    return DocumentModel(text)
+
+
 # ------------------------------------------------------------------------------
 # METADATA EXTRACTION / NORMALIZATION
 # ------------------------------------------------------------------------------
@@ -637,7 +821,7 @@ def infer_quote_from_body(body: str) -> List[str]:
 
 def extract_candidate_themes(body: str, topic: str) -> List[str]:
     candidates: List[str] = []
-    body_lower = body.lower()
+    body_lower = parse_document(body).lower
 
     theme_map = [
         ("historiography", ["historiography", "scholarly debate", "revisionist", "consensus"]),
@@ -663,8 +847,10 @@ def extract_candidate_themes(body: str, topic: str) -> List[str]:
     return normalize_meta_items(candidates[:10])
 
 
-def extract_candidate_tags(body: str, topic: str) -> List[str]:
-    body_lower = body.lower()
+def extract_candidate_tags(
+    body: str, topic: str, themes: Optional[List[str]] = None
+) -> List[str]:
+    body_lower = parse_document(body).lower
     candidates: List[str] = []
 
     tag_map = [
@@ -684,15 +870,15 @@ def extract_candidate_tags(body: str, topic: str) -> List[str]:
         if any(needle in body_lower for needle in needles):
             candidates.append(tag)
 
-    candidates.extend(extract_candidate_themes(body, topic))
+    candidates.extend(extract_candidate_themes(body, topic) if themes is None else themes)
     candidates.extend(slug_terms(topic))
     return normalize_meta_items(candidates[:12])
 
 
 def normalize_meta(meta: Dict[str, Any], topic: str, body: str) -> Dict[str, Any]:
     meta = meta if isinstance(meta, dict) else {}
-    candidate_tags = extract_candidate_tags(body, topic)
     candidate_themes = extract_candidate_themes(body, topic)
+    candidate_tags = extract_candidate_tags(body, topic, candidate_themes)
 
     title = str(meta.get("title", "")).strip() or topic.strip() or "Research"
     tags = meta.get("tags", [])
@@ -771,7 +957,10 @@ def bibliography_cutoff_index(bib: str) -> int:
 
 
 def parse_bibliography_entries(body: str) -> List[Tuple[str, str]]:
-    _, bib = split_body_bib(body)
+    return list(parse_document(body).bib_entries)
+
+
+def scan_bibliography_entries(bib: str) -> List[Tuple[str, str]]:
     if not bib.strip():
         return []
 
@@ -843,30 +1032,36 @@ def rebuild_bibliography(body: str, entries: List[Tuple[str, str]]) -> str:
 # ------------------------------------------------------------------------------
 # BODY DISCIPLINE / SUPPRESSION
 # ------------------------------------------------------------------------------
+def is_risky_claim(text: str) -> bool:
+    return bool(
+        PAGE_CLAIM_RE.search(text) or ARCHIVE_CLAIM_RE.search(text) or DATE_CLAIM_RE.search(text)
+    )
+
+
 def suppress_unsupported_specificity(body: str) -> Tuple[str, List[str]]:
     warnings: List[str] = []
-    main, bib = split_body_bib(body)
-    paragraphs = split_paragraphs(main)
+    doc = parse_document(body)
+    bib = doc.bib
     repaired_paragraphs: List[str] = []
 
-    for para in paragraphs:
-        if para.startswith("#"):
+    for paragraph in doc.paragraphs:
+        para = paragraph.text
+        if paragraph.is_header:
             repaired_paragraphs.append(para)
             continue
 
-        citation_ids = paragraph_citation_ids(para)
+        citation_ids = paragraph.citation_ids
+        if citation_ids or not is_risky_claim(para):
+            # Nothing to soften: split_sentences + join only normalizes the breaks.
+            repaired_paragraphs.append(SENTENCE_BREAK_RE.sub(" ", para.strip()))
+            continue
+
         sentence_parts = split_sentences(para)
         new_sentences: List[str] = []
 
         for sentence in sentence_parts:
             stripped = sentence.strip()
-            risky = bool(
-                PAGE_CLAIM_RE.search(stripped)
-                or ARCHIVE_CLAIM_RE.search(stripped)
-                or DATE_CLAIM_RE.search(stripped)
-            )
-
-            if risky and not citation_ids:
+            if is_risky_claim(stripped):
                 softened, changed = soften_specificity_sentence(stripped)
                 if changed:
                     warnings.append(f"Softened unsupported specificity: {stripped[:100]}")
@@ -884,23 +1079,23 @@ def suppress_unsupported_specificity(body: str) -> Tuple[str, List[str]]:
 
 def citation_load_warnings(body: str) -> List[str]:
     warnings: List[str] = []
-    main, _ = split_body_bib(body)
-    paragraphs = [p for p in split_paragraphs(main) if not p.startswith("#")]
+    doc = parse_document(body)
+    paragraphs = [p for p in doc.paragraphs if not p.is_header]
 
     if not paragraphs:
         return warnings
 
-    paragraphs_with_cites: List[str] = []
+    paragraphs_with_cites: List[Paragraph] = []
     citation_to_paragraphs: Dict[str, int] = {}
 
     for para in paragraphs:
-        ids = set(paragraph_citation_ids(para))
+        ids = set(para.citation_ids)
         if ids:
             paragraphs_with_cites.append(para)
         for cid in ids:
             citation_to_paragraphs[cid] = citation_to_paragraphs.get(cid, 0) + 1
 
-    if len(set(body_refs(body))) == 1 and len(paragraphs_with_cites) > MAX_PARAGRAPHS_PER_SINGLE_CITATION:
+    if len(set(doc.refs)) == 1 and len(paragraphs_with_cites) > MAX_PARAGRAPHS_PER_SINGLE_CITATION:
         warnings.append("A single citation is carrying too many paragraphs of argument.")
 
     for cid, count in citation_to_paragraphs.items():
@@ -974,9 +1169,9 @@ def sanitize_bibliography(body: str) -> Tuple[str, List[str]]:
     if "# 📚 BIBLIOGRAPHY" not in body:
         return body, warnings
 
-    _, bib = split_body_bib(body)
-    original_lines = [ln.rstrip() for ln in bib.splitlines() if ln.strip()]
-    entries = parse_bibliography_entries(body)
+    doc = parse_document(body)
+    original_lines = [ln.rstrip() for ln in doc.bib.splitlines() if ln.strip()]
+    entries = list(doc.bib_entries)
 
     if not original_lines and not entries:
         return body, warnings
@@ -1100,73 +1295,87 @@ class ValidationResult:
     error: str = ""
     warnings: List[str] = field(default_factory=list)
     distinct_citations: int = 0
+    latency_saved_s: float = 0.0
+    attempts: int = 1
+    # Failing region: "body", "metadata", "bibliography" or a top-level
+    # section header such as "# Semiotic Analysis". Empty when ok.
+    region: str = ""
 
 
 def validate(body: str, meta: Dict[str, Any], profile: TopicProfile) -> ValidationResult:
     warnings: List[str] = []
 
     if not body.strip():
-        return ValidationResult(False, "Empty output")
+        return ValidationResult(False, "Empty output", region="body")
 
     for header in REQUIRED_HEADERS:
         if header not in body:
-            return ValidationResult(False, f"Missing section: {header}")
+            region = "bibliography" if header == BIB_HEADER else header
+            return ValidationResult(False, f"Missing section: {header}", region=region)
 
     focus_error = validate_topic_focus(body, profile)
     if focus_error:
-        return ValidationResult(False, focus_error)
+        return ValidationResult(False, focus_error, region="body")
 
     refs = set(body_refs(body))
     b_ids = set(bib_ids(body))
     bib = bib_lines(body)
 
     if len(refs) < MIN_REQUIRED_CITATIONS:
-        return ValidationResult(False, f"Only {len(refs)} distinct citations", distinct_citations=len(refs))
+        return ValidationResult(
+            False, f"Only {len(refs)} distinct citations", distinct_citations=len(refs), region="body"
+        )
 
     if not bib:
-        return ValidationResult(False, "Missing bibliography", distinct_citations=len(refs))
+        return ValidationResult(
+            False, "Missing bibliography", distinct_citations=len(refs), region="bibliography"
+        )
 
     if refs != b_ids:
         return ValidationResult(
             False,
             "Citation mismatch between body and bibliography",
             distinct_citations=len(refs),
+            region="bibliography",
         )
 
     for line in bib:
         if not BIB_LINE_RE.match(line):
-            return ValidationResult(False, "Invalid bibliography format", distinct_citations=len(refs))
+            return ValidationResult(
+                False, "Invalid bibliography format", distinct_citations=len(refs), region="bibliography"
+            )
 
     claim_load = citation_load_warnings(body)
     if claim_load and len(refs) <= 1:
-        return ValidationResult(False, claim_load[0], distinct_citations=len(refs))
+        return ValidationResult(False, claim_load[0], distinct_citations=len(refs), region="body")
     warnings.extend(claim_load)
 
     for key in CRITICAL_META_KEYS:
         value = meta.get(key)
         if isinstance(value, str) and not value.strip():
-            return ValidationResult(False, f"Empty metadata field: {key}", distinct_citations=len(refs))
+            return ValidationResult(False, f"Empty metadata field: {key}", distinct_citations=len(refs), region="metadata")
         if isinstance(value, list) and not value:
-            return ValidationResult(False, f"Empty metadata field: {key}", distinct_citations=len(refs))
+            return ValidationResult(False, f"Empty metadata field: {key}", distinct_citations=len(refs), region="metadata")
         if value is None:
-            return ValidationResult(False, f"Empty metadata field: {key}", distinct_citations=len(refs))
+            return ValidationResult(False, f"Empty metadata field: {key}", distinct_citations=len(refs), region="metadata")
 
     quotes = meta.get("quotes", [])
     if not isinstance(quotes, list) or not quotes:
-        return ValidationResult(False, "Metadata quotes invalid or empty", distinct_citations=len(refs))
+        return ValidationResult(False, "Metadata quotes invalid or empty", distinct_citations=len(refs), region="metadata")
     if not all(isinstance(q, str) and "—" in q and q.count('"') >= 2 for q in quotes):
         return ValidationResult(
             False,
             "Metadata quotes invalid or unattributed",
             distinct_citations=len(refs),
+            region="metadata",
         )
 
     tags = meta.get("tags", [])
     key_themes = meta.get("key_themes", [])
     if not isinstance(tags, list) or len(tags) < MIN_TAGS:
-        return ValidationResult(False, "Metadata tags insufficient", distinct_citations=len(refs))
+        return ValidationResult(False, "Metadata tags insufficient", distinct_citations=len(refs), region="metadata")
     if not isinstance(key_themes, list) or len(key_themes) < MIN_KEY_THEMES:
-        return ValidationResult(False, "Metadata key_themes insufficient", distinct_citations=len(refs))
+        return ValidationResult(False, "Metadata key_themes insufficient", distinct_citations=len(refs), region="metadata")
 
     if generic_tag_set(tags, profile.raw_topic):
         warnings.append("Tags were minimally differentiated from the topic string.")
@@ -1179,6 +1388,85 @@ def validate(body: str, meta: Dict[str, Any], profile: TopicProfile) -> Validati
     return ValidationResult(True, "", dedupe(warnings), len(refs))
 
 
+# ------------------------------------------------------------------------------
+# SCOPED REPAIR SPLICING
+# ------------------------------------------------------------------------------
+SCOPED_REGIONS = {"metadata", "bibliography"}
+
+
+def is_scoped_region(region: str) -> bool:
+    return region in SCOPED_REGIONS or (region.startswith("# ") and region != BIB_HEADER)
+
+
+def section_span(body: str, header: str) -> Optional[Tuple[int, int]]:
+    """(start, end) of a top-level section including its header line."""
+    match = re.search(rf"^{re.escape(header)}[ \t]*$", body, re.MULTILINE)
+    if not match:
+        return None
+    following = re.search(r"^# ", body[match.end() :], re.MULTILINE)
+    end = match.end() + following.start() if following else len(body)
+    return match.start(), end
+
+
+def section_text(body: str, header: str) -> str:
+    span = section_span(body, header)
+    if span is None:
+        return ""
+    return body[span[0] : span[1]].split("\n", 1)[-1].strip()
+
+
+def scaffold_for(header: str) -> str:
+    span = section_span(HARD_SCAFFOLD, header)
+    return HARD_SCAFFOLD[span[0] : span[1]].strip() if span else header
+
+
+def footnote_claims(body: str, max_chars: int = 240) -> str:
+    """One line per distinct body footnote: the first sentence citing it."""
+    claims: Dict[str, str] = {}
+    for paragraph in parse_document(body).paragraphs:
+        if not paragraph.citation_ids:
+            continue
+        prose = " ".join(line for line in paragraph.text.splitlines() if not line.startswith("#"))
+        # Footnote markers trail the period, so split after them too.
+        for sentence in re.split(r"(?<=[.!?\]])\s+", prose.strip()):
+            for cid in FOOTNOTE_REF_RE.findall(sentence):
+                claims.setdefault(cid, sentence[:max_chars])
+    return "\n".join(f"[^{cid}] {claim}" for cid, claim in claims.items())
+
+
+def splice_section(body: str, header: str, raw: str) -> str:
+    """Replaces (or inserts, in REQUIRED_HEADERS order) one top-level section."""
+    text = raw.strip()
+    if text.startswith(header):
+        text = text[len(header) :].strip()
+    block = f"{header}\n\n{text}\n\n"
+
+    span = section_span(body, header)
+    if span is not None:
+        return clean_whitespace(body[: span[0]] + block + body[span[1] :])
+
+    later = REQUIRED_HEADERS[REQUIRED_HEADERS.index(header) + 1 :] if header in REQUIRED_HEADERS else []
+    for next_header in later:
+        next_span = section_span(body, next_header)
+        if next_span is not None:
+            return clean_whitespace(body[: next_span[0]] + block + body[next_span[0] :])
+    return clean_whitespace(body.rstrip() + "\n\n" + block)
+
+
+def splice_bibliography(body: str, raw: str) -> str:
+    entries = parse_bibliography_entries(f"{BIB_HEADER}\n{raw.strip()}")
+    return rebuild_bibliography(body, entries) if entries else body
+
+
+def splice_metadata(meta: Dict[str, Any], raw: str) -> Dict[str, Any]:
+    _, repaired, _ = extract_metadata(raw)
+    if not repaired:
+        candidate, _ = extract_balanced_json_block(raw)
+        repaired = repair_json(candidate)
+    updates = {k: v for k, v in repaired.items() if k in CRITICAL_META_KEYS and v}
+    return {**meta, **updates}
+
+
 # ------------------------------------------------------------------------------
 # MODEL / PIPELINE
 # ------------------------------------------------------------------------------
@@ -1187,12 +1475,21 @@ class Synapse:
     agent: str = AGENT
 
     def __post_init__(self) -> None:
-        self.client = WatsonXClient()
+        self.client = WatsonXClient(caller="scholarly_dive")
         self.client.set_agent(self.agent)
         print(f"✶ Synapse: {self.agent} online")
 
-    def ask(self, prompt: str) -> str:
-        return self.client.ask(prompt, max_new_tokens=2600)
+    def ask(
+        self, prompt: str, label: str = "", cancel: Optional[threading.Event] = None
+    ) -> str:
+        # Cancellable calls stream so a losing generation is actually closed.
+        return self.client.ask(
+            prompt,
+            label=label,
+            expected_words=EXPECTED_ARTIFACT_WORDS,
+            cancel=cancel,
+            stream=True if cancel is not None else None,
+        )
 
 
 class StubAgent:
@@ -1226,6 +1523,7 @@ def serialize_validation(result: ValidationResult) -> str:
             "error": result.error,
             "warnings": result.warnings,
             "distinct_citations": result.distinct_citations,
+            "region": result.region,
         },
         indent=2,
         ensure_ascii=False,
@@ -1237,11 +1535,17 @@ def attempt(
     profile: TopicProfile,
     label: str,
     prompt: str,
+    cancel: Optional[threading.Event] = None,
 ) -> Tuple[str, Dict[str, Any], ValidationResult]:
     save_debug(profile.raw_topic, f"{label}_prompt", prompt)
-    raw = syn.ask(prompt)
+    raw = syn.ask(prompt, label=label, cancel=cancel)
     save_debug(profile.raw_topic, f"{label}_raw", raw)
+    return finalize_attempt(profile, label, raw)
 
+
+def finalize_attempt(
+    profile: TopicProfile, label: str, raw: str
+) -> Tuple[str, Dict[str, Any], ValidationResult]:
     body, meta, meta_warnings = extract_metadata(raw)
     body, meta, pipeline_warnings = cleanup_pipeline(profile.raw_topic, body, meta)
 
@@ -1254,61 +1558,232 @@ def attempt(
     return body, meta, result
 
 
-def generate(syn: Synapse, topic: str) -> Tuple[str, Dict[str, Any], ValidationResult]:
-    profile = make_topic_profile(topic)
+Attempt = Tuple[str, Dict[str, Any], ValidationResult]
 
-    body1, meta1, res1 = attempt(
-        syn,
-        profile,
-        "attempt1_primary",
-        PROMPT.format(
+
+def scoped_repair(
+    syn: Synapse,
+    profile: TopicProfile,
+    label: str,
+    body: str,
+    meta: Dict[str, Any],
+    result: ValidationResult,
+) -> Attempt:
+    """
+    Regenerates only result.region (metadata block, bibliography or one
+    top-level section), splices it into the draft and re-validates the
+    whole artifact through the normal cleanup pipeline.
+    """
+    region = result.region
+    _, bibliography = split_body_bib(body)
+    if region == "metadata":
+        prompt = METADATA_REPAIR_PROMPT.format(
+            topic=profile.raw_topic,
+            error=result.error,
+            context=f"# Abstract\n{section_text(body, '# Abstract')}\n\n{BIB_HEADER}\n{bibliography.strip()}",
+            metadata=json.dumps(meta, indent=2, ensure_ascii=False),
+        )
+    elif region == "bibliography":
+        prompt = BIBLIOGRAPHY_REPAIR_PROMPT.format(
+            topic=profile.raw_topic,
+            error=result.error,
+            claims=footnote_claims(body) or "(none)",
+            bibliography=bibliography.strip() or "(empty)",
+        )
+    else:
+        prompt = SECTION_REPAIR_PROMPT.format(
+            header=region,
             topic=profile.raw_topic,
             topic_guidance=profile.guidance,
-            scaffold=HARD_SCAFFOLD,
-        ),
+            error=result.error,
+            section_scaffold=scaffold_for(region),
+            abstract=section_text(body, "# Abstract") or "(missing)",
+            bibliography=bibliography.strip() or "(none)",
+        )
+
+    save_debug(profile.raw_topic, f"{label}_prompt", prompt)
+    raw = syn.ask(prompt, label=f"{label}_{region.strip('# ').split()[0].lower()}")
+    save_debug(profile.raw_topic, f"{label}_raw", raw)
+
+    if region == "metadata":
+        body, meta = body, splice_metadata(meta, raw)
+    elif region == "bibliography":
+        body = splice_bibliography(body, raw)
+    else:
+        body = splice_section(body, region, raw)
+    print(f"✶ Scoped repair: {region} ({len(prompt)} prompt chars, {len(raw)} regenerated)")
+
+    spliced = f"{body}\n\n### METADATA\n{json.dumps(meta, indent=2, ensure_ascii=False)}"
+    return finalize_attempt(profile, label, spliced)
+
+
+def repair_attempt(
+    syn: Synapse,
+    profile: TopicProfile,
+    label: str,
+    seed: Attempt,
+    full_prompt: str,
+) -> Attempt:
+    """Scoped repair when the seed failed in one region, else a full rewrite."""
+    body, meta, result = seed
+    if is_scoped_region(result.region):
+        return scoped_repair(syn, profile, label, body, meta, result)
+    return attempt(syn, profile, label, full_prompt)
+
+
+def speculative_first_pass(
+    syn: Synapse,
+    profile: TopicProfile,
+    stages: List[Tuple[str, str]],
+) -> Tuple[Optional[Attempt], Dict[str, Attempt]]:
+    """
+    Runs (label, prompt) stages concurrently. Returns (winner, outcomes):
+    the first attempt to pass validate, or None with every outcome when all
+    fail. Losers are cancelled. Latency saved is measured against running
+    the stages one after another in the given order.
+    """
+    cancels = {label: threading.Event() for label, _ in stages}
+    durations: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def timed(label: str, prompt: str) -> Attempt:
+        try:
+            return attempt(syn, profile, label, prompt, cancel=cancels[label])
+        finally:
+            durations[label] = time.perf_counter() - started
+
+    pool = ThreadPoolExecutor(max_workers=len(stages), thread_name_prefix="scholarly-spec")
+    futures = {pool.submit(timed, label, prompt): label for label, prompt in stages}
+    outcomes: Dict[str, Attempt] = {}
+    errors: List[BaseException] = []
+    winner: Optional[str] = None
+    pending = set(futures)
+    while pending and winner is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            label = futures[future]
+            if future.exception() is not None:
+                errors.append(future.exception())
+                continue
+            outcomes[label] = future.result()
+            if outcomes[label][2].ok and winner is None:
+                winner = label
+    wall_s = time.perf_counter() - started
+
+    for label in cancels:
+        if label != winner:
+            cancels[label].set()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    # Sequential cost: every stage up to the winner in order. A cancelled
+    # stage counts only its elapsed time, so this is a lower bound.
+    sequential_s = 0.0
+    for label, _ in stages:
+        sequential_s += durations.get(label, wall_s)
+        if label == winner:
+            break
+    saved_s = max(0.0, sequential_s - wall_s)
+    report = {
+        "winner": winner,
+        "wall_s": round(wall_s, 2),
+        "sequential_s": round(sequential_s, 2),
+        "latency_saved_s": round(saved_s, 2),
+        "durations_s": {k: round(v, 2) for k, v in durations.items()},
+    }
+    save_debug(profile.raw_topic, "speculative_report", json.dumps(report, indent=2))
+    print(
+        f"✶ Speculative pass: {winner or 'no winner'} in {wall_s:.1f}s "
+        f"(sequential ≥ {sequential_s:.1f}s, saved {saved_s:.1f}s)"
     )
-    if res1.ok:
-        return body1, meta1, res1
-    print(f"⚠ Failed: {res1.error}")
 
-    body2, meta2, res2 = attempt(
-        syn,
-        profile,
-        "attempt2_rebuild",
-        REBUILD_PROMPT.format(
-            topic=profile.raw_topic,
-            topic_guidance=profile.guidance,
-            scaffold=HARD_SCAFFOLD,
-        ),
+    if winner is not None:
+        outcomes[winner][2].latency_saved_s = saved_s
+        return outcomes[winner], outcomes
+    real_errors = [e for e in errors if not isinstance(e, GenerationCancelled)]
+    if real_errors:
+        raise real_errors[0]
+    for label, _ in stages:
+        outcomes[label][2].latency_saved_s = saved_s
+    return None, outcomes
+
+
+def generate(
+    syn: Synapse, topic: str, speculative: bool = SPECULATIVE
+) -> Tuple[str, Dict[str, Any], ValidationResult]:
+    profile = make_topic_profile(topic)
+    primary_prompt = PROMPT.format(
+        topic=profile.raw_topic,
+        topic_guidance=profile.guidance,
+        scaffold=HARD_SCAFFOLD,
+    )
+    rebuild_prompt = REBUILD_PROMPT.format(
+        topic=profile.raw_topic,
+        topic_guidance=profile.guidance,
+        scaffold=HARD_SCAFFOLD,
     )
-    if res2.ok:
-        return body2, meta2, res2
-    print(f"⚠ Failed: {res2.error}")
 
-    repair_seed = body2 if len(body2.strip()) >= len(body1.strip()) else body1
-    body3, meta3, res3 = attempt(
+    saved_s = 0.0
+    if speculative:
+        winner, outcomes = speculative_first_pass(
+            syn,
+            profile,
+            [("attempt1_primary", primary_prompt), ("attempt2_rebuild", rebuild_prompt)],
+        )
+        if winner is not None:
+            winner[2].attempts = 2  # both stages were dispatched
+            return winner
+        body1, meta1, res1 = outcomes["attempt1_primary"]
+        body2, meta2, res2 = outcomes["attempt2_rebuild"]
+        saved_s = res2.latency_saved_s
+        print(f"⚠ Failed: {res1.error}")
+        print(f"⚠ Failed: {res2.error}")
+    else:
+        body1, meta1, res1 = attempt(syn, profile, "attempt1_primary", primary_prompt)
+        if res1.ok:
+            res1.attempts = 1
+            return body1, meta1, res1
+        print(f"⚠ Failed: {res1.error}")
+
+        body2, meta2, res2 = attempt(syn, profile, "attempt2_rebuild", rebuild_prompt)
+        if res2.ok:
+            res2.attempts = 2
+            return body2, meta2, res2
+        print(f"⚠ Failed: {res2.error}")
+
+    seed = (body2, meta2, res2) if len(body2.strip()) >= len(body1.strip()) else (body1, meta1, res1)
+    repair_seed = seed[0]
+    body3, meta3, res3 = repair_attempt(
         syn,
         profile,
         "attempt3_repair",
+        seed,
         REPAIR_PROMPT.format(
             topic=profile.raw_topic,
             topic_guidance=profile.guidance,
-            error=res2.error,
+            error=seed[2].error,
             draft=repair_seed,
             scaffold=HARD_SCAFFOLD,
         ),
     )
     if res3.ok:
+        res3.latency_saved_s = saved_s
+        res3.attempts = 3
         return body3, meta3, res3
     print(f"⚠ Failed: {res3.error}")
 
-    quote_seed = body3 if count_concrete_signals(body3) >= count_concrete_signals(repair_seed) else repair_seed
-    body4, meta4, res4 = attempt(
+    if count_concrete_signals(body3) >= count_concrete_signals(repair_seed):
+        quote_seed = (body3, meta3, res3)
+    else:
+        quote_seed = seed
+    body4, meta4, res4 = repair_attempt(
         syn,
         profile,
         "attempt4_quote_repair",
-        QUOTE_REPAIR_PROMPT.format(draft=quote_seed),
+        quote_seed,
+        QUOTE_REPAIR_PROMPT.format(draft=quote_seed[0]),
     )
+    res4.latency_saved_s = saved_s
+    res4.attempts = 4
     if res4.ok:
         return body4, meta4, res4
     print(f"⚠ Failed: {res4.error}")
@@ -1316,6 +1791,207 @@ def generate(syn: Synapse, topic: str) -> Tuple[str, Dict[str, Any], ValidationR
     return body4, meta4, res4
 
 
+# ------------------------------------------------------------------------------
+# EMISSION
+# ------------------------------------------------------------------------------
+def emit_artifact(
+    orch: VSEncOrchestrator,
+    body: str,
+    meta: Dict[str, Any],
+    result: ValidationResult,
+    filename: Optional[str] = None,
+) -> Path:
+    summary = "Scholarly synthesis generated."
+    longform_summary = "See full analysis."
+    status = "active"
+    priority = "medium"
+
+    if result.distinct_citations < TARGET_CITATIONS:
+        summary = (
+            f"Scholarly synthesis generated with limited evidentiary support "
+            f"({result.distinct_citations} distinct citation(s))."
+        )
+        longform_summary = (
+            "Artifact passed hard validation and minimum citation integrity, "
+            "but citation density remains below target."
+        )
+        status = "draft"
+        priority = "medium"
+
+    custom_params = {
+        "title": meta["title"],
+        "relative_dir": ARTIFACT_DIR,
+        "summary": summary,
+        "longform_summary": longform_summary,
+        "category": "research",
+        "style": "AlgorithmicGriot",
+        "status": status,
+        "priority": priority,
+        "tags": meta["tags"],
+        "key_themes": meta["key_themes"],
+        "bias_analysis": meta["bias_analysis"],
+        "grok_ctx_reflection": meta["grok_ctx_reflection"],
+        "quotes": meta["quotes"],
+        "adinkra": meta["adinkra"],
+    }
+    if filename:
+        custom_params["filename"] = filename
+
+    payload = orch.run(
+        agent_name="SCHOLARLY_STUB",
+        input_text=body,
+        invocation_type="scholarly_dive",
+        custom_params=custom_params,
+    )
+    orch.emit_to_vault(payload)
+    return payload["full_save_path"]
+
+
+# ------------------------------------------------------------------------------
+# BATCH QUEUE
+# ------------------------------------------------------------------------------
+def read_topics(path: Path) -> List[str]:
+    """One topic per line; blank lines and # comments are skipped."""
+    topics: List[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and line not in topics:
+            topics.append(line)
+    return topics
+
+
+def batch_filename(topic: str) -> str:
+    """Deterministic per topic, so a resumed run finds its own artifacts."""
+    safe_topic = re.sub(r"[^a-zA-Z0-9]+", "_", topic).strip("_").lower()[:60] or "topic"
+    digest = hashlib.sha1(topic.encode("utf-8")).hexdigest()[:8]
+    return f"scholarly_{safe_topic}_{digest}.md"
+
+
+class BatchCheckpoint:
+    """
+    Per-topic status in a JSON file, rewritten atomically on every change:
+    {"topics": {topic: {"status", "attempts", "artifact", "error", "updated"}}}
+    status: pending | running | ok | failed
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.topics: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            self.topics = json.loads(path.read_text(encoding="utf-8")).get("topics", {})
+
+    def entry(self, topic: str) -> Dict[str, Any]:
+        return self.topics.setdefault(
+            topic, {"status": "pending", "attempts": 0, "artifact": None, "error": ""}
+        )
+
+    def update(self, topic: str, **fields: Any) -> None:
+        with self._lock:
+            self.entry(topic).update(fields, updated=now_la().isoformat(timespec="seconds"))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(
+                json.dumps({"topics": self.topics}, indent=2, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+
+    def is_done(self, topic: str) -> bool:
+        entry = self.topics.get(topic)
+        if not entry or entry.get("status") != "ok":
+            return False
+        # A completed topic whose artifact vanished is regenerated.
+        artifact = entry.get("artifact")
+        return bool(artifact) and Path(artifact).exists()
+
+
+def process_topic(
+    syn: Synapse,
+    orch: VSEncOrchestrator,
+    checkpoint: BatchCheckpoint,
+    topic: str,
+) -> str:
+    checkpoint.update(topic, status="running")
+    try:
+        body, meta, result = generate(syn, topic)
+    except Exception as e:
+        checkpoint.update(topic, status="failed", error=f"{type(e).__name__}: {e}"[:300])
+        return "failed"
+
+    attempts = checkpoint.entry(topic).get("attempts", 0) + result.attempts
+    if not result.ok:
+        checkpoint.update(topic, status="failed", attempts=attempts, error=result.error)
+        return "failed"
+
+    try:
+        artifact = emit_artifact(orch, body, meta, result, filename=batch_filename(topic))
+    except Exception as e:
+        # A failed emission must not abort the batch or leave the topic "running".
+        checkpoint.update(
+            topic, status="failed", attempts=attempts, error=f"{type(e).__name__}: {e}"[:300]
+        )
+        return "failed"
+    checkpoint.update(
+        topic, status="ok", attempts=attempts, artifact=str(artifact), error=""
+    )
+    return "ok"
+
+
+def run_batch(
+    topics_path: Path,
+    workers: int = 2,
+    checkpoint_path: Optional[Path] = None,
+    retry_failed: bool = False,
+) -> Dict[str, int]:
+    """
+    Non-interactive queue: every topic in topics_path runs through a pool of
+    `workers` threads sharing one Synapse. Completed topics (status ok with
+    the artifact on disk) are skipped, so rerunning after a crash resumes.
+    Failed topics are retried only with retry_failed.
+    """
+    print(BANNER)
+    topics = read_topics(topics_path)
+    checkpoint = BatchCheckpoint(
+        checkpoint_path or topics_path.with_suffix(".checkpoint.json")
+    )
+
+    queue: List[str] = []
+    for topic in topics:
+        entry = checkpoint.entry(topic)
+        if checkpoint.is_done(topic):
+            continue
+        if entry["status"] == "failed" and not retry_failed:
+            continue
+        queue.append(topic)
+    print(
+        f"✶ Batch: {len(topics)} topic(s), {len(topics) - len(queue)} skipped, "
+        f"{len(queue)} queued @ {workers} worker(s)"
+    )
+    counts = {"ok": 0, "failed": 0, "skipped": len(topics) - len(queue)}
+    if not queue:
+        return counts
+
+    ensure_debug_dir()
+    syn = Synapse()
+    orch = VSEncOrchestrator({"SCHOLARLY_STUB": StubAgent()})
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="scholarly-batch") as pool:
+        futures = {pool.submit(process_topic, syn, orch, checkpoint, t): t for t in queue}
+        for future in as_completed(futures):
+            outcome = future.result()
+            counts[outcome] += 1
+            entry = checkpoint.entry(futures[future])
+            mark = "✓" if outcome == "ok" else "❌"
+            print(f"{mark} [{outcome}] {futures[future]} (attempts: {entry['attempts']})")
+
+    print(
+        f"✶ Batch complete: {counts['ok']} ok, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped — checkpoint {checkpoint.path}"
+    )
+    return counts
+
+
 # ------------------------------------------------------------------------------
 # ENTRYPOINT
 # ------------------------------------------------------------------------------
@@ -1345,48 +2021,23 @@ def run() -> None:
     for warning in dedupe(result.warnings):
         print(f"⚠ Warning: {warning}")
 
-    summary = "Scholarly synthesis generated."
-    longform_summary = "See full analysis."
-    status = "active"
-    priority = "medium"
+    emit_artifact(orch, body, meta, result)
+    print("✓ Emitted")
 
-    if result.distinct_citations < TARGET_CITATIONS:
-        summary = (
-            f"Scholarly synthesis generated with limited evidentiary support "
-            f"({result.distinct_citations} distinct citation(s))."
-        )
-        longform_summary = (
-            "Artifact passed hard validation and minimum citation integrity, "
-            "but citation density remains below target."
-        )
-        status = "draft"
-        priority = "medium"
 
-    payload = orch.run(
-        agent_name="SCHOLARLY_STUB",
-        input_text=body,
-        invocation_type="scholarly_dive",
-        custom_params={
-            "title": meta["title"],
-            "relative_dir": ARTIFACT_DIR,
-            "summary": summary,
-            "longform_summary": longform_summary,
-            "category": "research",
-            "style": "AlgorithmicGriot",
-            "status": status,
-            "priority": priority,
-            "tags": meta["tags"],
-            "key_themes": meta["key_themes"],
-            "bias_analysis": meta["bias_analysis"],
-            "grok_ctx_reflection": meta["grok_ctx_reflection"],
-            "quotes": meta["quotes"],
-            "adinkra": meta["adinkra"],
-        },
-    )
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scholarly Dive synthesis engine")
+    parser.add_argument("--batch", type=Path, help="Topics file, one topic per line")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--checkpoint", type=Path, help="Defaults to <topics>.checkpoint.json")
+    parser.add_argument("--retry-failed", action="store_true")
+    args = parser.parse_args()
 
-    orch.emit_to_vault(payload)
-    print("✓ Emitted")
+    if args.batch:
+        run_batch(args.batch, args.workers, args.checkpoint, args.retry_failed)
+    else:
+        run()
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    main()
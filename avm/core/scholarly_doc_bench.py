@@ -0,0 +1,228 @@
+# ==============================================================================
+# ✶⌁✶ scholarly_doc_bench.py — THE SCHOLARLY PARSE STOPWATCH v1.1.0
+# ==============================================================================
+# ROLE: Replays saved scholarly_dive drafts through extract_metadata ->
+#       cleanup_pipeline -> validate and times the post-processing.
+# CORPUS: *_raw.txt receipts in scholarly_dive.DEBUG_DIR (or --corpus DIR),
+#         loose or inside debug bundles; with no drafts on disk,
+#         --synthetic N generates scaffold-shaped drafts.
+# MODES:
+#   shared   parse_document() memoized (one parse per distinct draft text)
+#   reparse  memo bypassed, every helper re-parses (isolates the cache win)
+#   baseline --baseline FILE, another scholarly_dive.py, e.g. the pre-v3.12
+#            copy from `git show <rev>:avm/core/scholarly_dive.py > old.py`
+# Rounds alternate between modes. Every mode must produce identical
+# body/meta/validation or the run fails.
+# ==============================================================================
+
+import argparse
+import importlib.util
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import scholarly_dive  # noqa: E402
+from debug_bundle import find_bundles, iter_entries  # noqa: E402
+
+Draft = Tuple[str, str]  # (topic, raw model output)
+
+
+# ------------------------------------------------------------------------------
+# CORPUS
+# ------------------------------------------------------------------------------
+def topic_from_debug_name(name: str) -> str:
+    # debug_path(): {stamp}__{safe_topic}__{label}.txt
+    parts = Path(name).stem.split("__")
+    return parts[1].replace("_", " ") if len(parts) >= 3 else Path(name).stem
+
+
+def load_corpus(corpus_dir: Path) -> List[Draft]:
+    if not corpus_dir.exists():
+        return []
+    drafts = [
+        (topic_from_debug_name(path.name), path.read_text(encoding="utf-8", errors="replace"))
+        for path in sorted(corpus_dir.glob("*_raw.txt"))
+    ]
+    for bundle in find_bundles(corpus_dir):
+        for entry, content in iter_entries(bundle, "*_raw.txt"):
+            drafts.append((topic_from_debug_name(entry["name"]), content))
+    return drafts
+
+
+SYNTHETIC_TOPICS = [
+    "The Freedmen's Bureau and Reconstruction labor contracts 1865",
+    "Marcus Garvey and the UNIA shipping enterprise",
+    "Plessy v. Ferguson and the politics of segregated transit",
+    "Ida B. Wells anti-lynching pamphlets 1892",
+]
+
+FILLER = (
+    "Historians such as Eric Foner read the record as contested ground",
+    "Archival letters from 1866 show agents negotiating wages on page 42",
+    "The Bureau relied on local planters, which limited enforcement",
+    "Newspapers framed the dispute as a question of order rather than rights",
+    "In March 1867 the commissioner issued a circular on contract terms",
+    "Scholars disagree over whether the agency advanced or contained freedpeople",
+    "Court records in Plessy v. Ferguson echo the language of these contracts",
+)
+
+
+def synthetic_draft(rng: random.Random, topic: str) -> str:
+    cite = 0
+    parts: List[str] = []
+    sections = [h for h in scholarly_dive.HARD_SCAFFOLD.split("\n") if h.startswith("#") and "BIBLIOGRAPHY" not in h]
+    if rng.random() < 0.2:
+        sections.pop(rng.randrange(len(sections)))  # exercise repair_structure
+    for header in sections:
+        parts.append(header)
+        if header.startswith("## ") or header in ("# Abstract",):
+            for _ in range(rng.randint(1, 3)):
+                sentences = []
+                for _ in range(rng.randint(2, 5)):
+                    sentence = rng.choice(FILLER) + "."
+                    if rng.random() < 0.5:
+                        cite = cite + 1 if rng.random() < 0.6 or cite == 0 else cite
+                        sentence += f"[^{cite}]"
+                    sentences.append(sentence)
+                parts.append("\n".join(sentences) if rng.random() < 0.3 else " ".join(sentences))
+    parts.append(scholarly_dive.BIB_HEADER)
+    for n in range(1, cite + 1 + rng.randint(-1, 2)):
+        if n > 0:
+            parts.append(f"[^{n}]: Author {n}. *Title {n}*. Press, 18{60 + n % 40}.")
+    meta = {
+        "title": topic,
+        "tags": ["history", "reconstruction"],
+        "key_themes": ["labor", "contracts"],
+        "quotes": ['"The contract was the new chain." — circular, 1866'],
+        "adinkra": ["Sankofa"],
+    }
+    parts.append("### METADATA\n" + json.dumps(meta, indent=2))
+    return "\n\n".join(parts)
+
+
+# ------------------------------------------------------------------------------
+# REPLAY
+# ------------------------------------------------------------------------------
+def load_module(path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("scholarly_dive_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations through it
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def process(module: ModuleType, topic: str, raw: str) -> str:
+    profile = module.make_topic_profile(topic)
+    body, meta, meta_warnings = module.extract_metadata(raw)
+    body, meta, warnings = module.cleanup_pipeline(profile.raw_topic, body, meta)
+    result = module.validate(body, meta, profile)
+    result.warnings = module.dedupe(meta_warnings + warnings + result.warnings)
+    return json.dumps([body, meta, module.serialize_validation(result)], ensure_ascii=False)
+
+
+@dataclass
+class Mode:
+    name: str
+    module: ModuleType
+    before_each: Callable[[], None] = lambda: None
+    enter: Callable[[], None] = lambda: None
+    exit: Callable[[], None] = lambda: None
+    samples: List[List[float]] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+
+
+def time_modes(modes: List[Mode], drafts: List[Draft], rounds: int) -> None:
+    """
+    Rounds alternate between modes so drift in machine load or clock speed
+    lands on every mode alike; each mode keeps its per-draft samples and its
+    first-round outputs.
+    """
+    for mode in modes:
+        mode.samples = [[] for _ in drafts]
+    for round_number in range(rounds):
+        for mode in modes:
+            mode.enter()
+            try:
+                for i, (topic, raw) in enumerate(drafts):
+                    mode.before_each()
+                    started = time.perf_counter()
+                    out = process(mode.module, topic, raw)
+                    mode.samples[i].append((time.perf_counter() - started) * 1000)
+                    if round_number == 0:
+                        mode.outputs.append(out)
+            finally:
+                mode.exit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark scholarly_dive cleanup + validate")
+    parser.add_argument("--corpus", type=Path, default=scholarly_dive.DEBUG_DIR)
+    parser.add_argument("--synthetic", type=int, default=0, help="generated drafts when the corpus is empty")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, help="older scholarly_dive.py to compare against")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    drafts = load_corpus(args.corpus)
+    if not drafts:
+        rng = random.Random(args.seed)
+        count = args.synthetic or 40
+        for _ in range(count):
+            topic = rng.choice(SYNTHETIC_TOPICS)
+            drafts.append((topic, synthetic_draft(rng, topic)))
+        print(f"✶ No saved drafts in {args.corpus}; replaying {count} synthetic drafts.")
+    else:
+        print(f"✶ Replaying {len(drafts)} saved drafts from {args.corpus}")
+
+    memoized = scholarly_dive.parse_document
+
+    def reparse(text: str) -> "scholarly_dive.DocumentModel":
+        return scholarly_dive.DocumentModel(text)
+
+    def use(parse: Callable[[str], "scholarly_dive.DocumentModel"]) -> Callable[[], None]:
+        return lambda: setattr(scholarly_dive, "parse_document", parse)
+
+    modes = [
+        Mode("shared", scholarly_dive, before_each=memoized.cache_clear),
+        Mode("reparse", scholarly_dive, enter=use(reparse), exit=use(memoized)),
+    ]
+    if args.baseline:
+        modes.append(Mode("baseline", load_module(args.baseline)))
+    time_modes(modes, drafts, args.rounds)
+
+    reference = modes[0].outputs
+    mismatched: Optional[str] = None
+    for mode in modes:
+        for i, (expected, actual) in enumerate(zip(reference, mode.outputs)):
+            if expected != actual:
+                mismatched = f"{mode.name} differs from shared on draft {i} ({drafts[i][0]})"
+                break
+
+    total_chars = sum(len(raw) for _, raw in drafts)
+    print(f"  drafts={len(drafts)} chars={total_chars} rounds={args.rounds}")
+    medians = {mode.name: [statistics.median(s) for s in mode.samples] for mode in modes}
+    shared_total = sum(medians["shared"])
+    for name, timings in medians.items():
+        total = sum(timings)
+        speedup = total / shared_total if shared_total else 0.0
+        print(
+            f"  {name:<8} total={total:8.1f}ms  per_draft_p50={statistics.median(timings):6.2f}ms"
+            f"  max={max(timings):6.2f}ms  vs_shared={speedup:4.2f}x"
+        )
+
+    if mismatched:
+        print(f"❌ Output mismatch: {mismatched}")
+        sys.exit(1)
+    print("✓ All modes produced identical body/meta/validation.")
+
+
+if __name__ == "__main__":
+    main()
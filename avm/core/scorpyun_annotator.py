@@ -1,24 +1,33 @@
 # ==============================================================================
-# ✶⌁✶ scorpyun_annotator.py — THE ANNOTATION EMITTER v2.1.8 [HARDENED]
+# ✶⌁✶ scorpyun_annotator.py — THE ANNOTATION EMITTER v2.2.0 [HARDENED]
 # ==============================================================================
 # ROLE: Lean annotation client with fail-fast guards and descriptive naming.
+# MODES:
+#   python scorpyun_annotator.py                      # one pasted excerpt
+#   python scorpyun_annotator.py --highlights book.jsonl --title T --author A
+#     Streams a highlights export (JSONL / CSV / markdown), annotates excerpts
+#     on a bounded worker pool sharing one client + protocol, skips excerpts
+#     whose hash is already in the annotation ledger, and emits everything
+#     through one VS-ENC orchestrator.
 # COMPLIANCE: WC-DIR-2026-01-11-ENV-HARDENING / SENTINEL-V2.0.0-ALIGN
 # ==============================================================================
 
+import argparse
+import csv
+import hashlib
+import json
 import os
-import sys
 import re
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Set
 
 # Standard AVM WatsonX/Kernel imports
 from watsonx_client import WatsonXClient
 from vs_enc import VSEncOrchestrator
-
-# FAIL-FAST GUARD: Authority of the Execution Layer
-if not os.getenv("WATSONX_PROJECT_ID"):
-    print("❌ ERROR: WATSONX_PROJECT_ID not found in environment.")
-    sys.exit(1)
+from protocol_bundle import read_styles
 
 # PATH CONFIGURATION
 VAULT_ROOT = Path("C:/Users/digitalscorpyun/sankofa_temple/Anacostia")
@@ -26,6 +35,12 @@ ARTIFACT_DIR = "war_council/_artifacts/scorpyun_annotator"
 STYLE_GUIDE_PATH = (
     VAULT_ROOT / "war_council/documentation/writing_protocols/summary_styles_guide.md"
 )
+ANNOTATION_LEDGER = Path(
+    os.getenv(
+        "SCORPYUN_LEDGER",
+        str(VAULT_ROOT / ARTIFACT_DIR / "_annotation_ledger.jsonl"),
+    )
+)
 PST = timezone(timedelta(hours=-8))
 
 # JURISDICTIONAL BOUNDARIES
@@ -50,9 +65,16 @@ def normalize_token(text: str) -> str:
 
 
 class AnnotationSynapse:
-    def __init__(self, protocol_text: str, source_context: dict):
-        self.client = WatsonXClient()
-        self.client.set_agent("QWEN-ECHO")
+    def __init__(
+        self,
+        protocol_text: str,
+        source_context: dict,
+        client: Optional[WatsonXClient] = None,
+    ):
+        if client is None:
+            client = WatsonXClient(caller="scorpyun_annotator")
+            client.set_agent("QWEN-ECHO")
+        self.client = client
         self.protocol_text = protocol_text
         self.ctx = source_context
 
@@ -69,7 +91,7 @@ class AnnotationSynapse:
         DO NOT return Raw Metadata.
         OUTPUT FORMAT: Provide only the distilled analysis defined by SankofaCut.
         """
-        return self.client.ask(prompt)
+        return self.client.ask(prompt, label="sankofacut")
 
 
 class StubAgent:
@@ -80,22 +102,38 @@ class StubAgent:
 def get_sankofacut_protocol() -> str:
     if not STYLE_GUIDE_PATH.exists():
         raise FileNotFoundError(f"Protocol Source missing at {STYLE_GUIDE_PATH}")
-    with open(STYLE_GUIDE_PATH, "r", encoding="utf-8") as f:
-        content = f.read()
-    pattern = re.compile(
-        r"#\s*.*?\d+\.\s*\*\*(.*?)\*\*\n(.*?)(?=\n#\s*.*?\d+\.\s*\*\*|$)", re.DOTALL
-    )
-    for match in pattern.finditer(content):
-        name = (
-            match.group(1).split("—")[0].strip().replace("*", "").split("(")[0].strip()
-        )
-        if name == "SankofaCut":
-            return match.group(2).strip()
-    raise ValueError("SankofaCut protocol not found.")
+    protocol = read_styles(STYLE_GUIDE_PATH).get("SankofaCut")
+    if protocol is None:
+        raise ValueError("SankofaCut protocol not found.")
+    return protocol
+
+
+def annotation_params(title: str, author: str, location: str, filename: str) -> dict:
+    return {
+        "filename": filename,
+        "title": f"{title} Annotation — {location}",
+        "category": "annotations",
+        "style": "SankofaCut",
+        "relative_dir": ARTIFACT_DIR,
+        "status": "active",
+        "priority": "medium",
+        "tags": [
+            "annotation",
+            "sankofa_cut",
+            "vault_lit",
+            normalize_token(author),
+        ],
+        "synapses": SAFE_SYNAPSES,
+        "key_themes": ["symbolism", "resistance", "power_codes"],
+        "summary": f"SankofaCut annotation of {title} ({location}) by {author}.",
+        "ctx_grok_reflection": "Interpretive literary analysis node.",
+        "adinkra": ["fawohodie", "mate_masie"],
+        "linked_notes": ["war_council/sankofa_spine.md"],
+    }
 
 
 def run_annotator():
-    print("\n🜃 SCORPYUN ANNOTATOR v2.1.8 [HARDENED] ONLINE")
+    print("\n🜃 SCORPYUN ANNOTATOR v2.2.0 [HARDENED] ONLINE")
     excerpt = input("Paste excerpt: ").strip()
     title = input("Title: ").strip()
     author = input("Author: ").strip()
@@ -125,27 +163,7 @@ def run_annotator():
             agent_name="ANNOTATOR_STUB",
             input_text=processed_content,
             invocation_type="annotation_emit",
-            custom_params={
-                "filename": filename,
-                "title": f"{title} Annotation — {location}",
-                "category": "annotations",
-                "style": "SankofaCut",
-                "relative_dir": ARTIFACT_DIR,
-                "status": "active",
-                "priority": "medium",
-                "tags": [
-                    "annotation",
-                    "sankofa_cut",
-                    "vault_lit",
-                    normalize_token(author),
-                ],
-                "synapses": SAFE_SYNAPSES,
-                "key_themes": ["symbolism", "resistance", "power_codes"],
-                "summary": f"SankofaCut annotation of {title} ({location}) by {author}.",
-                "ctx_grok_reflection": "Interpretive literary analysis node.",
-                "adinkra": ["fawohodie", "mate_masie"],
-                "linked_notes": ["war_council/sankofa_spine.md"],
-            },
+            custom_params=annotation_params(title, author, location, filename),
         )
         orchestrator.emit_to_vault(payload)
         print(f"\n✓ ARTIFACT EMITTED: {filename}")
@@ -154,6 +172,255 @@ def run_annotator():
         print(f"❌ EMISSION FAILED: {e}")
 
 
-if __name__ == "__main__":
-    run_annotator()
+# ------------------------------------------------------------------------------
+# HIGHLIGHTS INGESTION
+# ------------------------------------------------------------------------------
+@dataclass
+class Highlight:
+    excerpt: str
+    title: str
+    author: str
+    location: str
+
+    @property
+    def digest(self) -> str:
+        """Whitespace-insensitive excerpt hash; the dedupe key."""
+        normalized = " ".join(self.excerpt.split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+# Column / key aliases seen in Kindle, Readwise and hand-rolled exports.
+EXCERPT_KEYS = ("excerpt", "highlight", "text", "quote")
+TITLE_KEYS = ("title", "book title", "book")
+AUTHOR_KEYS = ("author", "book author")
+LOCATION_KEYS = ("location", "chapter", "section", "page")
+
+MD_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*$")
+MD_BULLET_RE = re.compile(r"^\s*[-*+]\s+(.*)$")
+
+
+def _first(row: Dict[str, str], keys, default: str = "") -> str:
+    for key in keys:
+        value = row.get(key)
+        if value:
+            return value
+    return default
+
+
+def _highlights_from_rows(rows, defaults: Dict[str, str]) -> Iterator[Highlight]:
+    for row in rows:
+        row = {str(k).strip().lower(): str(v or "").strip() for k, v in row.items()}
+        excerpt = _first(row, EXCERPT_KEYS)
+        if excerpt:
+            yield Highlight(
+                excerpt,
+                _first(row, TITLE_KEYS, defaults["title"]),
+                _first(row, AUTHOR_KEYS, defaults["author"]),
+                _first(row, LOCATION_KEYS, defaults["location"]),
+            )
+
+
+def _jsonl_rows(f) -> Iterator[dict]:
+    for n, line in enumerate(f, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"⚠️ Highlights line {n} skipped: {e}")
+
+
+def _markdown_highlights(f, defaults: Dict[str, str]) -> Iterator[Highlight]:
+    """
+    "# Title" sets the title (unless --title was given), "## Chapter" or
+    deeper the location; each blockquote run or bullet line is one excerpt.
+    """
+    title, location = defaults["title"], defaults["location"]
+    quote: List[str] = []
+
+    def flush() -> Iterator[Highlight]:
+        if quote:
+            yield Highlight(" ".join(quote), title, defaults["author"], location)
+            quote.clear()
+
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line.lstrip().startswith(">"):
+            text = line.lstrip()[1:].strip()
+            if text:
+                quote.append(text)
+            continue
+        yield from flush()
+        heading = MD_HEADING_RE.match(line)
+        if heading:
+            if len(heading.group(1)) > 1:
+                location = heading.group(2)
+            elif not defaults["title"]:
+                title = heading.group(2)
+            continue
+        bullet = MD_BULLET_RE.match(line)
+        if bullet and bullet.group(1).strip():
+            yield Highlight(bullet.group(1).strip(), title, defaults["author"], location)
+    yield from flush()
+
 
+def stream_highlights(
+    path: Path, title: str = "", author: str = "", location: str = ""
+) -> Iterator[Highlight]:
+    """Lazily yields highlights; the format follows the file suffix."""
+    defaults = {"title": title, "author": author, "location": location}
+    suffix = path.suffix.lower()
+    if suffix not in (".jsonl", ".ndjson", ".csv", ".md", ".markdown", ".txt"):
+        raise ValueError(f"Unsupported highlights format: {path.suffix}")
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if suffix in (".jsonl", ".ndjson"):
+            yield from _highlights_from_rows(_jsonl_rows(f), defaults)
+        elif suffix == ".csv":
+            yield from _highlights_from_rows(csv.DictReader(f), defaults)
+        else:
+            yield from _markdown_highlights(f, defaults)
+
+
+def load_annotated_digests(ledger_path: Path) -> Set[str]:
+    digests: Set[str] = set()
+    if ledger_path.exists():
+        with open(ledger_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    digests.add(json.loads(line)["sha256"])
+                except (json.JSONDecodeError, KeyError):
+                    continue
+    return digests
+
+
+def highlight_filename(highlight: Highlight) -> str:
+    """Keyed by the excerpt hash, so concurrent emissions never collide."""
+    return (
+        f"annotation_{normalize_token(highlight.title)[:60]}_"
+        f"{normalize_token(highlight.location)[:40]}_{highlight.digest[:8]}.md"
+    )
+
+
+def run_highlights(
+    path: Path,
+    title: str = "",
+    author: str = "",
+    location: str = "",
+    workers: int = 4,
+    ledger_path: Path = ANNOTATION_LEDGER,
+) -> Dict[str, int]:
+    """
+    Annotates every new excerpt in a highlights export. At most 2 * workers
+    excerpts are in flight, so large exports stream instead of loading whole.
+    Generation runs on the pool and payloads are built on this thread; the
+    VS-ENC write-behind emitter writes the artifacts and appends each ledger
+    line once its artifact is on disk.
+    """
+    print("\n🜃 SCORPYUN ANNOTATOR v2.2.0 [HARDENED] — HIGHLIGHTS MODE")
+    protocol = get_sankofacut_protocol()
+    client = WatsonXClient(caller="scorpyun_annotator")
+    client.set_agent("QWEN-ECHO")
+    orchestrator = VSEncOrchestrator({"ANNOTATOR_STUB": StubAgent()}, write_behind=True)
+    seen = load_annotated_digests(ledger_path)
+    counts = {"emitted": 0, "failed": 0, "skipped": 0}
+    print(f"✶ Ledger: {len(seen)} excerpt(s) already annotated ({ledger_path})")
+
+    def annotate(highlight: Highlight) -> str:
+        ctx = {
+            "title": highlight.title,
+            "author": highlight.author,
+            "location": highlight.location,
+        }
+        return AnnotationSynapse(protocol, ctx, client=client).ask(highlight.excerpt)
+
+    def record(highlight: Highlight, filename: str) -> None:
+        # Runs on the emitter thread once the artifact is on disk, so a crash
+        # never leaves a ledger entry without its file.
+        ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(ledger_path, "a", encoding="utf-8") as f:
+            entry = {
+                "sha256": highlight.digest,
+                "filename": filename,
+                "title": highlight.title,
+                "location": highlight.location,
+                "ts": datetime.now(PST).isoformat(timespec="seconds"),
+            }
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def settle(future: Future, highlight: Highlight) -> None:
+        filename = highlight_filename(highlight)
+        try:
+            payload = orchestrator.run(
+                agent_name="ANNOTATOR_STUB",
+                input_text=future.result(),
+                invocation_type="annotation_emit",
+                custom_params=annotation_params(
+                    highlight.title, highlight.author, highlight.location, filename
+                ),
+            )
+            orchestrator.emit_to_vault(
+                payload, on_written=lambda _, h=highlight, n=filename: record(h, n)
+            )
+        except Exception as e:
+            counts["failed"] += 1
+            print(f"❌ [{highlight.digest[:8]}] {highlight.title} ({highlight.location}): {e}")
+            return
+        counts["emitted"] += 1
+        print(f"✶ [{highlight.digest[:8]}] queued {filename}")
+
+    max_in_flight = max(1, workers) * 2
+    in_flight: Dict[Future, Highlight] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="annotator") as pool:
+        for highlight in stream_highlights(path, title, author, location):
+            if highlight.digest in seen:
+                counts["skipped"] += 1
+                continue
+            seen.add(highlight.digest)
+            if not highlight.title:
+                counts["failed"] += 1
+                print(f"❌ [{highlight.digest[:8]}] no title; pass --title or add a title column")
+                continue
+            in_flight[pool.submit(annotate, highlight)] = highlight
+            while len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    settle(future, in_flight.pop(future))
+        for future in list(in_flight):
+            settle(future, in_flight.pop(future))
+    for save_path, error in orchestrator.flush():
+        # Queued but never written: no ledger entry, so a rerun retries it.
+        counts["emitted"] -= 1
+        counts["failed"] += 1
+        print(f"❌ {Path(save_path).name}: {error}")
+
+    print(
+        f"✶ Highlights complete: {counts['emitted']} emitted, {counts['failed']} failed, "
+        f"{counts['skipped']} already annotated"
+    )
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scorpyun SankofaCut annotator")
+    parser.add_argument("--highlights", type=Path, help="JSONL / CSV / markdown highlights export")
+    parser.add_argument("--title", default="", help="default title for rows without one")
+    parser.add_argument("--author", default="")
+    parser.add_argument("--location", default="")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ledger", type=Path, default=ANNOTATION_LEDGER)
+    args = parser.parse_args()
+
+    if not args.highlights:
+        run_annotator()
+        return
+    try:
+        run_highlights(
+            args.highlights, args.title, args.author, args.location, args.workers, args.ledger
+        )
+    except KeyboardInterrupt:
+        print("\n⚠️ ANNOTATOR ABORTED: user interrupted execution.")
+    except Exception as e:
+        print(f"❌ HIGHLIGHTS RUN FAILED: {e}")
+
+
+if __name__ == "__main__":
+    main()
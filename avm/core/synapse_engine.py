@@ -1,12 +1,27 @@
 """
 Synapse Engine — AVM Syndicate
 Routes all synaptic execution through the VS-ENC orchestrator.
+
+Single synapse:  python synapse_engine.py --run path/to/synapse.yaml
+Synapse DAG:     python synapse_engine.py --dag path/to/synapses/ [--workers 4]
+                 (a directory of synapse YAMLs, or a manifest listing them
+                 under `synapses:`). A synapse whose input is another
+                 synapse's writeback runs after it; independent synapses run
+                 in parallel. Nodes whose input hash and synapse config match
+                 the last successful run are skipped (--force reruns all).
 """
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import yaml
 
 from path_resolver import resolve
@@ -37,12 +52,52 @@ INVOCATION_LAW_PATH = (
     r"\vs_enc_invocation_law.yaml"
 )
 
+DAG_STATE_FILE = ".synapse_state.json"
+DAG_REPORT_FILE = "synapse_run_report.json"
+
 
 # -------------------------------------------------------------------
 # 3. Synapse execution
 # -------------------------------------------------------------------
-def run_synapse(yaml_path: str) -> None:
-    """Load a synapse YAML file and execute it through VS-ENC."""
+@dataclass
+class SynapseSpec:
+    name: str
+    yaml_path: str
+    agent_name: str
+    invocation_type: str
+    input_path: str
+    output_path: str
+    output_shape: str
+    config: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def config_hash(self) -> str:
+        canonical = json.dumps(self.config, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def load_synapse(yaml_path: str) -> SynapseSpec:
+    if not os.path.exists(yaml_path):
+        raise FileNotFoundError(f"Synapse YAML not found: {yaml_path}")
+
+    with open(yaml_path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    syn = config.get("synapse", {})
+    return SynapseSpec(
+        name=syn.get("name") or os.path.splitext(os.path.basename(yaml_path))[0],
+        yaml_path=yaml_path,
+        agent_name=syn.get("agent"),
+        invocation_type=syn.get("invocation_type"),
+        input_path=resolve(syn.get("input")),
+        output_path=resolve(syn.get("writeback")),
+        output_shape=syn.get("output_shape", "raw"),
+        config=syn,
+    )
+
+
+def build_orchestrator() -> Tuple[Any, Dict[str, Any]]:
+    """Orchestrator WITH Invocation Law, plus its agent registry."""
 
     # Ensure paths are set before importing internal modules
     _bootstrap_path()
@@ -56,61 +111,313 @@ def run_synapse(yaml_path: str) -> None:
         "ctx_grok_proto": CTXGrokProto(),
     }
 
-    # Instantiate orchestrator WITH Invocation Law
     orchestrator = VSEncOrchestrator(
         agent_registry,
         law_path=INVOCATION_LAW_PATH,
     )
+    return orchestrator, agent_registry
 
-    if not os.path.exists(yaml_path):
-        raise FileNotFoundError(f"Synapse YAML not found: {yaml_path}")
-
-    with open(yaml_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-
-    syn = config.get("synapse", {})
-    agent_name = syn.get("agent")
-    invocation_type = syn.get("invocation_type")
-    input_path = resolve(syn.get("input"))
-    output_path = resolve(syn.get("writeback"))
-    output_shape = syn.get("output_shape", "raw")
 
-    if agent_name not in agent_registry:
-        raise ValueError(f"Agent not found: {agent_name}")
+def execute_synapse(spec: SynapseSpec, orchestrator: Any, agent_registry: Dict[str, Any]) -> None:
+    if spec.agent_name not in agent_registry:
+        raise ValueError(f"Agent not found: {spec.agent_name}")
 
-    if not os.path.exists(input_path):
-        raise FileNotFoundError(f"Input note not found: {input_path}")
+    if not os.path.exists(spec.input_path):
+        raise FileNotFoundError(f"Input note not found: {spec.input_path}")
 
-    with open(input_path, "r", encoding="utf-8") as f:
+    with open(spec.input_path, "r", encoding="utf-8") as f:
         text = f.read()
 
     # Execute via VS-ENC with Invocation Law + Tone
     result = orchestrator.run(
-        agent_name=agent_name,
-        text=text,
-        output_shape=output_shape,
-        invocation_type=invocation_type,
+        agent_name=spec.agent_name,
+        input_text=text,
+        invocation_type=spec.invocation_type,
+        custom_params={
+            "title": f"Synapse — {spec.name}",
+            "output_shape": spec.output_shape,
+        },
     )
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    os.makedirs(os.path.dirname(spec.output_path), exist_ok=True)
+
+    # Temp + rename: a dependent synapse never reads a half-written writeback.
+    tmp_path = f"{spec.output_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, default=str)  # full_save_path is a Path
+    os.replace(tmp_path, spec.output_path)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2)
+
+def run_synapse(yaml_path: str) -> None:
+    """Load a synapse YAML file and execute it through VS-ENC."""
+    orchestrator, agent_registry = build_orchestrator()
+    spec = load_synapse(yaml_path)
+    execute_synapse(spec, orchestrator, agent_registry)
 
     print("✔ Synapse complete.")
-    print(f"→ Output written to: {output_path}")
+    print(f"→ Output written to: {spec.output_path}")
+
+
+# -------------------------------------------------------------------
+# 4. Synapse DAG
+# -------------------------------------------------------------------
+@dataclass
+class NodeReport:
+    name: str
+    status: str = "pending"  # ran | skipped | failed | blocked
+    duration_s: float = 0.0
+    detail: str = ""
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def discover_synapses(path: str) -> Tuple[List[SynapseSpec], str]:
+    """
+    Synapse specs plus the directory holding DAG state. `path` is a
+    directory of synapse YAMLs or a manifest with a `synapses:` list of
+    YAML paths (relative to the manifest).
+    """
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.endswith((".yaml", ".yml"))
+        )
+        state_dir = path
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = yaml.safe_load(f) or {}
+        base = os.path.dirname(os.path.abspath(path))
+        files = [
+            entry if os.path.isabs(entry) else os.path.join(base, entry)
+            for entry in manifest.get("synapses", [])
+        ]
+        state_dir = base
+
+    specs: List[SynapseSpec] = []
+    for yaml_file in files:
+        with open(yaml_file, "r", encoding="utf-8") as f:
+            if "synapse" not in (yaml.safe_load(f) or {}):
+                continue  # a manifest or unrelated YAML living alongside
+        specs.append(load_synapse(yaml_file))
+    return specs, state_dir
+
+
+def build_dag(specs: List[SynapseSpec]) -> Dict[str, List[str]]:
+    """node -> upstream nodes whose writeback is its input."""
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        dupes = sorted({n for n in names if names.count(n) > 1})
+        raise ValueError(f"Duplicate synapse names: {', '.join(dupes)}")
+
+    writers: Dict[str, str] = {}
+    for spec in specs:
+        key = _norm(spec.output_path)
+        if key in writers:
+            raise ValueError(
+                f"Synapses '{writers[key]}' and '{spec.name}' write the same file: {spec.output_path}"
+            )
+        writers[key] = spec.name
+
+    upstream = {
+        spec.name: [writers[_norm(spec.input_path)]]
+        if _norm(spec.input_path) in writers
+        else []
+        for spec in specs
+    }
+
+    # Kahn's algorithm: anything left unvisited sits on a cycle.
+    indegree = {name: len(deps) for name, deps in upstream.items()}
+    ready = [name for name, degree in indegree.items() if degree == 0]
+    visited = 0
+    while ready:
+        node = ready.pop()
+        visited += 1
+        for name, deps in upstream.items():
+            if node in deps:
+                indegree[name] -= 1
+                if indegree[name] == 0:
+                    ready.append(name)
+    if visited != len(upstream):
+        cyclic = sorted(name for name, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Synapse dependency cycle among: {', '.join(cyclic)}")
+    return upstream
+
+
+def _load_state(state_path: str) -> Dict[str, Any]:
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_json(path: str, data: Any) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_dag(
+    path: str,
+    workers: int = 4,
+    force: bool = False,
+    execute: Optional[Callable[[SynapseSpec], None]] = None,
+) -> List[NodeReport]:
+    """
+    Runs every synapse under `path` in dependency order, up to `workers` at
+    a time. A node is skipped when its input hash and config hash match the
+    last successful run and its writeback still exists. Hashes are taken
+    when the node becomes ready, so a rerun upstream invalidates it.
+    """
+    specs, state_dir = discover_synapses(path)
+    upstream = build_dag(specs)
+    by_name = {spec.name: spec for spec in specs}
+    state_path = os.path.join(state_dir, DAG_STATE_FILE)
+    state = {} if force else _load_state(state_path)
+    reports = {spec.name: NodeReport(spec.name) for spec in specs}
+
+    if execute is None:
+        # One orchestrator + agent set per worker: an agent's client keeps
+        # per-call state (last_call_stats, stream_totals) that must not race.
+        per_worker = threading.local()
+
+        def execute(spec: SynapseSpec) -> None:
+            if not hasattr(per_worker, "orchestrator"):
+                per_worker.orchestrator, per_worker.agent_registry = build_orchestrator()
+            execute_synapse(spec, per_worker.orchestrator, per_worker.agent_registry)
+
+    print(f"✶ Synapse DAG: {len(specs)} node(s) @ {workers} worker(s) from {path}")
+    started = time.perf_counter()
+
+    def timed(spec: SynapseSpec) -> float:
+        node_started = time.perf_counter()
+        execute(spec)
+        return time.perf_counter() - node_started
+
+    def fingerprint(spec: SynapseSpec) -> Optional[Dict[str, str]]:
+        if not os.path.exists(spec.input_path):
+            return None
+        return {"input_sha256": file_sha256(spec.input_path), "config_sha256": spec.config_hash}
+
+    remaining = {name: len(deps) for name, deps in upstream.items()}
+    ready = [name for name, degree in remaining.items() if degree == 0]
+    running: Dict[Any, Tuple[str, Optional[Dict[str, str]]]] = {}
+
+    def release(name: str) -> None:
+        """Marks name settled and queues dependents whose inputs are now final."""
+        for child, deps in upstream.items():
+            if name not in deps:
+                continue
+            if reports[name].status in ("failed", "blocked"):
+                reports[child].status = "blocked"
+                reports[child].detail = f"upstream {name} {reports[name].status}"
+                release(child)
+                continue
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(child)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="synapse") as pool:
+        while ready or running:
+            while ready:
+                name = ready.pop(0)
+                spec = by_name[name]
+                fp = fingerprint(spec)
+                previous = state.get(name)
+                if (
+                    fp is not None
+                    and previous is not None
+                    and {k: previous.get(k) for k in fp} == fp
+                    and os.path.exists(spec.output_path)
+                ):
+                    reports[name].status = "skipped"
+                    reports[name].detail = "input + config unchanged"
+                    release(name)
+                    continue
+                running[pool.submit(timed, spec)] = (name, fp)
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, fp = running.pop(future)
+                report = reports[name]
+                try:
+                    report.duration_s = future.result()
+                    report.status = "ran"
+                    if fp is not None:
+                        state[name] = {**fp, "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+                        _save_json(state_path, state)
+                except Exception as e:
+                    report.status = "failed"
+                    report.detail = f"{type(e).__name__}: {e}"
+                    state.pop(name, None)
+                    _save_json(state_path, state)
+                mark = "✔" if report.status == "ran" else "❌"
+                print(f"{mark} {name} [{report.status}] {report.duration_s:.2f}s {report.detail}".rstrip())
+                release(name)
+
+    ordered = [reports[spec.name] for spec in specs]
+    total_s = time.perf_counter() - started
+    _save_json(
+        os.path.join(state_dir, DAG_REPORT_FILE),
+        {
+            "path": path,
+            "total_s": round(total_s, 3),
+            "nodes": [
+                {
+                    "name": r.name,
+                    "status": r.status,
+                    "duration_s": round(r.duration_s, 3),
+                    "upstream": upstream[r.name],
+                    "detail": r.detail,
+                }
+                for r in ordered
+            ],
+        },
+    )
+
+    print("\nSYNAPSE RUN REPORT")
+    print(f"{'node':<32} {'status':<8} {'seconds':>8}  detail")
+    for r in ordered:
+        print(f"{r.name:<32} {r.status:<8} {r.duration_s:>8.2f}  {r.detail}")
+    counts = {s: sum(1 for r in ordered if r.status == s) for s in ("ran", "skipped", "failed", "blocked")}
+    print(
+        f"→ {counts['ran']} ran, {counts['skipped']} skipped, {counts['failed']} failed, "
+        f"{counts['blocked']} blocked in {total_s:.2f}s"
+    )
+    return ordered
 
 
 # -------------------------------------------------------------------
-# 4. Entrypoint
+# 5. Entrypoint
 # -------------------------------------------------------------------
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--run", type=str, default=DEFAULT_SYNAPSE)
+    parser.add_argument("--dag", type=str, help="directory or manifest of synapse YAMLs")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--force", action="store_true", help="ignore DAG state; rerun every node")
     args = parser.parse_args()
+    if args.dag:
+        reports = run_dag(args.dag, args.workers, args.force)
+        if any(r.status in ("failed", "blocked") for r in reports):
+            sys.exit(1)
+        return
     run_synapse(args.run)
 
 
 if __name__ == "__main__":
     main()
-
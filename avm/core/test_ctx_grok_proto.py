@@ -0,0 +1,63 @@
+# test_ctx_grok_proto.py — INCREMENTAL JSON DECODER + LAW GUARANTEES
+# Feeds JsonObjectDecoder the way a stream does and checks:
+#   - strings and escapes split across chunks never move the brace depth
+#   - prose braces before the object are skipped
+#   - the trailing-comma fallback still decodes
+#   - text() is cut at the closing brace; later objects are ignored
+#   - validate_guarantees reports every missing guarantee
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ctx_grok_proto import JsonObjectDecoder, validate_guarantees  # noqa: E402
+
+
+def feed_chunks(chunks):
+    decoder = JsonObjectDecoder()
+    for n, chunk in enumerate(chunks):
+        if decoder.feed(chunk):
+            return decoder, n
+    return decoder, None
+
+
+def test_strings_and_escapes_split_across_chunks():
+    raw = '{"title": "a } and { brace", "quote": "say \\"}\\" now", "path": "C:\\\\"}tail'
+    # One character per chunk splits every escape and string boundary.
+    decoder, stopped_at = feed_chunks(list(raw))
+    assert decoder.obj == {"title": "a } and { brace", "quote": 'say "}" now', "path": "C:\\"}
+    assert stopped_at == raw.index("}tail")
+    assert decoder.text() == raw[: raw.index("}tail") + 1]
+
+
+def test_prose_braces_before_object_are_skipped():
+    decoder, stopped_at = feed_chunks(["Sure {not json} here:\n```json\n", '{"a": 1}', "\n```"])
+    assert decoder.obj == {"a": 1}
+    assert stopped_at == 1
+    assert decoder.text().endswith('{"a": 1}')
+
+
+def test_trailing_comma_fallback():
+    decoder, _ = feed_chunks(['{"title": "t", "key_points": ["x", "y",],', "}"])
+    assert decoder.obj == {"title": "t", "key_points": ["x", "y"]}
+
+
+def test_first_object_wins_and_incomplete_object_does_not_stop():
+    decoder, stopped_at = feed_chunks(['{"a": {"b": 1}', ', "c": 2}{"later": true}'])
+    assert decoder.obj == {"a": {"b": 1}, "c": 2}
+    assert stopped_at == 1
+
+    pending, stopped_at = feed_chunks(['{"a": "unterminated }'])
+    assert pending.obj is None and stopped_at is None
+    assert pending.text() == '{"a": "unterminated }'
+
+
+def test_validate_guarantees():
+    law = ["must_return_json", "must_include_title", "must_include_keypoints"]
+    validate_guarantees({"Title": "t", "keyPoints": ["a"]}, law)
+    try:
+        validate_guarantees({"title": "", "summary": "s"}, law)
+    except ValueError as e:
+        assert "title" in str(e) and "keypoints" in str(e)
+    else:
+        raise AssertionError("expected a law violation")
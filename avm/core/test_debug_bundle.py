@@ -0,0 +1,124 @@
+# test_debug_bundle.py — WRITER SURVIVAL, LAYOUT + READ PATH
+# A receipt the writer cannot encode (lone surrogate) must be logged and
+# dropped without killing the background thread:
+#   - flush() returns instead of blocking forever
+#   - later receipts are still written
+#   - good receipts batched with the bad one are kept
+# Layout and readers:
+#   - queued receipts land as one manifest batch, numbered in order
+#   - identical payloads are stored once per bundle; large ones once per
+#     directory under _blobs/
+#   - a reopened bundle continues its numbering
+#   - list / extract / cat read the receipts back
+import sys
+import threading
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import debug_bundle  # noqa: E402
+from debug_bundle import (  # noqa: E402
+    SHARED_DIR_NAME,
+    DebugBundleWriter,
+    iter_entries,
+    read_manifest,
+)
+
+BIG = "protocol text " * 20
+
+
+def run_cli(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, "argv", ["debug_bundle.py", *map(str, args)])
+    debug_bundle.main()
+    return capsys.readouterr().out
+
+
+def test_bad_receipt_does_not_hang_flush(tmp_path):
+    writer = DebugBundleWriter(flush_interval_s=0.01)
+    bad_bundle = tmp_path / "bad.zip"
+    good_bundle = tmp_path / "good.zip"
+    writer.write(bad_bundle, "broken.txt", "lone surrogate \ud800")
+
+    flushed = threading.Event()
+    threading.Thread(target=lambda: (writer.flush(), flushed.set()), daemon=True).start()
+    assert flushed.wait(5), "flush() blocked after a failed receipt"
+
+    writer.write(good_bundle, "ok.txt", "still alive")
+    writer.flush()
+    writer.close()
+    assert [e["name"] for e in read_manifest(good_bundle)] == ["ok.txt"]
+
+
+def test_bad_receipt_keeps_the_rest_of_its_batch(tmp_path):
+    writer = DebugBundleWriter(flush_interval_s=0.2)
+    bundle = tmp_path / "session.zip"
+    writer.write(bundle, "before.txt", "first")
+    writer.write(bundle, "broken.txt", "lone surrogate \ud800")
+    writer.write(bundle, "bad\udc00name.txt", "fine content")
+    writer.write(bundle, "after.txt", "last")
+    writer.close()
+
+    entries = read_manifest(bundle)
+    assert [(e["seq"], e["name"]) for e in entries] == [(1, "before.txt"), (2, "after.txt")]
+    assert [text for _, text in iter_entries(bundle)] == ["first", "last"]
+
+
+def test_batching_dedupe_and_reopen(tmp_path):
+    writer = DebugBundleWriter(flush_interval_s=0.2, shared_min_chars=len(BIG))
+    first, second = tmp_path / "a.zip", tmp_path / "b.zip"
+    writer.write(first, "prompt.txt", "same")
+    writer.write(first, "prompt_retry.txt", "same")
+    writer.write(first, "protocol.txt", BIG)
+    writer.write(second, "protocol.txt", BIG)
+    writer.flush()
+
+    entries = read_manifest(first)
+    assert [e["seq"] for e in entries] == [1, 2, 3]
+    assert [e["store"] for e in entries] == ["bundle", "bundle", "shared"]
+    with zipfile.ZipFile(first) as zf:
+        names = zf.namelist()
+    assert sum(n.startswith("blobs/") for n in names) == 1
+    assert sum(n.startswith("manifest/") for n in names) == 1
+    assert len(list((tmp_path / SHARED_DIR_NAME).rglob("*.gz"))) == 1
+    assert [text for _, text in iter_entries(second)] == [BIG]
+    writer.close()
+
+    # A new writer (a resumed run) appends after the existing receipts.
+    reopened = DebugBundleWriter(flush_interval_s=0.01)
+    reopened.write(first, "pass2.txt", "same")
+    reopened.close()
+    entries = read_manifest(first)
+    assert [(e["seq"], e["name"]) for e in entries][-1] == (4, "pass2.txt")
+    with zipfile.ZipFile(first) as zf:
+        assert sum(n.startswith("blobs/") for n in zf.namelist()) == 1
+
+
+def test_cli_list_extract_cat(tmp_path, monkeypatch, capsys):
+    writer = DebugBundleWriter(flush_interval_s=0.01, shared_min_chars=len(BIG))
+    bundle = tmp_path / "session.zip"
+    writer.write(bundle, "raw_model_output_pass1.txt", "pass one")
+    writer.write(bundle, "protocol.txt", BIG)
+    writer.write(bundle, "raw_model_output_pass1.txt", "pass one, rerun")
+    writer.close()
+
+    listing = run_cli(monkeypatch, capsys, "list", tmp_path)
+    assert "session.zip  entries=3 shared=1" in listing
+    assert listing.count("raw_model_output_pass1.txt") == 2
+
+    out = tmp_path / "out"
+    extracted = run_cli(monkeypatch, capsys, "extract", bundle, "--out", out, "--match", "raw_*")
+    assert "Extracted 2 receipts" in extracted
+    assert (out / "raw_model_output_pass1.txt").read_text(encoding="utf-8") == "pass one, rerun"
+    assert not (out / "protocol.txt").exists()
+
+    assert run_cli(monkeypatch, capsys, "cat", bundle, "protocol.txt") == BIG + "\n"
+    assert run_cli(monkeypatch, capsys, "cat", bundle, "raw_model_output_pass1.txt") == (
+        "pass one, rerun\n"
+    )
+    try:
+        run_cli(monkeypatch, capsys, "cat", bundle, "missing.txt")
+    except SystemExit as e:
+        assert e.code == 1
+    else:
+        raise AssertionError("expected cat of a missing receipt to exit 1")
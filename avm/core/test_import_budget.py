@@ -0,0 +1,91 @@
+# test_import_budget.py — STARTUP REGRESSION GUARD FOR DETERMINISTIC TOOLS
+# Imports each module in a fresh interpreter under `-X importtime` with the
+# watsonx credentials stripped, then checks:
+#   - the import succeeds (no import-time credential sys.exit)
+#   - the heavy LLM stack (ibm_watsonx_ai, pytz) is never loaded
+#   - cumulative import time (best of N) stays under the module's budget
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+CORE_DIR = Path(__file__).resolve().parent
+RUNS = 3
+
+# Budgets in milliseconds (cumulative, best of RUNS). Generous enough for a
+# cold laptop, tight enough to catch an eager SDK import (~1s+).
+IMPORT_BUDGET_MS = {
+    "ctx_grok": 250,
+    "vs_enc": 200,
+    "synapse_engine": 200,
+    "qwen_echo": 300,
+    "scholarly_dive": 300,
+}
+
+FORBIDDEN_MODULES = {"ibm_watsonx_ai", "pytz"}
+DETERMINISTIC_ONLY = {
+    # ctx_grok must not even load the LLM client layer.
+    "ctx_grok": {"watsonx_client", "asyncio"},
+}
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("WATSONX_")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=CORE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise AssertionError(
+            f"import {module} failed without credentials:\n{proc.stdout}{proc.stderr}"
+        )
+
+    cumulative_us = 0
+    loaded: List[str] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        name = parts[2].rstrip()
+        loaded.append(name.strip())
+        if name == f" {module}":
+            cumulative_us = int(parts[1].strip())
+    return cumulative_us / 1000, loaded
+
+
+def run_import_budget_test() -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for module, budget_ms in IMPORT_BUDGET_MS.items():
+        best_ms = float("inf")
+        for _ in range(RUNS):
+            elapsed_ms, loaded = measure_import(module)
+            best_ms = min(best_ms, elapsed_ms)
+
+        leaked = (FORBIDDEN_MODULES | DETERMINISTIC_ONLY.get(module, set())) & {
+            name.split(".")[0] for name in loaded
+        }
+        assert not leaked, f"{module} eagerly imports {sorted(leaked)}"
+        assert best_ms <= budget_ms, (
+            f"{module} import took {best_ms:.1f}ms (budget {budget_ms}ms)"
+        )
+        results[module] = best_ms
+    return results
+
+
+def test_import_budget():
+    run_import_budget_test()
+
+
+if __name__ == "__main__":
+    print("✶⌁✶ INITIATING IMPORT BUDGET TEST")
+    try:
+        for name, ms in run_import_budget_test().items():
+            print(f"  {name:<16} {ms:7.1f}ms / {IMPORT_BUDGET_MS[name]}ms")
+        print("✓ All deterministic tools within startup budget.")
+    except AssertionError as e:
+        print(f"!! TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,179 @@
+# test_llm_resilience.py — FAULT INJECTION AGAINST THE LOCAL STUB
+# Runs WatsonXClient against an in-process llm_stub_server with injected
+# 503s and stalls, then checks:
+#   - transient failures are retried and the call succeeds
+#   - a stalled attempt raises DeadlineExceeded instead of hanging
+#   - consecutive failures open the circuit breaker (no further requests)
+#   - a hedged duplicate beats a stalled primary once p95 is known
+#   - a half-open breaker admits exactly one probe
+#   - abandoned attempts (deadline, lost hedge) get their abort Event set
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+os.environ["WATSONX_CACHE"] = "0"
+os.environ["WATSONX_LEDGER"] = "0"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from llm_backends import StubHTTPBackend  # noqa: E402
+from llm_resilience import (  # noqa: E402
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    LatencyWindow,
+    ResiliencePolicy,
+    call_with_resilience,
+)
+from llm_stub_server import StubConfig, serve  # noqa: E402
+from watsonx_client import WatsonXClient  # noqa: E402
+
+FAST_POLICY = ResiliencePolicy(
+    deadline_s=2.0, max_retries=2, backoff_base_s=0.01, backoff_max_s=0.05
+)
+
+
+def make_client(config: StubConfig, model_id: str, **policy_overrides) -> WatsonXClient:
+    server = serve("127.0.0.1", 0, config)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    client = WatsonXClient(model_id=model_id, backend=StubHTTPBackend(url, timeout_s=10))
+    client.resilience = ResiliencePolicy(**{**FAST_POLICY.__dict__, **policy_overrides})
+    return client
+
+
+def test_retry_recovers_from_transient_faults():
+    config = StubConfig(latency_ms=5, tokens_per_s=0, output_tokens=8, fail_next=2)
+    client = make_client(config, "test/retry")
+    assert client.ask("ping").startswith("stub0")
+    assert client.last_call_stats["retries"] == 2
+    assert config.stats["requests"] == 3
+
+
+def test_retries_exhausted_surfaces_error():
+    config = StubConfig(latency_ms=5, tokens_per_s=0, output_tokens=8, fail_next=10)
+    client = make_client(config, "test/exhausted", max_retries=1)
+    try:
+        client.ask("ping")
+    except Exception as e:
+        assert getattr(e, "code", None) == 503
+    else:
+        raise AssertionError("expected the injected 503 to surface")
+    assert config.stats["requests"] == 2
+
+
+def test_deadline_abandons_stalled_attempt():
+    config = StubConfig(
+        latency_ms=5, tokens_per_s=0, output_tokens=8, slow_next=5, slow_ms=3000
+    )
+    client = make_client(config, "test/deadline", deadline_s=0.3, max_retries=0)
+    started = time.monotonic()
+    try:
+        client.ask("ping")
+    except DeadlineExceeded:
+        pass
+    else:
+        raise AssertionError("expected DeadlineExceeded")
+    assert time.monotonic() - started < 1.5
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_s=60)
+    calls = []
+
+    def always_down():
+        calls.append(1)
+        raise ConnectionResetError("stub down")
+
+    for _ in range(3):
+        try:
+            call_with_resilience(
+                always_down, ResiliencePolicy(max_retries=0), breaker, LatencyWindow()
+            )
+        except ConnectionResetError:
+            pass
+    assert breaker.state == "open"
+    try:
+        call_with_resilience(always_down, FAST_POLICY, breaker, LatencyWindow())
+    except CircuitOpenError:
+        pass
+    else:
+        raise AssertionError("expected CircuitOpenError")
+    assert len(calls) == 3
+
+
+def test_hedge_beats_stalled_primary():
+    config = StubConfig(latency_ms=20, tokens_per_s=0, output_tokens=8)
+    client = make_client(config, "test/hedge", hedge=True, hedge_min_samples=4)
+    for _ in range(4):
+        client.ask("warmup")
+    config.slow_next, config.slow_ms = 1, 3000
+
+    started = time.monotonic()
+    assert client.ask("ping").startswith("stub0")
+    assert time.monotonic() - started < 1.0
+    assert client.last_call_stats["hedged"] is True
+    assert config.stats["slow"] == 1
+
+
+def test_half_open_admits_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_s=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert [breaker.allow() for _ in range(5)] == [True, False, False, False, False]
+    breaker.record_failure()  # probe failed: open again for a full cooldown
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert all(breaker.allow() for _ in range(3))
+
+
+def test_deadline_sets_abort_on_orphaned_attempt():
+    aborted = threading.Event()
+
+    def stalled(abort):
+        if abort.wait(2.0):
+            aborted.set()
+        return "late"
+
+    policy = ResiliencePolicy(deadline_s=0.1, max_retries=0)
+    try:
+        call_with_resilience(
+            stalled, policy, CircuitBreaker(), LatencyWindow(), abortable=True
+        )
+    except DeadlineExceeded:
+        pass
+    else:
+        raise AssertionError("expected DeadlineExceeded")
+    assert aborted.wait(1.0), "orphaned attempt was never told to stop"
+
+
+def test_streaming_loser_stops_after_hedge():
+    config = StubConfig(latency_ms=20, tokens_per_s=200, output_tokens=40)
+    client = make_client(config, "test/hedge-abort", hedge=True, hedge_min_samples=2)
+    client.stream = True
+    for _ in range(2):
+        client.ask("warmup")
+    config.slow_next, config.slow_ms = 1, 1000
+    client.ask("ping")
+    assert client.last_call_stats["hedged"] is True
+    time.sleep(1.2)  # the stalled primary starts streaming, sees abort, closes
+    assert config.stats["requests"] == 4
+    # Three full streams; the abandoned primary stops after a chunk or two.
+    assert config.stats["tokens_out"] < 3 * 40 + 10
+
+
+if __name__ == "__main__":
+    print("✶⌁✶ INITIATING RESILIENCE FAULT-INJECTION TEST")
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith("test_")]
+    try:
+        for test in tests:
+            test()
+            print(f"  ✓ {test.__name__}")
+        print("✓ Retry, deadline, breaker and hedge paths hold under injected faults.")
+    except AssertionError as e:
+        print(f"!! TEST FAILED: {e}")
+        sys.exit(1)
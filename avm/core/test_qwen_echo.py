@@ -0,0 +1,170 @@
+# test_qwen_echo.py — CHUNKED MAP STAGE + BATCH LEDGER
+# Drives EchoSynapse against an in-process counting backend and checks:
+#   - map notes come from the client's response cache, keyed on the real
+#     decoding params, and fresh=True / a disabled cache always regenerate
+#   - map_chunks works when called from inside a running event loop
+#   - validate_output scans an output for source replay only once
+# Runs run_batch with a stubbed refine_source and checks:
+#   - a duplicate manifest job is skipped without unsettling the claimant
+#   - "emitted" is ledgered only once the artifact is on disk
+#   - a queued artifact the emitter fails to write settles as failed with
+#     the emitter's error
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+os.environ["WATSONX_LEDGER"] = "0"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import qwen_echo  # noqa: E402
+from llm_backends import Generation, LLMBackend  # noqa: E402
+from qwen_echo import EchoSynapse, chunk_source  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from watsonx_client import WatsonXClient  # noqa: E402
+
+SOURCE = "\n\n".join(
+    f"## Section {i}\n\n" + " ".join(f"word{i}_{j}" for j in range(40)) for i in range(4)
+)
+
+
+class CountingBackend(LLMBackend):
+    name = "counting"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, model_id: str, prompt: str, params: Dict[str, Any]) -> Generation:
+        self.calls += 1
+        return Generation(f"notes #{self.calls}", 1, 2)
+
+
+def small_chunks(monkeypatch) -> int:
+    """Maps SOURCE as several chunks; the QWEN-ECHO manifest is not needed."""
+    monkeypatch.setattr(WatsonXClient, "set_agent", lambda self, agent_name: None)
+    monkeypatch.setattr(qwen_echo, "chunk_source", lambda text: chunk_source(text, 50))
+    monkeypatch.setattr(qwen_echo, "save_debug", lambda *args: None)
+    return len(chunk_source(SOURCE, 50))
+
+
+def make_synapse(tmp_path: Path, backend: LLMBackend, cache: bool = True) -> EchoSynapse:
+    synapse = EchoSynapse("UBW", "rules", tmp_path / "debug")
+    synapse.client.backend = backend
+    synapse.client.cache = ResponseCache(tmp_path / "cache") if cache else None
+    return synapse
+
+
+def test_map_notes_follow_client_cache_and_bypass_flags(tmp_path, monkeypatch):
+    chunks = small_chunks(monkeypatch)
+    assert chunks > 1
+
+    backend = CountingBackend()
+    notes = make_synapse(tmp_path, backend).map_chunks(SOURCE)
+    assert backend.calls == chunks and notes.startswith(f"[PART 1/{chunks}]")
+
+    # A new synapse (new run) maps from the client cache.
+    assert make_synapse(tmp_path, backend).map_chunks(SOURCE) == notes
+    assert backend.calls == chunks
+
+    # Changed decoding params are a different key, not stale notes.
+    other = make_synapse(tmp_path, backend)
+    other.client.default_params = {**other.client.default_params, "repetition_penalty": 1.3}
+    assert other.map_chunks(SOURCE) != notes
+    assert backend.calls == 2 * chunks
+
+    make_synapse(tmp_path, backend).map_chunks(SOURCE, fresh=True)
+    assert backend.calls == 3 * chunks
+
+    uncached = make_synapse(tmp_path, backend, cache=False)
+    uncached.map_chunks(SOURCE)
+    assert backend.calls == 4 * chunks
+
+
+def test_map_chunks_inside_running_loop(tmp_path, monkeypatch):
+    chunks = small_chunks(monkeypatch)
+    backend = CountingBackend()
+    synapse = make_synapse(tmp_path, backend)
+
+    async def caller():
+        blocking = synapse.map_chunks(SOURCE)
+        return blocking, await synapse.amap_chunks(SOURCE)
+
+    blocking, awaited = asyncio.run(caller())
+    assert blocking == awaited
+    assert backend.calls == chunks
+
+
+def fake_refine(style, protocol, title, source_path, raw, orch, filename=None, outcome=None, on_written=None):
+    outcome["pass1"] = "ok"
+    payload = {
+        "full_save_path": qwen_echo.VAULT_ROOT / qwen_echo.artifact_relative_dir(title) / filename,
+        "metadata": {"title": title},
+        "content": raw,
+    }
+    if title.startswith("Broken"):
+        del payload["metadata"]  # render fails on the emitter thread
+    orch.emit_to_vault(payload, on_written)
+    return payload
+
+
+def test_batch_ledger_claims_settles_and_fails_unwritten(tmp_path, monkeypatch):
+    monkeypatch.setattr(qwen_echo, "VAULT_ROOT", tmp_path / "vault")
+    monkeypatch.setattr(qwen_echo, "ensure_debug_root", lambda: None)
+    monkeypatch.setattr(qwen_echo, "get_available_styles", lambda: {"UBW": "rules"})
+    monkeypatch.setattr(qwen_echo, "refine_source", fake_refine)
+
+    source = tmp_path / "source.md"
+    source.write_text("source body", encoding="utf-8")
+    existing = qwen_echo.BatchJob(source, "Already done", "UBW")
+    done = qwen_echo.VAULT_ROOT / qwen_echo.artifact_relative_dir(existing.title)
+    done.mkdir(parents=True)
+    (done / qwen_echo.batch_filename(existing, "UBW")).write_text("old", encoding="utf-8")
+
+    manifest = tmp_path / "jobs.csv"
+    rows = ["Good one", "Good one", "Broken one", "Already done"]
+    manifest.write_text(
+        "source_path,title,style\n" + "".join(f"{source},{t},UBW\n" for t in rows),
+        encoding="utf-8",
+    )
+    counts = qwen_echo.run_batch(manifest, workers=2)
+    assert counts == {"emitted": 1, "failed": 1, "skipped": 2}
+
+    ledger = [
+        json.loads(line)
+        for line in manifest.with_suffix(".ledger.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    by_status = {}
+    for outcome in ledger:
+        by_status.setdefault(outcome["status"], []).append(outcome)
+    assert [o["title"] for o in by_status["emitted"]] == ["Good one"]
+    assert Path(by_status["emitted"][0]["artifact"]).read_text(encoding="utf-8").endswith(
+        "source body"
+    )
+    (failed,) = by_status["failed"]
+    assert failed["title"] == "Broken one" and "KeyError" in failed["error"]
+    assert not Path(failed["artifact"]).exists()
+    assert sorted(o["error"] or "exists" for o in by_status["skipped"]) == [
+        "duplicate of an earlier manifest job",
+        "exists",
+    ]
+
+
+def test_validate_output_scans_for_replay_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(qwen_echo, "save_debug", lambda *args: None)
+    scans = []
+    real_scan = qwen_echo.SourceShingleIndex.scan
+    monkeypatch.setattr(
+        qwen_echo.SourceShingleIndex,
+        "scan",
+        lambda self, text: scans.append(text) or real_scan(self, text),
+    )
+    source = " ".join(f"source{i}" for i in range(400))
+    replayed = "Intro. " + source[:1500]
+
+    failed, reason = qwen_echo.validate_output(
+        replayed, "UBW", source, "Title", tmp_path, "pass1"
+    )
+    assert failed and "large raw-source span" in reason
+    assert scans == [replayed]
@@ -0,0 +1,203 @@
+# test_synapse_dag.py — SYNAPSE DAG ORDERING, SKIPS + STATE
+# Runs run_dag over temp synapse YAMLs with an injected execute= and checks:
+#   - build_dag links a node to the synapse whose writeback is its input
+#   - cycles and shared writebacks are rejected before anything runs
+#   - unchanged nodes are skipped; an upstream change reruns its dependents
+#   - a failure blocks everything downstream and is dropped from state
+#   - the default executor builds one orchestrator per worker thread
+#   - real nodes run through execute_synapse and VSEncOrchestrator.run
+import json
+import sys
+import threading
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synapse_engine  # noqa: E402
+from synapse_engine import (  # noqa: E402
+    DAG_STATE_FILE,
+    build_dag,
+    discover_synapses,
+    run_dag,
+)
+from vs_enc import VSEncOrchestrator  # noqa: E402
+
+
+def write_synapse(root: Path, name: str, input_name: str, output_name: str) -> None:
+    spec = {
+        "synapse": {
+            "name": name,
+            "agent": "ctx_grok_proto",
+            "invocation_type": "summarize",
+            "input": str(root / input_name),
+            "writeback": str(root / output_name),
+        }
+    }
+    (root / f"{name}.yaml").write_text(yaml.safe_dump(spec), encoding="utf-8")
+
+
+def make_chain(root: Path) -> None:
+    """note.md -> a -> b, plus an independent c."""
+    (root / "note.md").write_text("seed", encoding="utf-8")
+    (root / "other.md").write_text("other", encoding="utf-8")
+    write_synapse(root, "a", "note.md", "a.json")
+    write_synapse(root, "b", "a.json", "b.json")
+    write_synapse(root, "c", "other.md", "c.json")
+
+
+class RecordingExecute:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, spec):
+        with self.lock:
+            self.calls.append(spec.name)
+        if spec.name in self.fail:
+            raise RuntimeError(f"{spec.name} exploded")
+        text = Path(spec.input_path).read_text(encoding="utf-8")
+        Path(spec.output_path).write_text(json.dumps({spec.name: text}), encoding="utf-8")
+
+
+def statuses(reports):
+    return {r.name: r.status for r in reports}
+
+
+def test_build_dag_links_writebacks_to_inputs(tmp_path):
+    make_chain(tmp_path)
+    specs, state_dir = discover_synapses(str(tmp_path))
+    assert state_dir == str(tmp_path)
+    assert build_dag(specs) == {"a": [], "b": ["a"], "c": []}
+
+
+def test_cycle_and_shared_writeback_are_rejected(tmp_path):
+    (tmp_path / "x.json").write_text("{}", encoding="utf-8")
+    write_synapse(tmp_path, "x", "y.json", "x.json")
+    write_synapse(tmp_path, "y", "x.json", "y.json")
+    specs, _ = discover_synapses(str(tmp_path))
+    try:
+        build_dag(specs)
+    except ValueError as e:
+        assert "cycle" in str(e) and "x" in str(e) and "y" in str(e)
+    else:
+        raise AssertionError("expected a cycle error")
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    write_synapse(shared, "p", "in.md", "out.json")
+    write_synapse(shared, "q", "in.md", "out.json")
+    specs, _ = discover_synapses(str(shared))
+    try:
+        build_dag(specs)
+    except ValueError as e:
+        assert "write the same file" in str(e)
+    else:
+        raise AssertionError("expected a shared writeback error")
+
+
+def test_unchanged_nodes_skip_and_upstream_change_reruns_dependents(tmp_path):
+    make_chain(tmp_path)
+    first = RecordingExecute()
+    assert statuses(run_dag(str(tmp_path), workers=2, execute=first)) == {
+        "a": "ran", "b": "ran", "c": "ran",
+    }
+    assert first.calls.index("a") < first.calls.index("b")
+
+    state = json.loads((tmp_path / DAG_STATE_FILE).read_text(encoding="utf-8"))
+    assert set(state) == {"a", "b", "c"}
+
+    second = RecordingExecute()
+    assert statuses(run_dag(str(tmp_path), workers=2, execute=second)) == {
+        "a": "skipped", "b": "skipped", "c": "skipped",
+    }
+    assert second.calls == []
+
+    (tmp_path / "note.md").write_text("seed, revised", encoding="utf-8")
+    third = RecordingExecute()
+    assert statuses(run_dag(str(tmp_path), workers=2, execute=third)) == {
+        "a": "ran", "b": "ran", "c": "skipped",
+    }
+
+    forced = RecordingExecute()
+    run_dag(str(tmp_path), workers=2, force=True, execute=forced)
+    assert sorted(forced.calls) == ["a", "b", "c"]
+
+
+def test_failure_blocks_downstream_and_is_dropped_from_state(tmp_path):
+    make_chain(tmp_path)
+    run_dag(str(tmp_path), workers=2, execute=RecordingExecute())
+
+    (tmp_path / "note.md").write_text("seed, revised", encoding="utf-8")
+    failing = RecordingExecute(fail={"a"})
+    reports = run_dag(str(tmp_path), workers=2, execute=failing)
+    assert statuses(reports) == {"a": "failed", "b": "blocked", "c": "skipped"}
+    assert "b" not in failing.calls
+    by_name = {r.name: r for r in reports}
+    assert "a exploded" in by_name["a"].detail
+    assert by_name["b"].detail == "upstream a failed"
+
+    state = json.loads((tmp_path / DAG_STATE_FILE).read_text(encoding="utf-8"))
+    assert "a" not in state and "c" in state
+
+
+def test_default_executor_builds_one_orchestrator_per_worker(tmp_path, monkeypatch):
+    for name in "abcdef":
+        (tmp_path / f"{name}.md").write_text(name, encoding="utf-8")
+        write_synapse(tmp_path, name, f"{name}.md", f"{name}.json")
+
+    built = []
+    used = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_build():
+        orchestrator = object()
+        with lock:
+            built.append(orchestrator)
+        return orchestrator, {"ctx_grok_proto": orchestrator}
+
+    def fake_execute(spec, orchestrator, agent_registry):
+        assert agent_registry["ctx_grok_proto"] is orchestrator
+        with lock:
+            used.append((threading.get_ident(), orchestrator))
+            first_round = len(used) <= 2
+        if first_round:
+            barrier.wait()  # both workers hold their own agents at once
+        Path(spec.output_path).write_text("{}", encoding="utf-8")
+
+    monkeypatch.setattr(synapse_engine, "build_orchestrator", fake_build)
+    monkeypatch.setattr(synapse_engine, "execute_synapse", fake_execute)
+    reports = run_dag(str(tmp_path), workers=2)
+
+    assert all(r.status == "ran" for r in reports)
+    assert len(built) == 2
+    per_thread = {}
+    for ident, orchestrator in used:
+        assert per_thread.setdefault(ident, orchestrator) is orchestrator
+    assert len(set(map(id, per_thread.values()))) == 2
+
+
+class UpperAgent:
+    def run(self, text):
+        return {"summary": text.upper()}
+
+
+def test_real_execute_synapse_chains_writebacks(tmp_path, monkeypatch):
+    make_chain(tmp_path)
+
+    def stub_build():
+        registry = {"ctx_grok_proto": UpperAgent()}
+        return VSEncOrchestrator(registry, write_behind=False), registry
+
+    monkeypatch.setattr(synapse_engine, "build_orchestrator", stub_build)
+    reports = run_dag(str(tmp_path), workers=2)
+    assert statuses(reports) == {"a": "ran", "b": "ran", "c": "ran"}, [r.detail for r in reports]
+
+    a_out = json.loads((tmp_path / "a.json").read_text(encoding="utf-8"))
+    assert a_out["content"] == {"summary": "SEED"}
+    assert a_out["metadata"]["title"] == "Synapse — a"
+    b_out = json.loads((tmp_path / "b.json").read_text(encoding="utf-8"))
+    assert '"SUMMARY": "SEED"' in b_out["content"]["summary"]
@@ -0,0 +1,53 @@
+# test_vault_emitter.py — WRITE-BEHIND SURVIVAL UNDER BAD PAYLOADS
+# A payload the emitter cannot render must be recorded as a failure without
+# killing the background thread:
+#   - flush() returns, reporting the failed write once
+#   - later artifacts are still written and their on_written hook runs
+#   - each orchestrator's flush() reports only its own failed writes
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from vs_enc import VaultEmitter, VSEncOrchestrator  # noqa: E402
+
+
+def test_bad_payload_is_reported_and_flush_returns(tmp_path):
+    emitter = VaultEmitter(flush_interval_s=0.01)
+    emitter.submit({"full_save_path": tmp_path / "broken.md", "content": "no metadata"})
+
+    result = {}
+    flushed = threading.Event()
+
+    def do_flush():
+        result["failures"] = emitter.flush()
+        flushed.set()
+
+    threading.Thread(target=do_flush, daemon=True).start()
+    assert flushed.wait(5), "flush() blocked after a failed write"
+    assert [path for path, _ in result["failures"]] == [str(tmp_path / "broken.md")]
+
+    written = []
+    good = {"full_save_path": tmp_path / "ok.md", "metadata": {"title": "ok"}, "content": "body"}
+    emitter.submit(good, on_written=lambda payload: written.append(payload["full_save_path"]))
+    assert emitter.flush() == []
+    emitter.close()
+    assert written == [tmp_path / "ok.md"]
+    assert (tmp_path / "ok.md").read_text(encoding="utf-8").endswith("body")
+
+
+def test_flush_reports_failures_per_orchestrator(tmp_path):
+    first = VSEncOrchestrator({}, write_behind=True)
+    second = VSEncOrchestrator({}, write_behind=True)
+    first.emit_to_vault({"full_save_path": tmp_path / "first.md", "content": "no metadata"})
+    second.emit_to_vault({"full_save_path": tmp_path / "second.md", "content": "no metadata"})
+    second.emit_to_vault(
+        {"full_save_path": tmp_path / "ok.md", "metadata": {"title": "ok"}, "content": "body"}
+    )
+
+    # The first flush drains everything but must not consume second's failure.
+    assert [path for path, _ in first.flush()] == [str(tmp_path / "first.md")]
+    assert [path for path, _ in second.flush()] == [str(tmp_path / "second.md")]
+    assert first.flush() == [] and second.flush() == []
+    assert (tmp_path / "ok.md").exists()
@@ -0,0 +1,139 @@
+# test_watsonx_client.py — RESPONSE CACHE + PER-CALL STATE
+# Drives WatsonXClient against an in-process scripted backend and checks:
+#   - a streamed early-stopped response is never served to a blocking call,
+#     and each stop detector gets its own cache entry
+#   - a cache write failure is counted and the paid generation still returns
+#   - concurrent asks each read their own last_call_stats
+#   - cancelling an aask task closes its stream instead of letting it run on
+#   - streamed calls record a prompt-token count for the ledger
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+os.environ["WATSONX_LEDGER"] = "0"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ctx_grok_proto import JsonObjectDecoder  # noqa: E402
+from llm_backends import Generation, LLMBackend  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from watsonx_client import WatsonXClient  # noqa: E402
+
+FULL_TEXT = '{"title": "t"} trailing prose\n### METADATA\n{"tags": ["a"]}\nmore after metadata'
+
+
+class ScriptedBackend(LLMBackend):
+    name = "scripted"
+
+    def __init__(self, text: str = FULL_TEXT, chunk_delay_s: float = 0.0) -> None:
+        self.text = text
+        self.chunk_delay_s = chunk_delay_s
+        self.calls = {"generate": 0, "stream": 0}
+        self.chunks_sent = 0
+        self.stream_closed = threading.Event()
+
+    def generate(self, model_id: str, prompt: str, params: Dict[str, Any]) -> Generation:
+        self.calls["generate"] += 1
+        if "slow" in prompt:
+            time.sleep(0.2)
+        return Generation(self.text, len(prompt.split()), len(self.text.split()))
+
+    def generate_stream(
+        self, model_id: str, prompt: str, params: Dict[str, Any]
+    ) -> Iterator[str]:
+        self.calls["stream"] += 1
+        try:
+            for word in self.text.split(" "):
+                time.sleep(self.chunk_delay_s)
+                self.chunks_sent += 1
+                yield word + " "
+        finally:
+            self.stream_closed.set()
+
+
+def make_client(tmp_path: Path, backend: LLMBackend) -> WatsonXClient:
+    client = WatsonXClient(model_id="test/client", backend=backend)
+    client.cache = ResponseCache(tmp_path / "cache")
+    return client
+
+
+def test_streamed_cut_is_not_served_to_blocking_calls(tmp_path):
+    backend = ScriptedBackend()
+    client = make_client(tmp_path, backend)
+
+    cut = client.ask("p", stream=True)
+    assert cut.endswith('{"tags": ["a"]}') and "more after" not in cut
+    assert client.ask("p", stream=True) == cut and client.last_cache_hit
+
+    full = client.ask("p", stream=False)
+    assert not client.last_cache_hit and full.endswith("more after metadata")
+    assert client.ask("p", stream=False) == full and client.last_cache_hit
+
+    first_object = client.ask("p", stop_detector=JsonObjectDecoder)
+    assert first_object == '{"title": "t"}' and not client.last_cache_hit
+    assert client.ask("p", stop_detector=JsonObjectDecoder) == first_object
+    assert backend.calls == {"generate": 1, "stream": 2}
+
+
+def test_cache_write_failure_still_returns_generation(tmp_path):
+    backend = ScriptedBackend()
+    client = make_client(tmp_path, backend)
+    (tmp_path / "cache").write_text("not a directory", encoding="utf-8")
+
+    assert client.ask("p").endswith("more after metadata")
+    assert client.cache.counters["write_errors"] == 1
+    assert client.ask("p").endswith("more after metadata")
+    assert backend.calls["generate"] == 2
+
+
+def test_concurrent_asks_keep_their_own_stats(tmp_path):
+    client = make_client(tmp_path, ScriptedBackend())
+    client.cache = None
+    seen = {}
+
+    def fast():
+        client.ask("fast", label="fast")
+        slow_thread.join()  # read only after the slow call has finished too
+        seen["fast"] = client.last_call_stats["stage"]
+
+    def slow():
+        client.ask("slow", label="slow")
+        seen["slow"] = client.last_call_stats["stage"]
+
+    slow_thread = threading.Thread(target=slow)
+    fast_thread = threading.Thread(target=fast)
+    slow_thread.start()
+    fast_thread.start()
+    fast_thread.join(5)
+    assert seen == {"fast": "fast", "slow": "slow"}
+
+
+def test_cancelling_aask_closes_the_stream(tmp_path):
+    backend = ScriptedBackend(text="word " * 500, chunk_delay_s=0.005)
+    client = make_client(tmp_path, backend)
+
+    async def run():
+        task = asyncio.create_task(client.aask("p", stream=True))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+    assert backend.stream_closed.wait(2), "stream kept generating after cancel"
+    assert backend.chunks_sent < 200
+    assert client.stream_totals["calls"] == 0
+
+
+def test_streamed_call_records_prompt_tokens(tmp_path):
+    client = make_client(tmp_path, ScriptedBackend())
+    client.cache = None
+    client.ask("a prompt of several words", stream=True)
+    streamed = client.last_call_stats
+    assert streamed["streamed"] and streamed["prompt_tokens"] > 0
+    assert streamed["completion_tokens"] > 0
@@ -1,33 +1,335 @@
 # ==============================================================================
-# ✶⌁✶ vs_enc.py — THE ROOT ORCHESTRATOR v1.0.0 [CANONICAL]
+# ✶⌁✶ vs_enc.py — THE ROOT ORCHESTRATOR v1.2.0 [CANONICAL]
 # ==============================================================================
 # ROLE: Root execution coordinator and universal metadata enforcer.
 # ENGINE: Python 3.10+ / Middleware Kernel
+# LAW: vs_enc_invocation_law.yaml is compiled once per (path, mtime) into an
+#      immutable CompiledLaw shared by every orchestrator instance.
+# DISPATCH: run() for one agent; arun() / run_many() fan several
+#           (agent, input, invocation_type) jobs out concurrently, gated per
+#           agent (agent_limits / VS_ENC_AGENT_CONCURRENCY), payloads returned
+#           in submission order.
+# IDS: monotonic per process ("YYYYMMDDHHMMSS", then "_0001", "_0002", ...
+#      within the same second); auto-named emit_<id>.md files never collide.
+# EMISSION: write_behind=True (or VS_ENC_WRITE_BEHIND=1) hands artifacts to a
+#           background VaultEmitter that writes batches atomically (temp +
+#           rename) and drains at interpreter exit. flush() returns the
+#           writes that failed since the previous flush, per submitter: an
+#           orchestrator only ever sees failures of its own artifacts.
 # COMPLIANCE: WC-LAW-2025-12-29-V200 (Sentinel v2.0.0 Alignment)
 # ==============================================================================
 
+from __future__ import annotations
+
+import atexit
+import os
+import queue
 import re
+import threading
+import time
 import yaml
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:  # asyncio is imported on first async use, not at startup
+    import asyncio
 
 VAULT_ROOT = Path("C:/Users/digitalscorpyun/sankofa_temple/Anacostia")
 PST = timezone(timedelta(hours=-8))
+DEFAULT_AGENT_CONCURRENCY = int(os.getenv("VS_ENC_AGENT_CONCURRENCY", "4"))
+WRITE_BEHIND = os.getenv("VS_ENC_WRITE_BEHIND", "0") == "1"
+FLUSH_INTERVAL_S = 0.2
+MAX_BATCH = 128
+DEFAULT_ARTIFACT_DIR = "war_council/_artifacts/uncategorized"
+
+
+# ------------------------------------------------------------------------------
+# COMPILED INVOCATION LAW
+# ------------------------------------------------------------------------------
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    # Merged params reach yaml.dump, which would tag tuples as python/tuple.
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledLaw:
+    source: str = ""
+    invocation_types: Mapping[str, Mapping[str, Any]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    global_policies: Mapping[str, Any] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    def rules(self, invocation_type: str) -> Dict[str, Any]:
+        """A mutable copy of one invocation type's rules ({} if unknown)."""
+        return _thaw(self.invocation_types.get(invocation_type, {}))
+
+
+EMPTY_LAW = CompiledLaw()
+
+
+@lru_cache(maxsize=16)
+def _compile_law(path: str, mtime_ns: int) -> CompiledLaw:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    return CompiledLaw(
+        source=path,
+        invocation_types=_freeze(raw.get("invocation_types") or {}),
+        global_policies=_freeze(raw.get("global_policies") or {}),
+    )
+
+
+def compile_law(path: Optional[Union[str, Path]]) -> CompiledLaw:
+    """Parses the law once per (path, mtime); later calls only stat() it."""
+    if not path:
+        return EMPTY_LAW
+    try:
+        mtime_ns = Path(path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return EMPTY_LAW
+    return _compile_law(str(path), mtime_ns)
+
+
+# ------------------------------------------------------------------------------
+# ARTIFACT IDS
+# ------------------------------------------------------------------------------
+class IdAllocator:
+    """
+    Seconds-resolution ids that stay unique and sortable under bursts: the
+    first id of a second is the bare timestamp, later ones get _0001, _0002...
+    A clock step backwards keeps counting from the last issued second.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_base = ""
+        self._seq = 0
+
+    def next_id(self, now: Optional[datetime] = None) -> str:
+        base = (now or datetime.now(PST)).strftime("%Y%m%d%H%M%S")
+        with self._lock:
+            if base > self._last_base:
+                self._last_base, self._seq = base, 0
+                return base
+            self._seq += 1
+            return f"{self._last_base}_{self._seq:04d}"
+
+
+ID_ALLOCATOR = IdAllocator()
+
+
+# ------------------------------------------------------------------------------
+# WRITE-BEHIND EMITTER
+# ------------------------------------------------------------------------------
+def render_artifact(payload: Dict[str, Any]) -> str:
+    return (
+        "---\n"
+        + yaml.dump(payload["metadata"], sort_keys=False, allow_unicode=True)
+        + "---\n\n"
+        + payload["content"]
+    )
+
+
+def write_artifact(save_path: Path, text: str) -> None:
+    """Temp file + rename: readers never see a half-written artifact."""
+    tmp_path = save_path.with_name(f".{save_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, save_path)
+
+
+OnWritten = Callable[[Dict[str, Any]], None]
+
+
+class VaultEmitter:
+    """Single background thread; submit() only enqueues."""
+
+    def __init__(
+        self, flush_interval_s: float = FLUSH_INTERVAL_S, max_batch: int = MAX_BATCH
+    ) -> None:
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], Optional[OnWritten], Any]]]" = (
+            queue.Queue()
+        )
+        self._dirs: Set[Path] = set()
+        self.failures: List[Tuple[str, str]] = []
+        # Unreported failures per submitter (the `owner` passed to submit()).
+        self._unreported: Dict[Any, List[Tuple[str, str]]] = {}
+        self._failures_lock = threading.Lock()
+        self.written = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="vault-emitter", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        payload: Dict[str, Any],
+        on_written: Optional[OnWritten] = None,
+        owner: Any = None,
+    ) -> None:
+        """
+        Rendering happens on the emitter thread, so the payload must not be
+        mutated after submission. on_written(payload) runs on the emitter
+        thread once the file is in place. A failed write is reported to the
+        flush() of the same `owner`.
+        """
+        if self._closed:
+            raise RuntimeError("VaultEmitter is closed")
+        self._queue.put((payload, on_written, owner))
+
+    def flush(self, owner: Any = None) -> List[Tuple[str, str]]:
+        """
+        Blocks until every artifact submitted so far is on disk (or failed)
+        and returns the (path, error) failures of `owner`'s submissions
+        recorded since its last flush.
+        """
+        self._queue.join()
+        with self._failures_lock:
+            return self._unreported.pop(owner, [])
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if self.failures:
+            print(f"❌ VaultEmitter: {len(self.failures)} artifact(s) failed to write:")
+            for path, error in self.failures:
+                print(f"   {path}: {error}")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            try:
+                for payload, on_written, owner in batch:
+                    self._write(payload, on_written, owner)
+            finally:
+                # Always settled, so flush() and the atexit close() return.
+                for _ in batch:
+                    self._queue.task_done()
+                if stop:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(
+        self, payload: Dict[str, Any], on_written: Optional[OnWritten], owner: Any
+    ) -> None:
+        save_path = payload.get("full_save_path")
+        try:
+            if save_path.parent not in self._dirs:
+                save_path.parent.mkdir(parents=True, exist_ok=True)
+                self._dirs.add(save_path.parent)
+            write_artifact(save_path, render_artifact(payload))
+        except Exception as e:
+            # Any bad payload is recorded, never allowed to kill the thread.
+            failure = (str(save_path), repr(e))
+            with self._failures_lock:
+                self.failures.append(failure)
+                self._unreported.setdefault(owner, []).append(failure)
+            print(f"❌ Artifact write failed ({save_path}): {e!r}")
+            return
+        self.written += 1
+        print(f"✓ Artifact Emitted under VS-ENC v1.0.0 Law: {save_path.name}")
+        if on_written is not None:
+            try:
+                on_written(payload)
+            except Exception as e:
+                print(f"⚠️ on_written hook failed for {save_path.name}: {e}")
+
+
+_EMITTER: Optional[VaultEmitter] = None
+_EMITTER_LOCK = threading.Lock()
+
+
+def get_emitter() -> VaultEmitter:
+    """Process-wide emitter; drained at interpreter exit."""
+    global _EMITTER
+    with _EMITTER_LOCK:
+        if _EMITTER is None:
+            _EMITTER = VaultEmitter()
+            atexit.register(_EMITTER.close)
+        return _EMITTER
+
+
+# ------------------------------------------------------------------------------
+# ORCHESTRATOR
+# ------------------------------------------------------------------------------
+@dataclass
+class DispatchJob:
+    agent_name: str
+    input_text: str
+    invocation_type: str
+    custom_params: Dict[str, Any] = field(default_factory=dict)
+
+
+JobSpec = Union[DispatchJob, Sequence[Any], Mapping[str, Any]]
 
 
 class VSEncOrchestrator:
     def __init__(
-        self, agent_registry: Dict[str, Any], law_path: Optional[Path] = None
+        self,
+        agent_registry: Dict[str, Any],
+        law_path: Optional[Path] = None,
+        agent_limits: Optional[Dict[str, int]] = None,
+        default_agent_limit: int = DEFAULT_AGENT_CONCURRENCY,
+        write_behind: Optional[bool] = None,
     ) -> None:
         self.agent_registry = agent_registry
-        self.invocation_law = self._load_law(law_path) if law_path else {}
-
-    def _load_law(self, path: Path) -> Dict[str, Any]:
-        if not path.exists():
-            return {}
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        self.write_behind = WRITE_BEHIND if write_behind is None else write_behind
+        self.law = compile_law(law_path)
+        self.agent_limits = dict(agent_limits or {})
+        self.default_agent_limit = max(1, default_agent_limit)
+        # ASYNC GOVERNANCE: per-agent semaphores, rebound to each running loop
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def _get_pst_now(self) -> str:
         now = datetime.now(PST)
@@ -40,10 +342,14 @@ class VSEncOrchestrator:
 
     def _build_frontmatter(self, params: Dict[str, Any]) -> Dict[str, Any]:
         ts = self._get_pst_now()
-        numeric_id = datetime.now(PST).strftime("%Y%m%d%H%M%S")
+        numeric_id = ID_ALLOCATOR.next_id()
 
         # ARTIFACT LOCATION: Logic relative to vault root
-        rel_dir = params.get("relative_dir", "war_council/_artifacts/uncategorized")
+        rel_dir = params.get("relative_dir", DEFAULT_ARTIFACT_DIR)
+        if "filename" not in params:
+            # Another process may have emitted this second's id already.
+            while (VAULT_ROOT / rel_dir / f"emit_{numeric_id}.md").exists():
+                numeric_id = ID_ALLOCATOR.next_id()
         filename = params.get("filename", f"emit_{numeric_id}.md")
         vault_path = f"{rel_dir}/{filename}"
 
@@ -91,6 +397,11 @@ class VSEncOrchestrator:
         }
         return fm
 
+    def _agent(self, agent_name: str) -> Any:
+        if agent_name not in self.agent_registry:
+            raise ValueError(f"Agent '{agent_name}' missing.")
+        return self.agent_registry[agent_name]
+
     def run(
         self,
         agent_name: str,
@@ -98,13 +409,109 @@ class VSEncOrchestrator:
         invocation_type: str,
         custom_params: Dict[str, Any],
     ) -> Dict[str, Any]:
-        rules = self.invocation_law.get("invocation_types", {}).get(invocation_type, {})
-        if agent_name not in self.agent_registry:
-            raise ValueError(f"Agent '{agent_name}' missing.")
-        agent = self.agent_registry[agent_name]
+        agent = self._agent(agent_name)
         raw_output = (
             agent.ask(input_text) if hasattr(agent, "ask") else agent.run(input_text)
         )
+        return self._build_payload(raw_output, invocation_type, custom_params)
+
+    # --------------------------------------------------------------------------
+    # ASYNC DISPATCH
+    # --------------------------------------------------------------------------
+    def _get_semaphore(self, agent_name: str) -> asyncio.Semaphore:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphores = {}
+            self._semaphore_loop = loop
+        if agent_name not in self._semaphores:
+            limit = self.agent_limits.get(agent_name, self.default_agent_limit)
+            self._semaphores[agent_name] = asyncio.Semaphore(max(1, limit))
+        return self._semaphores[agent_name]
+
+    async def arun(
+        self,
+        agent_name: str,
+        input_text: str,
+        invocation_type: str,
+        custom_params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        ASYNC EXECUTION: Same contract as run(), gated by the agent's
+        concurrency limit. Agents exposing aask() are awaited directly;
+        blocking ask()/run() agents execute in a worker thread.
+        """
+        import asyncio
+
+        agent = self._agent(agent_name)
+        async with self._get_semaphore(agent_name):
+            if hasattr(agent, "aask"):
+                raw_output = await agent.aask(input_text)
+            else:
+                call = agent.ask if hasattr(agent, "ask") else agent.run
+                raw_output = await asyncio.to_thread(call, input_text)
+        return self._build_payload(raw_output, invocation_type, custom_params or {})
+
+    @staticmethod
+    def _as_job(spec: JobSpec) -> DispatchJob:
+        if isinstance(spec, DispatchJob):
+            return spec
+        if isinstance(spec, Mapping):
+            return DispatchJob(**spec)
+        return DispatchJob(*spec)
+
+    async def arun_many(
+        self,
+        jobs: Sequence[JobSpec],
+        return_exceptions: bool = False,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        FAN-OUT: Dispatches every job concurrently and returns payloads in
+        submission order. Jobs are DispatchJob instances, (agent_name,
+        input_text, invocation_type[, custom_params]) tuples or dicts with
+        those keys. On the first failure the remaining jobs are cancelled
+        unless return_exceptions is set.
+        """
+        import asyncio
+
+        specs = [self._as_job(job) for job in jobs]
+        tasks = [
+            asyncio.create_task(
+                self.arun(j.agent_name, j.input_text, j.invocation_type, j.custom_params)
+            )
+            for j in specs
+        ]
+        if not tasks:
+            return []
+        try:
+            return list(await asyncio.gather(*tasks, return_exceptions=return_exceptions))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def run_many(
+        self,
+        jobs: Sequence[JobSpec],
+        return_exceptions: bool = False,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """Blocking wrapper around arun_many() for synchronous callers."""
+        import asyncio
+
+        return asyncio.run(self.arun_many(jobs, return_exceptions=return_exceptions))
+
+    # --------------------------------------------------------------------------
+    # PAYLOAD
+    # --------------------------------------------------------------------------
+    def _build_payload(
+        self,
+        raw_output: Any,
+        invocation_type: str,
+        custom_params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        rules = self.law.rules(invocation_type)
         merged_params = {**rules, **custom_params}
         frontmatter = self._build_frontmatter(merged_params)
         return {
@@ -114,15 +521,31 @@ class VSEncOrchestrator:
             "full_save_path": VAULT_ROOT / frontmatter["path"],
         }
 
-    def emit_to_vault(self, payload: Dict[str, Any]) -> None:
+    def emit_to_vault(
+        self, payload: Dict[str, Any], on_written: Optional[OnWritten] = None
+    ) -> None:
+        """
+        Writes the artifact atomically. In write-behind mode the write is
+        queued on the shared VaultEmitter; call flush() before relying on the
+        file, and put completion bookkeeping in on_written.
+        """
+        if self.write_behind:
+            get_emitter().submit(payload, on_written, owner=self)
+            return
         save_path = payload["full_save_path"]
         save_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(save_path, "w", encoding="utf-8") as f:
-            f.write(
-                "---\n"
-                + yaml.dump(payload["metadata"], sort_keys=False, allow_unicode=True)
-                + "---\n\n"
-                + payload["content"]
-            )
+        write_artifact(save_path, render_artifact(payload))
         print(f"✓ Artifact Emitted under VS-ENC v1.0.0 Law: {save_path.name}")
+        if on_written is not None:
+            on_written(payload)
+
+    def flush(self) -> List[Tuple[str, str]]:
+        """
+        Waits for queued write-behind artifacts and returns the (path, error)
+        writes of this orchestrator that failed since its last flush; [] when
+        nothing is queued.
+        """
+        if _EMITTER is not None:
+            return _EMITTER.flush(owner=self)
+        return []
 
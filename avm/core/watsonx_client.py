@@ -1,38 +1,302 @@
 # ==============================================================================
-# ✶⌁✶ watsonx_client.py — THE UNIVERSAL SYNAPSE v3.6 [HARDENED]
+# ✶⌁✶ watsonx_client.py — THE UNIVERSAL SYNAPSE v3.18 [HARDENED]
 # ==============================================================================
 # ROLE: Hardened infrastructure bridge with Env-Var Authority.
-# ENGINE: IBM Watsonx AI (Granite 4.0)
+#       v3.7: async dispatch (aask / ask_many) with bounded concurrency,
+#             per-minute rate limiting and cooperative cancellation
+#             (cancelling an aask task cancels its generation).
+#       v3.8: content-addressed response cache for greedy generations.
+#       v3.9: streaming mode with early stop on terminal tags / closed
+#             ### METADATA JSON block (tokens saved, estimated from
+#             the streamed text, + TTFT per call).
+#       v3.10: process-wide protocol manifest cache keyed by path + mtime.
+#       v3.11: pluggable generation backend (watsonx / record / replay / stub).
+#       v3.12: lazy SDK/pytz imports; credential guard deferred to first call.
+#       v3.13: per-call telemetry ledger (caller / stage labels, tokens, cache).
+#              Streamed calls log the budget plan's prompt-token count.
+#       v3.14: per-call deadlines, jittered backoff, circuit breaker and
+#              optional p95 hedging via llm_resilience.
+#       v3.15: token budgeting via llm_budget (context-window guard, source
+#              trimming, max_new_tokens sized from expected artifact words).
+#       v3.16: cooperative cancellation (ask(cancel=Event)) for speculative
+#              callers; a cancelled stream is closed and never cached.
+#       v3.17: protocol manifests served from protocol_bundle's compiled
+#              pickle (one read per process, re-parsed on mtime change).
+#       v3.18: pluggable stream stop hook (ask(stop_detector=factory)) so
+#              callers can end a generation on their own structure. Streamed
+#              responses are cached under their detector, never served to
+#              blocking calls (or vice versa).
+# ENGINE: IBM Watsonx AI (Granite 4.0) via llm_backends
 # COMPLIANCE: WC-DIR-2026-01-11-ENV-HARDENING
 # ==============================================================================
 
+from __future__ import annotations
+
 import os
-import sys
+import threading
+import time
+from collections import deque
+from dataclasses import replace
 from pathlib import Path
 from datetime import datetime
-import pytz
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:  # asyncio is imported on first async use, not at startup
+    import asyncio
 
-from ibm_watsonx_ai import Credentials
-from ibm_watsonx_ai.foundation_models import ModelInference
+from llm_backends import LLMBackend, get_backend
+from llm_budget import (
+    BUDGET_ENABLED,
+    TokenCounter,
+    estimate_tokens,
+    plan_budget,
+    tokens_for_words,
+)
+from llm_ledger import get_ledger
+from llm_resilience import (
+    ResiliencePolicy,
+    call_with_resilience,
+    get_breaker,
+    get_latency_window,
+)
+from protocol_bundle import MANIFEST_DIR, get_bundle, read_manifest
+from response_cache import get_response_cache
 
-LOCAL_TZ = pytz.timezone("America/Los_Angeles")
+LOCAL_TZ_NAME = "America/Los_Angeles"
 VAULT_BASE_PATH = Path("C:/Users/digitalscorpyun/sankofa_temple/Anacostia")
 
-# FAIL-FAST GUARD: Authority of the Execution Layer
-REQUIRED_VARS = [
-    "WATSONX_APIKEY",
-    "WATSONX_PROJECT_ID",
-    "WATSONX_URL",
-    "WATSONX_REGION",
+# FAIL-FAST GUARD: Authority of the Execution Layer now lives in
+# llm_backends.ensure_credentials() and fires on the first live generation,
+# so deterministic tools importing this module never pay for the SDK.
+
+# ASYNC DISPATCH DEFAULTS (overridable per client or via env)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("WATSONX_MAX_CONCURRENCY", "4"))
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("WATSONX_REQUESTS_PER_MINUTE", "0"))
+DEFAULT_STREAM = os.getenv("WATSONX_STREAM", "0") == "1"
+
+# EMISSION BOUNDARIES: anything from these tags onward is discarded
+TERMINAL_TAGS = [
+    "ROLES_START",
+    "AVM_SYNDIKAT_VERIFICATION",
+    "SYSTEM_RULES_VERIFICATION",
+    "USER_DATA_VERIFICATION",
+    "EMISSION_VERIFICATION",
+    "FINAL_VERDICT",
+    "USER_DATA_END",
+    "SYSTEM_RULES_END",
+    "ASSISTANT_EMISSION_END",
 ]
-missing = [v for v in REQUIRED_VARS if not os.getenv(v)]
-if missing:
-    print(f"❌ CRITICAL INFRASTRUCTURE FAILURE: Missing env vars {missing}")
-    sys.exit(1)
+EMISSION_START = "ASSISTANT_EMISSION_START"
+ECHO_OPENERS = ("SYSTEM_RULES_START", "USER_DATA_START")
+METADATA_MARKER = "### METADATA"
+
+# MANIFEST LAW: agent name -> vault-relative protocol manifest
+AGENT_ALIAS_MAP = {
+    "OD-COMPLY": f"{MANIFEST_DIR}/oracular_decree_protocol_manifest.md",
+    "KIMI-DEUX": f"{MANIFEST_DIR}/twin_warden_protocol_manifest.md",
+    "QWEN-ECHO": f"{MANIFEST_DIR}/echo_prophet_protocol_manifest.md",
+    "VS-ENC": f"{MANIFEST_DIR}/vault_sentinel_protocol_manifest.md",
+}
+
+
+def resolve_manifest_path(agent_name: str) -> Path:
+    rel_path = (
+        AGENT_ALIAS_MAP.get(agent_name)
+        or f"{MANIFEST_DIR}/{agent_name.lower().replace('-', '_')}_protocol_manifest.md"
+    )
+    return VAULT_BASE_PATH / rel_path
+
+
+def load_manifest(full_path: Path, agent_name: str = "") -> str:
+    """
+    Returns the system prompt body of a protocol manifest, parsed once per
+    (path, mtime) into the shared protocol bundle; later calls only stat() it.
+    """
+    try:
+        return read_manifest(full_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"✶ ERROR: Manifest missing for {agent_name or full_path.stem} at: {full_path}"
+        ) from None
+
+
+def preload_manifests() -> Dict[str, str]:
+    """Warms the bundle with every alias_map manifest in one pass."""
+    loaded: Dict[str, str] = {}
+    for agent_name in AGENT_ALIAS_MAP:
+        path = resolve_manifest_path(agent_name)
+        try:
+            load_manifest(path, agent_name)
+            loaded[agent_name] = str(path)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"⚠️ Manifest preload skipped: {e}")
+    return loaded
+
+
+def manifest_cache_stats() -> Dict[str, Any]:
+    bundle = get_bundle()
+    return {**bundle.stats, "entries": len(bundle.entries)}
+
+
+class GenerationCancelled(RuntimeError):
+    """ask(cancel=...) was signalled before the generation finished."""
+
+
+class MinuteRateLimiter:
+    """Sliding 60s window limiter. A limit of 0 disables throttling."""
+
+    def __init__(self, requests_per_minute: int = 0, window_s: float = 60.0):
+        self.requests_per_minute = max(0, requests_per_minute)
+        self.window_s = window_s
+        self._stamps: Deque[float] = deque()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        import asyncio
+
+        if not self.requests_per_minute:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._stamps and now - self._stamps[0] >= self.window_s:
+                    self._stamps.popleft()
+                if len(self._stamps) < self.requests_per_minute:
+                    self._stamps.append(now)
+                    return
+                await asyncio.sleep(self.window_s - (now - self._stamps[0]))
+
+
+class _EitherEvent:
+    """Read-only view that is set once either event is set."""
+
+    def __init__(self, first: threading.Event, second: threading.Event) -> None:
+        self.first = first
+        self.second = second
+
+    def is_set(self) -> bool:
+        return self.first.is_set() or self.second.is_set()
+
+
+class StopDetector(Protocol):
+    def feed(self, chunk: str) -> Optional[str]: ...
+
+    def text(self) -> str: ...
+
+
+class StreamStopDetector:
+    """
+    Incremental watcher over a token stream. feed() returns a stop reason
+    once a terminal tag or a fully closed ### METADATA JSON object appears
+    in the emission region, scanning each character only once.
+
+    Terminal tags are ignored while the model is echoing the silo prompt
+    (an opener such as USER_DATA_START is present in the emission region),
+    matching the split-on-ASSISTANT_EMISSION_START logic of the full path.
+    """
+
+    _TAG_OVERLAP = max(len(t) for t in TERMINAL_TAGS + [EMISSION_START, METADATA_MARKER])
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.cut_index: Optional[int] = None
+        self._emission_from = 0
+        self._scan_from = 0
+        self._json_pos = -1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> Optional[str]:
+        self.buffer += chunk
+        window_start = max(0, self._scan_from - self._TAG_OVERLAP)
+        self._scan_from = len(self.buffer)
+
+        emission_idx = self.buffer.rfind(EMISSION_START)
+        if emission_idx != -1 and emission_idx + len(EMISSION_START) > self._emission_from:
+            self._emission_from = emission_idx + len(EMISSION_START)
+            self._json_pos = -1
+            self._depth = 0
+        region_start = max(window_start, self._emission_from)
+
+        emission = self.buffer[self._emission_from:]
+        if not any(opener in emission for opener in ECHO_OPENERS):
+            for tag in TERMINAL_TAGS:
+                idx = self.buffer.find(tag, region_start)
+                if idx != -1:
+                    self.cut_index = idx
+                    return f"terminal_tag:{tag}"
+
+        return self._scan_metadata(region_start)
+
+    def _scan_metadata(self, region_start: int) -> Optional[str]:
+        if self._json_pos == -1:
+            marker_idx = self.buffer.find(METADATA_MARKER, region_start)
+            if marker_idx == -1:
+                return None
+            self._json_pos = marker_idx + len(METADATA_MARKER)
+
+        text = self.buffer
+        for i in range(self._json_pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"' and self._depth:
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.cut_index = i + 1
+                    return "metadata_closed"
+        self._json_pos = len(text)
+        return None
+
+    def text(self) -> str:
+        return self.buffer if self.cut_index is None else self.buffer[: self.cut_index]
+
+
+def detector_id(factory: Optional[Callable[[], StopDetector]]) -> str:
+    """Stable name of a stop detector factory, for cache keys."""
+    factory = factory or StreamStopDetector
+    qualname = getattr(factory, "__qualname__", None)
+    if qualname is None or "<" in qualname:
+        return repr(factory)  # lambdas / partials: unique per process only
+    return f"{factory.__module__}.{qualname}"
 
 
 class WatsonXClient:
-    def __init__(self, model_id: str = "ibm/granite-4-h-small"):
+    def __init__(
+        self,
+        model_id: str = "ibm/granite-4-h-small",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        stream: bool = DEFAULT_STREAM,
+        backend: Optional[LLMBackend] = None,
+        caller: str = "",
+    ):
         self.api_key = os.getenv("WATSONX_APIKEY")
         self.project_id = os.getenv("WATSONX_PROJECT_ID")
         self.url = os.getenv("WATSONX_URL")
@@ -41,84 +305,389 @@ class WatsonXClient:
         self.current_agent = "SYNAPSE-CORE"
         self.system_prompt = "You are a cognitive node of the AVM Syndicate."
 
-        self.creds = Credentials(api_key=self.api_key, url=self.url)
+        self.backend = backend or get_backend()
         self.default_params = {
             "decoding_method": "greedy",
             "max_new_tokens": 1500,
             "temperature": 0.0,
         }
 
+        # ASYNC GOVERNANCE: semaphore is bound lazily to the running loop
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = MinuteRateLimiter(requests_per_minute)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # RESPONSE CACHE: None when WATSONX_CACHE=0
+        self.cache = get_response_cache()
+
+        # STREAMING: early-stop generation and per-call stream telemetry.
+        # last_call_stats / last_cache_hit are per thread, so concurrent
+        # asks (aask, batch workers) each read their own call; stream_totals
+        # is shared and only updated under _totals_lock.
+        self.stream = stream
+        self._last = threading.local()
+        self._totals_lock = threading.Lock()
+        self.stream_totals = {"calls": 0, "early_stops": 0, "tokens_saved": 0}
+
+        # TELEMETRY: caller names the pipeline, ask(label=...) names the stage
+        self.caller = caller
+        self.ledger = get_ledger()
+
+        # RESILIENCE: deadline / retry / breaker / hedge (WATSONX_DEADLINE_S ...)
+        self.resilience = ResiliencePolicy.from_env()
+
+        # TOKEN BUDGET: None when WATSONX_BUDGET=0
+        self.token_counter = TokenCounter(self.backend) if BUDGET_ENABLED else None
+
+    @property
+    def last_call_stats(self) -> Dict[str, Any]:
+        """Ledger record of this thread's most recent ask()."""
+        return getattr(self._last, "stats", {})
+
+    @property
+    def last_cache_hit(self) -> bool:
+        return bool(self.last_call_stats.get("cache_hit"))
+
     def now_iso(self) -> str:
-        return datetime.now(LOCAL_TZ).isoformat(timespec="seconds")
+        import pytz
+
+        return datetime.now(pytz.timezone(LOCAL_TZ_NAME)).isoformat(timespec="seconds")
 
     def set_agent(self, agent_name: str):
         """MANIFEST RESOLUTION: Maps agent names to protocol markdown files."""
-        alias_map = {
-            "OD-COMPLY": "war_council/avm_syndicate/agents/protocols/oracular_decree_protocol_manifest.md",
-            "KIMI-DEUX": "war_council/avm_syndicate/agents/protocols/twin_warden_protocol_manifest.md",
-            "QWEN-ECHO": "war_council/avm_syndicate/agents/protocols/echo_prophet_protocol_manifest.md",
-            "VS-ENC": "war_council/avm_syndicate/agents/protocols/vault_sentinel_protocol_manifest.md",
+        full_path = resolve_manifest_path(agent_name)
+        self.system_prompt = load_manifest(full_path, agent_name)
+        self.current_agent = agent_name
+        print(f"✶ Synapse: {self.current_agent} identity manifested.")
+
+    def ask(
+        self,
+        prompt: str,
+        fresh: bool = False,
+        stream: Optional[bool] = None,
+        label: str = "",
+        deadline_s: Optional[float] = None,
+        expected_words: Optional[int] = None,
+        trimmable: Optional[str] = None,
+        cancel: Optional[threading.Event] = None,
+        stop_detector: Optional[Callable[[], StopDetector]] = None,
+        **kwargs,
+    ) -> str:
+        """
+        EXECUTION: Wraps prompts in Absolute String Siloing.
+
+        Greedy generations are served from the response cache when an
+        identical (model_id, system_prompt, prompt, params) call was seen
+        before; streamed calls are keyed by their stop detector too, since
+        the detector decides where the text ends. fresh=True skips the lookup but still refreshes the entry.
+        stream=True (or WATSONX_STREAM=1) consumes the SDK token stream and
+        aborts as soon as the emission is complete. label names the pipeline
+        stage in the telemetry ledger. deadline_s overrides the per-attempt
+        deadline; transient failures are retried with jittered backoff.
+
+        expected_words sizes max_new_tokens for the artifact (an explicit
+        max_new_tokens wins). Prompts that would overflow the model context
+        are trimmed inside `trimmable` (a substring of prompt, e.g. the
+        source text) or refused with PromptBudgetError.
+
+        Setting `cancel` aborts the call with GenerationCancelled: a stream
+        is closed at the next chunk, a blocking call is discarded on return.
+
+        stop_detector is a factory for an object with feed(chunk) ->
+        Optional[stop reason] and text(); one is built per attempt and
+        replaces StreamStopDetector. Passing it implies streaming.
+        """
+        if expected_words and "max_new_tokens" not in kwargs:
+            kwargs["max_new_tokens"] = tokens_for_words(expected_words)
+        call_params = {**self.default_params, **kwargs}
+        record: Dict[str, Any] = {
+            "caller": self.caller or None,
+            "stage": label or None,
+            "agent": self.current_agent,
+            "model_id": self.model_id,
+            "backend": self.backend.name,
+            "retries": 0,
+            "cache_hit": False,
+            "streamed": False,
+            "hedged": False,
         }
+        policy = self.resilience
+        if deadline_s is not None:
+            policy = replace(policy, deadline_s=deadline_s if deadline_s > 0 else None)
+        started = time.perf_counter()
+        prompt_estimate: Optional[int] = None
+        try:
+            if self.token_counter is not None:
+                plan = plan_budget(
+                    self.token_counter,
+                    self.model_id,
+                    prompt,
+                    self._frame,
+                    int(call_params["max_new_tokens"]),
+                    trimmable,
+                )
+                if plan.trimmed_tokens:
+                    print(
+                        f"⚠️ Source trimmed by ~{plan.trimmed_tokens} tokens to fit {self.model_id}."
+                    )
+                prompt = plan.prompt
+                prompt_estimate = plan.prompt_tokens
+                record["trimmed_tokens"] = plan.trimmed_tokens
+            record["max_new_tokens"] = call_params["max_new_tokens"]
+            return self._ask(
+                prompt,
+                call_params,
+                fresh,
+                stream,
+                record,
+                policy,
+                cancel,
+                stop_detector,
+                prompt_estimate,
+            )
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"[:300]
+            raise
+        finally:
+            record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self._last.stats = record
+            if self.ledger is not None:
+                self.ledger.record(record)
 
-        rel_path = (
-            alias_map.get(agent_name)
-            or f"war_council/avm_syndicate/agents/protocols/{agent_name.lower().replace('-', '_')}_protocol_manifest.md"
-        )
-        full_path = VAULT_BASE_PATH / rel_path
+    def _ask(
+        self,
+        prompt: str,
+        call_params: Dict[str, Any],
+        fresh: bool,
+        stream: Optional[bool],
+        record: Dict[str, Any],
+        policy: ResiliencePolicy,
+        cancel: Optional[threading.Event] = None,
+        stop_detector: Optional[Callable[[], StopDetector]] = None,
+        prompt_estimate: Optional[int] = None,
+    ) -> str:
+        use_stream = bool(stop_detector) or (self.stream if stream is None else stream)
 
-        if not full_path.exists():
-            raise FileNotFoundError(
-                f"✶ ERROR: Manifest missing for {agent_name} at: {full_path}"
+        cache_key = None
+        if self.cache is not None and call_params.get("decoding_method") == "greedy":
+            # A streamed call returns whatever its stop detector cut, so the
+            # detector is part of the key; blocking calls keep their old key.
+            key_params = call_params
+            if use_stream:
+                key_params = {**call_params, "stop_detector": detector_id(stop_detector)}
+            cache_key = self.cache.make_key(
+                self.model_id, self.system_prompt, prompt, key_params
             )
+            if not fresh:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    record["cache_hit"] = True
+                    return cached
 
-        with open(full_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            parts = content.split("---")
-            if len(parts) < 3:
-                raise ValueError(f"✶ ERROR: Manifest at {full_path} is malformed.")
+        full_prompt = self._frame(prompt)
 
-            self.system_prompt = parts[-1].strip()
-            self.current_agent = agent_name
-            print(f"✶ Synapse: {self.current_agent} identity manifested.")
+        def attempt(abort: threading.Event) -> Tuple[str, Dict[str, Any]]:
+            # Each attempt (retry or hedge) reports its own stats; only the
+            # winner's land in the ledger record. `abort` is set when the
+            # resilience layer abandons this attempt.
+            if cancel is not None and cancel.is_set():
+                raise GenerationCancelled("Cancelled before dispatch")
+            if use_stream:
+                return self._generate_streaming(
+                    full_prompt, call_params, cancel, stop_detector, abort
+                )
+            generation = self.backend.generate(self.model_id, full_prompt, call_params)
+            if cancel is not None and cancel.is_set():
+                raise GenerationCancelled("Cancelled; blocking result discarded")
+            return generation.text.strip(), {
+                "prompt_tokens": generation.input_tokens,
+                "completion_tokens": generation.output_tokens,
+            }
 
-    def ask(self, prompt: str, **kwargs) -> str:
-        """EXECUTION: Wraps prompts in Absolute String Siloing."""
-        call_params = {**self.default_params, **kwargs}
-        full_prompt = (
+        def on_event(kind: str) -> None:
+            if kind == "retry":
+                record["retries"] += 1
+            elif kind == "hedge":
+                record["hedged"] = True
+
+        raw_text, stats = call_with_resilience(
+            attempt,
+            policy,
+            get_breaker(self.model_id),
+            get_latency_window(self.model_id),
+            on_event,
+            abortable=True,
+        )
+        record.update(stats)
+        if record.get("prompt_tokens") is None:
+            # Streams (and some backends) report no usage; use the budget
+            # plan's count of the framed prompt, or estimate it here.
+            record["prompt_tokens"] = prompt_estimate or estimate_tokens(full_prompt)
+        if use_stream:
+            with self._totals_lock:
+                self.stream_totals["calls"] += 1
+                self.stream_totals["tokens_saved"] += stats["tokens_saved"]
+                if stats["stop_reason"] != "completed":
+                    self.stream_totals["early_stops"] += 1
+
+        clean_text = raw_text.split(EMISSION_START)[-1].strip()
+        for tag in TERMINAL_TAGS:
+            if tag in clean_text:
+                clean_text = clean_text.split(tag)[0].strip()
+
+        clean_text = clean_text.strip()
+        if cache_key is not None:
+            self.cache.put(cache_key, clean_text)
+        return clean_text
+
+    def _frame(self, prompt: str) -> str:
+        """Absolute String Siloing: the exact text sent to the backend."""
+        return (
             f"SYSTEM_RULES_START\n{self.system_prompt}\nSYSTEM_RULES_END\n\n"
             f"USER_DATA_START\n{prompt}\nUSER_DATA_END\n\n"
             f"ASSISTANT_EMISSION_START\n"
         )
 
-        model = ModelInference(
-            model_id=self.model_id,
-            credentials=self.creds,
-            project_id=self.project_id,
-            params=call_params,
-        )
+    def _generate_streaming(
+        self,
+        full_prompt: str,
+        call_params: Dict[str, Any],
+        cancel: Optional[threading.Event] = None,
+        stop_detector: Optional[Callable[[], StopDetector]] = None,
+        abort: Optional[threading.Event] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Streams the generation and closes it at the first stop signal, or as
+        soon as `cancel` (the caller) or `abort` (a lost hedge / expired
+        deadline) is set.
+        """
+        detector = stop_detector() if stop_detector else StreamStopDetector()
+        started = time.perf_counter()
+        ttft_ms: Optional[float] = None
+        chunks = 0
+        generated: List[str] = []
+        stop_reason = "completed"
+
+        stream = self.backend.generate_stream(self.model_id, full_prompt, call_params)
+        try:
+            for chunk in stream:
+                if ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - started) * 1000
+                chunks += 1
+                generated.append(chunk)
+                if cancel is not None and cancel.is_set():
+                    stop_reason = "cancelled"
+                    break
+                if abort is not None and abort.is_set():
+                    stop_reason = "abandoned"
+                    break
+                reason = detector.feed(chunk)
+                if reason:
+                    stop_reason = reason
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+        if stop_reason in ("cancelled", "abandoned"):
+            raise GenerationCancelled(f"Stream {stop_reason} after {chunks} chunks")
 
-        raw_text = (
-            model.generate(full_prompt)
-            .get("results", [{}])[0]
-            .get("generated_text", "")
-            .strip()
+        # Stream chunks are text pieces, not tokens, and the stream reports
+        # no token usage: generated tokens are estimated from the streamed
+        # text (llm_budget), so tokens_saved is budget minus that estimate.
+        completion_tokens = estimate_tokens("".join(generated))
+        max_tokens = int(call_params.get("max_new_tokens", 0))
+        tokens_saved = (
+            max(0, max_tokens - completion_tokens) if stop_reason != "completed" else 0
         )
-        clean_text = raw_text.split("ASSISTANT_EMISSION_START")[-1].strip()
-
-        terminal_tags = [
-            "ROLES_START",
-            "AVM_SYNDIKAT_VERIFICATION",
-            "SYSTEM_RULES_VERIFICATION",
-            "USER_DATA_VERIFICATION",
-            "EMISSION_VERIFICATION",
-            "FINAL_VERDICT",
-            "USER_DATA_END",
-            "SYSTEM_RULES_END",
-            "ASSISTANT_EMISSION_END",
-        ]
-        for tag in terminal_tags:
-            if tag in clean_text:
-                clean_text = clean_text.split(tag)[0].strip()
+        return detector.text().strip(), {
+            "streamed": True,
+            "stop_reason": stop_reason,
+            "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+            "completion_tokens": completion_tokens,
+            "stream_chunks": chunks,
+            "tokens_saved": tokens_saved,
+        }
+
+    # --------------------------------------------------------------------------
+    # ASYNC DISPATCH
+    # --------------------------------------------------------------------------
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def aask(self, prompt: str, **kwargs) -> str:
+        """
+        ASYNC EXECUTION: Same contract as ask(), gated by the concurrency
+        semaphore and the per-minute rate limiter.
+
+        Cancelling the awaiting task releases its slot immediately and sets
+        the call's cancel Event: a stream is closed at its next chunk, a
+        blocking call is discarded on return. A caller-supplied cancel=
+        Event still works alongside it.
+        """
+        import asyncio
+
+        task_cancel = threading.Event()
+        caller_cancel = kwargs.pop("cancel", None)
+        cancel = task_cancel if caller_cancel is None else _EitherEvent(caller_cancel, task_cancel)
+        async with self._get_semaphore():
+            await self.rate_limiter.acquire()
+            try:
+                return await asyncio.to_thread(self.ask, prompt, cancel=cancel, **kwargs)
+            except asyncio.CancelledError:
+                task_cancel.set()
+                raise
+
+    async def ask_many(
+        self,
+        prompts: Sequence[str],
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> List[Union[str, BaseException]]:
+        """
+        FAN-OUT: Runs several prompts concurrently and returns results in
+        submission order. On the first failure the remaining calls are
+        cancelled unless return_exceptions is set.
+        """
+        import asyncio
+
+        tasks = [asyncio.create_task(self.aask(p, **kwargs)) for p in prompts]
+        if not tasks:
+            return []
+
+        try:
+            done, pending = await asyncio.wait(
+                tasks,
+                return_when=(
+                    asyncio.ALL_COMPLETED
+                    if return_exceptions
+                    else asyncio.FIRST_EXCEPTION
+                ),
+            )
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
 
-        return clean_text.strip()
+        if pending:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
+        results: List[Union[str, BaseException]] = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(asyncio.CancelledError())
+                continue
+            exc = task.exception()
+            if exc is not None and not return_exceptions:
+                raise exc
+            results.append(exc if exc is not None else task.result())
+        return results